@@ -33,18 +33,70 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: str = "dev-jwt-secret-key-change-in-production"
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 14
+
+    # Login throttling
+    LOGIN_RATE_PER_EMAIL: int = 5  # attempts per minute (also the burst size)
+    LOGIN_RATE_PER_IP: int = 30
+    LOGIN_MAX_CONCURRENT_HASHES: int = 4
+    RATE_LIMIT_REDIS_URL: str = ""  # e.g. redis://localhost:6379/1 to share counters across workers
+    TRUSTED_PROXIES: str = ""  # comma-separated IPs/CIDRs whose X-Forwarded-For / X-Real-IP is used
 
     # CORS
     ALLOWED_ORIGINS: str = "http://localhost:5173,http://localhost:3000,http://localhost:8000"
 
+    # Bulk import
+    IMPORT_BATCH_SIZE: int = 1000
+    IMPORT_HASH_WORKERS: int = 0  # 0 = one process per CPU
+
+    # Background jobs
+    JOB_WORKERS: int = 2
+    JOB_POLL_INTERVAL_SECONDS: float = 2.0
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BASE_SECONDS: int = 10
+    JOB_STALE_SECONDS: int = 300  # running jobs without a heartbeat for this long are reclaimed
+    JOB_THROTTLE_SECONDS: float = 0.0  # pause after each checkpoint to limit database load
+    JOB_STORAGE_DIR: str = "/tmp/lms_jobs"
+    JOB_RETENTION_DAYS: int = 7  # succeeded runs of scheduled jobs are deleted after this
+
+    # Reporting
+    REPORT_ROLLUP_REFRESH_SECONDS: int = 60
+    REPORT_CACHE_TTL_SECONDS: int = 30  # 0 disables the report cache
+    REPORT_CACHE_STALE_SECONDS: int = 300  # stale entries are served while refreshing in the background
+    REPORT_CACHE_REDIS_URL: str = ""  # e.g. redis://localhost:6379/2 to share entries across workers
+    REPORT_CACHE_MAX_ENTRIES: int = 1000  # per-process limit when REPORT_CACHE_REDIS_URL is empty
+    EXPORT_CHUNK_ROWS: int = 10000  # rows fetched from the server-side cursor per chunk
+    EXPORT_RETENTION_HOURS: int = 24  # export files older than this are deleted from JOB_STORAGE_DIR
+    ANALYTICS_REFRESH_SECONDS: int = 60  # analytics snapshots are refreshed in the background when older
+    ANALYTICS_RELOAD_SECONDS: int = 3600  # full reload interval, which also drops deleted rows
+    ANALYTICS_SNAPSHOT_DIR: str = "/tmp/lms_analytics"  # memory-mapped snapshots shared by workers on a host
+    ITEM_ANALYSIS_REFRESH_SECONDS: int = 300
+
     # Notification
     NOTIFICATION_ENABLED: bool = False
-    FCM_SERVER_KEY: str = ""
+    FCM_CREDENTIALS_FILE: str = ""  # Firebase service account JSON, used by the HTTP v1 API
+    PUSH_TRANSPORT: str = "fcm"  # "fake" records messages locally instead of sending them
+    PUSH_BATCH_SIZE: int = 1000  # notifications claimed per batch
+    PUSH_CONCURRENCY: int = 8  # digests sent at once
+    PUSH_MAX_ATTEMPTS: int = 5
+    PUSH_RETRY_BASE_SECONDS: int = 30  # doubled after each failed attempt, capped at an hour
+    PUSH_MAX_AGE_HOURS: int = 24  # older undelivered notifications are not pushed
+    PUSH_POLL_SECONDS: int = 15
+    NOTIFICATION_READ_RETENTION_DAYS: int = 90  # read notifications older than this are purged; 0 keeps them
+    NOTIFICATION_RETENTION_DAYS: int = 365  # any notification older than this is purged; 0 keeps them
+    NOTIFICATION_MAX_PER_EMPLOYEE: int = 1000  # older notifications beyond this are purged; 0 disables
+    NOTIFICATION_PURGE_BATCH_SIZE: int = 2000  # rows deleted per transaction
+    NOTIFICATION_RETENTION_INTERVAL_SECONDS: int = 3600
 
     # Quiz
     QUIZ_PASSING_SCORE: float = 70.0
+    QUIZ_RESPONSE_FORMAT: str = "rows"  # "packed" stores one compact row per attempt instead of one per answer
+    QUIZ_ARCHIVE_AFTER_MONTHS: int = 0  # quiz partitions older than this move to the archive schema; 0 keeps them
+    PARTITION_MAINTENANCE_INTERVAL_SECONDS: int = 86400
     REMINDER_DAYS_NOT_STARTED: int = 3
     REMINDER_DAYS_INCOMPLETE: int = 7
+    REMINDER_REPEAT_DAYS: int = 7  # minimum days between reminders for the same course
+    REMINDER_RUN_INTERVAL_SECONDS: int = 86400
 
     @property
     def postgres_url(self) -> str:
@@ -56,6 +108,11 @@ class Settings(BaseSettings):
         """PostgreSQL async connection URL"""
         return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
+    @property
+    def trusted_proxies(self) -> List[str]:
+        """Get the trusted proxy IPs/CIDRs as a list"""
+        return [proxy.strip() for proxy in self.TRUSTED_PROXIES.split(",") if proxy.strip()]
+
     @property
     def cors_origins(self) -> List[str]:
         """Parse CORS origins from comma-separated string"""
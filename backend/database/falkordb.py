@@ -55,16 +55,24 @@ class FalkorDB:
             raise
 
     def _build_parameterized_query(self, query: str, params: Dict[str, Any]) -> str:
-        """Build parameterized query (simple implementation)"""
-        # For production, use proper parameterization
-        # This is a simplified version for demonstration
-        for key, value in params.items():
-            placeholder = f"${key}"
-            if isinstance(value, str):
-                query = query.replace(placeholder, f"'{value}'")
-            else:
-                query = query.replace(placeholder, str(value))
-        return query
+        """Prefix the query with a CYPHER header so FalkorDB binds the $params itself"""
+        header = " ".join(f"{key}={self._to_cypher_literal(value)}" for key, value in params.items())
+        return f"CYPHER {header} {query}"
+
+    def _to_cypher_literal(self, value: Any) -> str:
+        """Encode a parameter value as a Cypher literal, escaping strings"""
+        if value is None:
+            return "null"
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        if isinstance(value, (int, float)):
+            return repr(value)
+        if isinstance(value, (list, tuple)):
+            return "[" + ", ".join(self._to_cypher_literal(item) for item in value) + "]"
+        if isinstance(value, dict):
+            return "{" + ", ".join(f"{key}: {self._to_cypher_literal(item)}" for key, item in value.items()) + "}"
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+        return f'"{escaped}"'
 
     def _parse_result(self, result: Any) -> List[Any]:
         """Parse FalkorDB query result"""
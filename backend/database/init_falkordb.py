@@ -2,7 +2,7 @@
 FalkorDB Graph Initialization and Sample Data
 """
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 from backend.database.falkordb import FalkorDB
 from backend.config import settings
@@ -163,6 +163,10 @@ class GraphInitializer:
 
     def assign_employee(self, employee_id: str, assignment_type: str, assignment_id: str):
         """Assign employee to Track, SubTrack, or Course"""
+        self.assign_employees([employee_id], assignment_type, assignment_id)
+
+    def assign_employees(self, employee_ids: List[str], assignment_type: str, assignment_id: str):
+        """Assign many employees to a Track, SubTrack, or Course in one query"""
         if assignment_type == "track":
             label = "Track"
             prop = "track_id"
@@ -177,13 +181,14 @@ class GraphInitializer:
             rel = "assigned_course"
 
         query = f"""
-        MATCH (n:{label} {{{prop}: '{assignment_id}'}})
-        MERGE (e:Employees {{employee_id: '{employee_id}'}})
+        MATCH (n:{label} {{{prop}: $assignment_id}})
+        UNWIND $employee_ids AS employee_id
+        MERGE (e:Employees {{employee_id: employee_id}})
         MERGE (e)-[:{rel}]->(n)
-        RETURN e, n
+        RETURN count(e)
         """
-        self.db.execute_query(query)
-        logger.info(f"Employee {employee_id} assigned to {assignment_type} {assignment_id}")
+        self.db.execute_query(query, {"assignment_id": assignment_id, "employee_ids": list(employee_ids)})
+        logger.info(f"{len(employee_ids)} employee(s) assigned to {assignment_type} {assignment_id}")
 
 
 def initialize_falkordb():
@@ -42,6 +42,43 @@ def run_migration():
         raise
 
 
+def partition_table(table: str) -> bool:
+    """
+    Convert `table` into monthly range partitions with partitioning/<table>.sql.
+    Runs in one transaction; returns False if the table is already partitioned.
+    """
+    script_path = Path(__file__).parent / "partitioning" / f"{table}.sql"
+    if not script_path.exists():
+        raise ValueError(f"No partitioning script for table: {table}")
+
+    conn = psycopg2.connect(
+        host=settings.POSTGRES_HOST,
+        port=settings.POSTGRES_PORT,
+        user=settings.POSTGRES_USER,
+        password=settings.POSTGRES_PASSWORD,
+        database=settings.POSTGRES_DB,
+    )
+    try:
+        with conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)", (table,)
+                )
+                if cursor.fetchone():
+                    logger.info(f"{table} is already partitioned")
+                    return False
+
+                logger.info(f"Partitioning {table}...")
+                cursor.execute(script_path.read_text())
+        logger.info(f"{table} partitioned successfully")
+        return True
+    except Exception as e:
+        logger.error(f"Partitioning {table} failed: {e}")
+        raise
+    finally:
+        conn.close()
+
+
 def check_database_exists():
     """Check if database exists, create if not"""
     try:
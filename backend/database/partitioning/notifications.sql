@@ -0,0 +1,77 @@
+-- ============================================================================
+-- Partition notifications by month on created_at
+-- ============================================================================
+-- Run through `python scripts/partition_tables.py notifications`. Rows are copied
+-- into the new table under an exclusive lock, so run it in a maintenance window.
+-- Afterwards the notification_retention job drops expired months as whole partitions.
+
+LOCK TABLE notifications IN ACCESS EXCLUSIVE MODE;
+
+-- Free the old table's index and constraint names and keep its id sequence
+ALTER TABLE notifications RENAME TO notifications_unpartitioned;
+ALTER TABLE notifications_unpartitioned RENAME CONSTRAINT notifications_pkey TO notifications_unpartitioned_pkey;
+DROP INDEX idx_notifications_employee_created;
+DROP INDEX idx_notifications_unread;
+DROP INDEX idx_notifications_created;
+DROP INDEX idx_notifications_delivery_due;
+ALTER SEQUENCE notifications_notification_id_seq OWNED BY NONE;
+
+-- The partition key has to be part of the primary key
+CREATE TABLE notifications (
+    notification_id INTEGER NOT NULL DEFAULT nextval('notifications_notification_id_seq'),
+    employee_id VARCHAR(50) NOT NULL REFERENCES employees(employee_id) ON DELETE CASCADE,
+    notification_type VARCHAR(50) NOT NULL CHECK (notification_type IN ('course_assigned', 'reminder', 'deadline')),
+    title VARCHAR(255) NOT NULL,
+    message TEXT NOT NULL,
+    course_id VARCHAR(50),
+    is_read BOOLEAN NOT NULL DEFAULT FALSE,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    delivery_status VARCHAR(20) NOT NULL DEFAULT 'pending' CHECK (delivery_status IN ('pending', 'sent', 'failed', 'skipped')),
+    delivery_attempts INTEGER NOT NULL DEFAULT 0,
+    next_delivery_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    delivered_at TIMESTAMP,
+    delivery_error TEXT,
+    PRIMARY KEY (notification_id, created_at)
+) PARTITION BY RANGE (created_at);
+
+SELECT create_monthly_partitions(
+    'notifications',
+    COALESCE((SELECT MIN(created_at) FROM notifications_unpartitioned), CURRENT_TIMESTAMP)::date,
+    (CURRENT_DATE + INTERVAL '12 months')::date
+);
+
+INSERT INTO notifications
+    (notification_id, employee_id, notification_type, title, message, course_id, is_read, created_at,
+     delivery_status, delivery_attempts, next_delivery_at, delivered_at, delivery_error)
+SELECT notification_id, employee_id, notification_type, title, message, course_id, is_read,
+       COALESCE(created_at, CURRENT_TIMESTAMP),
+       delivery_status, delivery_attempts, next_delivery_at, delivered_at, delivery_error
+FROM notifications_unpartitioned;
+
+DROP TABLE notifications_unpartitioned;
+ALTER SEQUENCE notifications_notification_id_seq OWNED BY notifications.notification_id;
+
+-- Indexes on the parent are created on every partition
+CREATE INDEX idx_notifications_employee_created ON notifications(employee_id, created_at DESC, notification_id DESC);
+CREATE INDEX idx_notifications_unread ON notifications(employee_id, created_at DESC, notification_id DESC) WHERE NOT is_read;
+CREATE INDEX idx_notifications_created ON notifications(created_at, notification_id);
+CREATE INDEX idx_notifications_delivery_due ON notifications(next_delivery_at, notification_id) WHERE delivery_status = 'pending';
+
+-- Created after the copy, so the unread counters are not counted twice
+CREATE TRIGGER maintain_notification_counters_insert
+    AFTER INSERT ON notifications
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION maintain_notification_counters();
+
+CREATE TRIGGER maintain_notification_counters_update
+    AFTER UPDATE ON notifications
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION maintain_notification_counters();
+
+CREATE TRIGGER maintain_notification_counters_delete
+    AFTER DELETE ON notifications
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION maintain_notification_counters();
@@ -0,0 +1,110 @@
+-- ============================================================================
+-- Partition quiz_attempts and quiz_responses by month
+-- ============================================================================
+-- For databases created before schema.sql partitioned these tables. Run through
+-- `python scripts/partition_tables.py quiz_attempts`. Both tables are copied under
+-- an exclusive lock, so run it in a maintenance window.
+-- Each response's answered_at becomes its attempt's attempted_at, so an attempt and
+-- its responses land in the same month partition.
+
+LOCK TABLE quiz_attempts, quiz_responses IN ACCESS EXCLUSIVE MODE;
+
+-- Free the old tables' index and constraint names and keep their id sequences
+ALTER TABLE quiz_responses RENAME TO quiz_responses_unpartitioned;
+ALTER TABLE quiz_attempts RENAME TO quiz_attempts_unpartitioned;
+ALTER TABLE quiz_responses_unpartitioned RENAME CONSTRAINT quiz_responses_pkey TO quiz_responses_unpartitioned_pkey;
+ALTER TABLE quiz_attempts_unpartitioned RENAME CONSTRAINT quiz_attempts_pkey TO quiz_attempts_unpartitioned_pkey;
+ALTER TABLE quiz_attempts_unpartitioned
+    DROP CONSTRAINT IF EXISTS quiz_attempts_employee_id_course_id_attempt_number_key;
+DROP INDEX IF EXISTS idx_quiz_employee;
+DROP INDEX IF EXISTS idx_quiz_course;
+DROP INDEX IF EXISTS idx_quiz_passed;
+DROP INDEX IF EXISTS idx_quiz_attempted;
+DROP INDEX IF EXISTS idx_responses_attempt;
+DROP INDEX IF EXISTS idx_responses_question;
+DROP TRIGGER IF EXISTS maintain_course_quiz_summary ON quiz_attempts_unpartitioned;
+DROP TRIGGER IF EXISTS maintain_course_quiz_summary_insert ON quiz_attempts_unpartitioned;
+DROP TRIGGER IF EXISTS maintain_course_quiz_summary_delete ON quiz_attempts_unpartitioned;
+ALTER SEQUENCE quiz_attempts_attempt_id_seq OWNED BY NONE;
+ALTER SEQUENCE quiz_responses_response_id_seq OWNED BY NONE;
+
+CREATE TABLE quiz_attempts (
+    attempt_id INTEGER NOT NULL DEFAULT nextval('quiz_attempts_attempt_id_seq'),
+    employee_id VARCHAR(50) NOT NULL REFERENCES employees(employee_id) ON DELETE CASCADE,
+    course_id VARCHAR(50) NOT NULL,
+    attempt_number INTEGER NOT NULL DEFAULT 1,
+    score DECIMAL(5,2) NOT NULL,
+    total_questions INTEGER NOT NULL,
+    correct_answers INTEGER NOT NULL,
+    passed BOOLEAN NOT NULL DEFAULT FALSE,
+    passing_score DECIMAL(5,2) NOT NULL DEFAULT 70.00,
+    question_seed BIGINT,
+    attempted_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (attempt_id, attempted_at)
+) PARTITION BY RANGE (attempted_at);
+
+CREATE TABLE quiz_responses (
+    response_id INTEGER NOT NULL DEFAULT nextval('quiz_responses_response_id_seq'),
+    attempt_id INTEGER NOT NULL,
+    question_id VARCHAR(50) NOT NULL,
+    selected_answer CHAR(1) NOT NULL CHECK (selected_answer IN ('A', 'B', 'C', 'D')),
+    is_correct BOOLEAN NOT NULL,
+    answered_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (response_id, answered_at),
+    FOREIGN KEY (attempt_id, answered_at) REFERENCES quiz_attempts(attempt_id, attempted_at) ON DELETE CASCADE
+) PARTITION BY RANGE (answered_at);
+
+SELECT create_monthly_partitions(
+    'quiz_attempts',
+    COALESCE((SELECT MIN(attempted_at) FROM quiz_attempts_unpartitioned), CURRENT_TIMESTAMP)::date,
+    (CURRENT_DATE + INTERVAL '12 months')::date
+);
+SELECT create_monthly_partitions(
+    'quiz_responses',
+    COALESCE((SELECT MIN(attempted_at) FROM quiz_attempts_unpartitioned), CURRENT_TIMESTAMP)::date,
+    (CURRENT_DATE + INTERVAL '12 months')::date
+);
+
+-- Attempts with a NULL attempted_at get one shared timestamp, keeping their responses aligned
+CREATE TEMP TABLE attempt_times ON COMMIT DROP AS
+SELECT attempt_id, COALESCE(attempted_at, CURRENT_TIMESTAMP) AS attempted_at
+FROM quiz_attempts_unpartitioned;
+
+INSERT INTO quiz_attempts
+    (attempt_id, employee_id, course_id, attempt_number, score, total_questions,
+     correct_answers, passed, passing_score, attempted_at)
+SELECT a.attempt_id, a.employee_id, a.course_id, a.attempt_number, a.score, a.total_questions,
+       a.correct_answers, a.passed, a.passing_score, t.attempted_at
+FROM quiz_attempts_unpartitioned a
+JOIN attempt_times t ON t.attempt_id = a.attempt_id;
+
+INSERT INTO quiz_responses (response_id, attempt_id, question_id, selected_answer, is_correct, answered_at)
+SELECT r.response_id, r.attempt_id, r.question_id, r.selected_answer, r.is_correct, t.attempted_at
+FROM quiz_responses_unpartitioned r
+JOIN attempt_times t ON t.attempt_id = r.attempt_id;
+
+DROP TABLE quiz_responses_unpartitioned;
+DROP TABLE quiz_attempts_unpartitioned;
+ALTER SEQUENCE quiz_attempts_attempt_id_seq OWNED BY quiz_attempts.attempt_id;
+ALTER SEQUENCE quiz_responses_response_id_seq OWNED BY quiz_responses.response_id;
+
+CREATE INDEX idx_quiz_employee_course ON quiz_attempts(employee_id, course_id, attempted_at DESC, attempt_id DESC);
+CREATE INDEX idx_quiz_employee_attempted ON quiz_attempts(employee_id, attempted_at DESC, attempt_id DESC);
+CREATE INDEX idx_quiz_course ON quiz_attempts(course_id);
+CREATE INDEX idx_quiz_passed ON quiz_attempts(passed);
+CREATE INDEX idx_quiz_attempted ON quiz_attempts(attempted_at);
+CREATE INDEX idx_responses_attempt ON quiz_responses(attempt_id, answered_at);
+CREATE INDEX idx_responses_question ON quiz_responses(question_id);
+
+-- Created after the copy, so the course summaries are not counted twice
+CREATE TRIGGER maintain_course_quiz_summary_insert
+    AFTER INSERT ON quiz_attempts
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION maintain_course_quiz_summary();
+
+CREATE TRIGGER maintain_course_quiz_summary_delete
+    AFTER DELETE ON quiz_attempts
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION maintain_course_quiz_summary();
@@ -2,7 +2,7 @@
 PostgreSQL Database Connection and Utilities
 """
 import psycopg2
-from psycopg2.pool import SimpleConnectionPool
+from psycopg2.pool import ThreadedConnectionPool
 from psycopg2.extras import RealDictCursor
 from contextlib import contextmanager
 from typing import Optional
@@ -14,15 +14,15 @@ logger = logging.getLogger(__name__)
 
 
 class PostgresDB:
-    """PostgreSQL database connection manager with connection pooling"""
+    """PostgreSQL database connection manager with thread-safe connection pooling"""
 
     def __init__(self):
-        self.pool: Optional[SimpleConnectionPool] = None
+        self.pool: Optional[ThreadedConnectionPool] = None
 
     def initialize_pool(self, minconn: int = 1, maxconn: int = 10):
         """Initialize connection pool"""
         try:
-            self.pool = SimpleConnectionPool(
+            self.pool = ThreadedConnectionPool(
                 minconn,
                 maxconn,
                 host=settings.POSTGRES_HOST,
@@ -2,13 +2,35 @@
 -- Learning Management System - PostgreSQL Schema
 -- ============================================================================
 
+-- Extensions
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- Drop tables if exist (for clean setup)
+DROP TABLE IF EXISTS employee_progress_summary CASCADE;
+DROP TABLE IF EXISTS course_progress_summary CASCADE;
+DROP TABLE IF EXISTS quiz_attempt_summary CASCADE;
+DROP TABLE IF EXISTS jobs CASCADE;
+DROP TABLE IF EXISTS report_rollup_department_course CASCADE;
+DROP TABLE IF EXISTS report_rollup_dirty_courses CASCADE;
+DROP TABLE IF EXISTS report_refresh_state CASCADE;
+DROP TABLE IF EXISTS question_item_stats CASCADE;
+DROP TABLE IF EXISTS quiz_sessions CASCADE;
+DROP TABLE IF EXISTS course_question_bank CASCADE;
+DROP TABLE IF EXISTS course_catalog CASCADE;
+DROP TABLE IF EXISTS subtrack_catalog CASCADE;
+DROP TABLE IF EXISTS track_catalog CASCADE;
+DROP TABLE IF EXISTS refresh_tokens CASCADE;
+DROP TABLE IF EXISTS quiz_attempt_answers CASCADE;
 DROP TABLE IF EXISTS quiz_responses CASCADE;
 DROP TABLE IF EXISTS quiz_attempts CASCADE;
 DROP TABLE IF EXISTS employee_course_progress CASCADE;
+DROP TABLE IF EXISTS notification_counters CASCADE;
+DROP TABLE IF EXISTS device_tokens CASCADE;
+DROP TABLE IF EXISTS progress_reminders CASCADE;
 DROP TABLE IF EXISTS notifications CASCADE;
 DROP TABLE IF EXISTS question_master CASCADE;
 DROP TABLE IF EXISTS employees CASCADE;
+DROP TYPE IF EXISTS progress_change CASCADE;
 
 -- ============================================================================
 -- EMPLOYEES TABLE
@@ -20,13 +42,46 @@ CREATE TABLE employees (
     department VARCHAR(100),
     role VARCHAR(50) NOT NULL CHECK (role IN ('admin', 'employee')),
     password_hash VARCHAR(255) NOT NULL,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
 CREATE INDEX idx_employees_email ON employees(email);
 CREATE INDEX idx_employees_role ON employees(role);
 
+CREATE INDEX idx_employees_updated ON employees(updated_at);
+
+-- Keyset pagination of the admin employee directory (newest first, optionally filtered)
+CREATE INDEX idx_employees_created ON employees(created_at DESC, employee_id DESC);
+CREATE INDEX idx_employees_role_created ON employees(role, created_at DESC, employee_id DESC);
+CREATE INDEX idx_employees_department_created ON employees(department, created_at DESC, employee_id DESC);
+
+-- Case-insensitive prefix search on name and email
+CREATE INDEX idx_employees_name_prefix ON employees(LOWER(employee_name) text_pattern_ops);
+CREATE INDEX idx_employees_email_prefix ON employees(LOWER(email) text_pattern_ops);
+
+-- Fuzzy / substring search (admin search endpoint)
+CREATE INDEX idx_employees_name_trgm ON employees USING GIN (employee_name gin_trgm_ops);
+CREATE INDEX idx_employees_email_trgm ON employees USING GIN (email gin_trgm_ops);
+
+-- ============================================================================
+-- REFRESH TOKENS TABLE
+-- ============================================================================
+CREATE TABLE refresh_tokens (
+    token_hash CHAR(64) PRIMARY KEY,
+    employee_id VARCHAR(50) NOT NULL REFERENCES employees(employee_id) ON DELETE CASCADE,
+    family_id VARCHAR(64) NOT NULL,
+    expires_at TIMESTAMP NOT NULL,
+    revoked_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_refresh_tokens_employee ON refresh_tokens(employee_id);
+CREATE INDEX idx_refresh_tokens_family ON refresh_tokens(family_id);
+
+COMMENT ON COLUMN refresh_tokens.token_hash IS 'SHA-256 of the opaque refresh token (raw token is never stored)';
+COMMENT ON COLUMN refresh_tokens.family_id IS 'Shared by every token in one rotation chain, used to revoke the chain on reuse';
+
 -- ============================================================================
 -- QUESTION MASTER TABLE
 -- ============================================================================
@@ -38,11 +93,77 @@ CREATE TABLE question_master (
     option_c TEXT NOT NULL,
     option_d TEXT NOT NULL,
     correct_answer CHAR(1) NOT NULL CHECK (correct_answer IN ('A', 'B', 'C', 'D')),
+    question_no INTEGER GENERATED ALWAYS AS IDENTITY UNIQUE,
+    search_vector TSVECTOR GENERATED ALWAYS AS (to_tsvector('english', question_text)) STORED,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
 CREATE INDEX idx_question_master_id ON question_master(question_id);
+CREATE INDEX idx_question_master_search ON question_master USING GIN (search_vector);
+CREATE INDEX idx_question_master_text_trgm ON question_master USING GIN (question_text gin_trgm_ops);
+
+-- ============================================================================
+-- CATALOG TABLES
+-- ============================================================================
+-- Relational mirror of the Track, SubTrack and Course nodes in FalkorDB, kept for
+-- search and reporting. Courses carry their resolved subtrack and track.
+CREATE TABLE track_catalog (
+    track_id VARCHAR(50) PRIMARY KEY,
+    track_name VARCHAR(255) NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE subtrack_catalog (
+    subtrack_id VARCHAR(50) PRIMARY KEY,
+    subtrack_name VARCHAR(255) NOT NULL,
+    track_id VARCHAR(50) NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE course_catalog (
+    course_id VARCHAR(50) PRIMARY KEY,
+    course_name VARCHAR(255) NOT NULL,
+    parent_type VARCHAR(20) NOT NULL CHECK (parent_type IN ('track', 'subtrack', 'course')),
+    parent_id VARCHAR(50) NOT NULL,
+    subtrack_id VARCHAR(50),
+    track_id VARCHAR(50),
+    quiz_size INTEGER CHECK (quiz_size > 0),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_course_catalog_parent ON course_catalog(parent_type, parent_id);
+CREATE INDEX idx_course_catalog_track ON course_catalog(track_id);
+CREATE INDEX idx_course_catalog_subtrack ON course_catalog(subtrack_id);
+CREATE INDEX idx_course_catalog_name_trgm ON course_catalog USING GIN (course_name gin_trgm_ops);
+
+COMMENT ON COLUMN course_catalog.quiz_size IS 'Questions drawn per attempt; NULL serves the whole bank';
+
+-- ============================================================================
+-- QUIZ SAMPLING
+-- ============================================================================
+-- Each course's question_master.question_no values, in the order they were assigned.
+-- Banks are only appended to, so an open session's pool is always the first
+-- pool_size entries. Sampling indexes this array instead of sorting the questions.
+CREATE TABLE course_question_bank (
+    course_id VARCHAR(50) PRIMARY KEY,
+    question_nos INTEGER[] NOT NULL DEFAULT '{}',
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- The quiz an employee has been served and not yet submitted: quiz_size questions
+-- drawn from the bank's first pool_size entries with seed. submit_quiz redraws the
+-- sample to validate and score the answers, then deletes the session.
+CREATE TABLE quiz_sessions (
+    employee_id VARCHAR(50) NOT NULL REFERENCES employees(employee_id) ON DELETE CASCADE,
+    course_id VARCHAR(50) NOT NULL,
+    seed BIGINT NOT NULL,
+    pool_size INTEGER NOT NULL,
+    quiz_size INTEGER NOT NULL,
+    served_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (employee_id, course_id)
+);
 
 -- ============================================================================
 -- EMPLOYEE COURSE PROGRESS TABLE
@@ -65,6 +186,10 @@ CREATE TABLE employee_course_progress (
 CREATE INDEX idx_progress_employee ON employee_course_progress(employee_id);
 CREATE INDEX idx_progress_course ON employee_course_progress(course_id);
 CREATE INDEX idx_progress_status ON employee_course_progress(status);
+CREATE INDEX idx_progress_updated ON employee_course_progress(updated_at);
+-- Overdue scans for reminders walk these in keyset order
+CREATE INDEX idx_progress_status_created ON employee_course_progress(status, created_at, progress_id);
+CREATE INDEX idx_progress_status_started ON employee_course_progress(status, started_at, progress_id);
 
 -- Add comment
 COMMENT ON COLUMN employee_course_progress.time_taken_minutes IS 'Total time to complete course and quiz';
@@ -73,8 +198,11 @@ COMMENT ON COLUMN employee_course_progress.assignment_id IS 'track_id, subtrack_
 -- ============================================================================
 -- QUIZ ATTEMPTS TABLE
 -- ============================================================================
+-- Range-partitioned by month on attempted_at (partitions are created under PARTITION
+-- MANAGEMENT below). The partition key must be part of every unique constraint, so
+-- attempt numbers are allocated by the submission path rather than a UNIQUE constraint.
 CREATE TABLE quiz_attempts (
-    attempt_id SERIAL PRIMARY KEY,
+    attempt_id SERIAL,
     employee_id VARCHAR(50) NOT NULL REFERENCES employees(employee_id) ON DELETE CASCADE,
     course_id VARCHAR(50) NOT NULL,
     attempt_number INTEGER NOT NULL DEFAULT 1,
@@ -83,32 +211,104 @@ CREATE TABLE quiz_attempts (
     correct_answers INTEGER NOT NULL,
     passed BOOLEAN NOT NULL DEFAULT FALSE,
     passing_score DECIMAL(5,2) NOT NULL DEFAULT 70.00,
-    attempted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    UNIQUE(employee_id, course_id, attempt_number)
-);
+    question_seed BIGINT,
+    attempted_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (attempt_id, attempted_at)
+) PARTITION BY RANGE (attempted_at);
 
-CREATE INDEX idx_quiz_employee ON quiz_attempts(employee_id);
+-- Both employee indexes end in (attempted_at DESC, attempt_id DESC): attempt history pages
+-- are read in index order and stop at the page size
+CREATE INDEX idx_quiz_employee_course ON quiz_attempts(employee_id, course_id, attempted_at DESC, attempt_id DESC);
+CREATE INDEX idx_quiz_employee_attempted ON quiz_attempts(employee_id, attempted_at DESC, attempt_id DESC);
 CREATE INDEX idx_quiz_course ON quiz_attempts(course_id);
 CREATE INDEX idx_quiz_passed ON quiz_attempts(passed);
+CREATE INDEX idx_quiz_attempted ON quiz_attempts(attempted_at);
 
 COMMENT ON COLUMN quiz_attempts.score IS 'Score as percentage (0-100)';
 COMMENT ON COLUMN quiz_attempts.passing_score IS 'Minimum score to pass (%)';
+COMMENT ON COLUMN quiz_attempts.question_seed IS 'Seed of the quiz_sessions sample that was answered';
 
 -- ============================================================================
 -- QUIZ RESPONSES TABLE
 -- ============================================================================
+-- Partitioned like quiz_attempts. answered_at is the attempt's attempted_at, so an
+-- attempt's responses sit in the matching month partition and joins on
+-- (attempt_id, answered_at = attempted_at) prune to it.
 CREATE TABLE quiz_responses (
-    response_id SERIAL PRIMARY KEY,
-    attempt_id INTEGER NOT NULL REFERENCES quiz_attempts(attempt_id) ON DELETE CASCADE,
+    response_id SERIAL,
+    attempt_id INTEGER NOT NULL,
     question_id VARCHAR(50) NOT NULL,
     selected_answer CHAR(1) NOT NULL CHECK (selected_answer IN ('A', 'B', 'C', 'D')),
     is_correct BOOLEAN NOT NULL,
-    answered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
+    answered_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (response_id, answered_at),
+    FOREIGN KEY (attempt_id, answered_at) REFERENCES quiz_attempts(attempt_id, attempted_at) ON DELETE CASCADE
+) PARTITION BY RANGE (answered_at);
 
-CREATE INDEX idx_responses_attempt ON quiz_responses(attempt_id);
+CREATE INDEX idx_responses_attempt ON quiz_responses(attempt_id, answered_at);
 CREATE INDEX idx_responses_question ON quiz_responses(question_id);
 
+-- ============================================================================
+-- PACKED QUIZ RESPONSES
+-- ============================================================================
+-- With QUIZ_RESPONSE_FORMAT=packed, an attempt's answers are one row here instead of
+-- one quiz_responses row per question: question_master.question_no values plus the
+-- selected answers at 2 bits each. Correctness is derived from question_master
+-- (answer keys are never edited). Read both formats through v_quiz_responses.
+CREATE TABLE quiz_attempt_answers (
+    attempt_id INTEGER NOT NULL,
+    attempted_at TIMESTAMP NOT NULL,
+    question_nos INTEGER[] NOT NULL,
+    answers BYTEA NOT NULL,
+    PRIMARY KEY (attempt_id, attempted_at),
+    FOREIGN KEY (attempt_id, attempted_at) REFERENCES quiz_attempts(attempt_id, attempted_at) ON DELETE CASCADE
+) PARTITION BY RANGE (attempted_at);
+
+COMMENT ON COLUMN quiz_attempt_answers.answers IS 'Answer i (0-based) in bits 2*(i%4)..2*(i%4)+1 of byte i/4; 0=A .. 3=D';
+
+-- 'A'..'D' array -> packed bytea
+CREATE OR REPLACE FUNCTION pack_answers(answers CHAR(1)[])
+RETURNS BYTEA AS $$
+DECLARE
+    packed BYTEA := decode(repeat('00', (cardinality(answers) + 3) / 4), 'hex');
+    i INTEGER;
+BEGIN
+    FOR i IN 0 .. cardinality(answers) - 1 LOOP
+        packed := set_byte(
+            packed, i / 4,
+            get_byte(packed, i / 4) | ((ascii(answers[i + 1]) - ascii('A')) << ((i % 4) * 2))
+        );
+    END LOOP;
+    RETURN packed;
+END;
+$$ language 'plpgsql' IMMUTABLE STRICT;
+
+-- Packed bytea -> 'A'..'D' array of the first `answer_count` answers
+CREATE OR REPLACE FUNCTION unpack_answers(packed BYTEA, answer_count INTEGER)
+RETURNS CHAR(1)[] AS $$
+    SELECT COALESCE(
+        array_agg(chr(ascii('A') + ((get_byte(packed, i / 4) >> ((i % 4) * 2)) & 3))::char(1) ORDER BY i),
+        '{}'
+    )
+    FROM generate_series(0, answer_count - 1) AS i
+$$ language 'sql' IMMUTABLE STRICT;
+
+-- Responses in either format, one row per answered question. Filters on attempt_id and
+-- answered_at reach both branches, so lookups stay index scans on one partition.
+CREATE OR REPLACE VIEW v_quiz_responses AS
+SELECT r.attempt_id, r.question_id, r.selected_answer, r.is_correct, r.answered_at
+FROM quiz_responses r
+UNION ALL
+SELECT p.attempt_id,
+       q.question_id,
+       u.selected_answer,
+       u.selected_answer = q.correct_answer AS is_correct,
+       p.attempted_at AS answered_at
+FROM quiz_attempt_answers p
+CROSS JOIN LATERAL unnest(p.question_nos, unpack_answers(p.answers, cardinality(p.question_nos)))
+    AS u(question_no, selected_answer)
+JOIN question_master q ON q.question_no = u.question_no;
+
 -- ============================================================================
 -- NOTIFICATIONS TABLE
 -- ============================================================================
@@ -120,12 +320,84 @@ CREATE TABLE notifications (
     message TEXT NOT NULL,
     course_id VARCHAR(50),
     is_read BOOLEAN NOT NULL DEFAULT FALSE,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    delivery_status VARCHAR(20) NOT NULL DEFAULT 'pending' CHECK (delivery_status IN ('pending', 'sent', 'failed', 'skipped')),
+    delivery_attempts INTEGER NOT NULL DEFAULT 0,
+    next_delivery_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    delivered_at TIMESTAMP,
+    delivery_error TEXT
 );
 
-CREATE INDEX idx_notifications_employee ON notifications(employee_id);
-CREATE INDEX idx_notifications_is_read ON notifications(is_read);
-CREATE INDEX idx_notifications_created ON notifications(created_at);
+-- Serves the per-employee keyset feed without a sort; the partial index holds only unread rows
+CREATE INDEX idx_notifications_employee_created ON notifications(employee_id, created_at DESC, notification_id DESC);
+CREATE INDEX idx_notifications_unread ON notifications(employee_id, created_at DESC, notification_id DESC) WHERE NOT is_read;
+-- Retention purges walk this in (created_at, notification_id) keyset order
+CREATE INDEX idx_notifications_created ON notifications(created_at, notification_id);
+-- Push delivery queue: only undelivered rows, in due order
+CREATE INDEX idx_notifications_delivery_due ON notifications(next_delivery_at, notification_id) WHERE delivery_status = 'pending';
+
+-- Push tokens registered by employees' devices
+CREATE TABLE device_tokens (
+    token VARCHAR(512) PRIMARY KEY,
+    employee_id VARCHAR(50) NOT NULL REFERENCES employees(employee_id) ON DELETE CASCADE,
+    platform VARCHAR(20) NOT NULL CHECK (platform IN ('android', 'ios', 'web')),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_device_tokens_employee ON device_tokens(employee_id);
+
+-- Last reminder per employee, course and kind, used to avoid repeating reminders
+CREATE TABLE progress_reminders (
+    employee_id VARCHAR(50) NOT NULL REFERENCES employees(employee_id) ON DELETE CASCADE,
+    course_id VARCHAR(50) NOT NULL,
+    kind VARCHAR(20) NOT NULL CHECK (kind IN ('not_started', 'incomplete')),
+    last_sent_at TIMESTAMP NOT NULL,
+    times_sent INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (employee_id, course_id, kind)
+);
+
+CREATE INDEX idx_progress_reminders_due ON progress_reminders(kind, last_sent_at, employee_id, course_id);
+
+-- Unread count per employee, maintained by the notification triggers below
+CREATE TABLE notification_counters (
+    employee_id VARCHAR(50) PRIMARY KEY REFERENCES employees(employee_id) ON DELETE CASCADE,
+    unread_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- ============================================================================
+-- JOBS TABLE
+-- ============================================================================
+-- Durable queue for long-running admin operations (see backend/services/jobs.py)
+CREATE TABLE jobs (
+    job_id SERIAL PRIMARY KEY,
+    job_type VARCHAR(50) NOT NULL,
+    params JSONB NOT NULL DEFAULT '{}',
+    status VARCHAR(20) NOT NULL DEFAULT 'queued' CHECK (status IN ('queued', 'running', 'succeeded', 'failed')),
+    checkpoint JSONB,
+    progress JSONB,
+    result JSONB,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    run_after TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    locked_by VARCHAR(255),
+    heartbeat_at TIMESTAMP,
+    pinned_host VARCHAR(255),
+    created_by VARCHAR(50) REFERENCES employees(employee_id) ON DELETE SET NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_jobs_queued ON jobs(run_after, job_id) WHERE status = 'queued';
+CREATE INDEX idx_jobs_running ON jobs(heartbeat_at) WHERE status = 'running';
+CREATE INDEX idx_jobs_scheduled_succeeded ON jobs(finished_at) WHERE status = 'succeeded' AND created_by IS NULL;
+
+COMMENT ON COLUMN jobs.checkpoint IS 'Handler state saved after each chunk, used to resume after a retry';
+COMMENT ON COLUMN jobs.pinned_host IS 'Only workers on this host may claim the job (its input is in local JOB_STORAGE_DIR)';
 
 -- ============================================================================
 -- TRIGGERS FOR UPDATED_AT
@@ -152,15 +424,616 @@ CREATE TRIGGER update_question_master_updated_at
     FOR EACH ROW
     EXECUTE FUNCTION update_updated_at_column();
 
+-- Triggers for course_catalog table
+CREATE TRIGGER update_course_catalog_updated_at
+    BEFORE UPDATE ON course_catalog
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
+
+-- Triggers for jobs table
+CREATE TRIGGER update_jobs_updated_at
+    BEFORE UPDATE ON jobs
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
+
 -- Triggers for employee_course_progress table
 CREATE TRIGGER update_progress_updated_at
     BEFORE UPDATE ON employee_course_progress
     FOR EACH ROW
     EXECUTE FUNCTION update_updated_at_column();
 
+-- ============================================================================
+-- PROGRESS SUMMARY TABLES
+-- ============================================================================
+-- Counters maintained incrementally by triggers on employee_course_progress and
+-- quiz_attempts, so profile and report reads are primary-key lookups.
+
+CREATE TABLE employee_progress_summary (
+    employee_id VARCHAR(50) PRIMARY KEY,
+    total_courses_assigned INTEGER NOT NULL DEFAULT 0,
+    courses_completed INTEGER NOT NULL DEFAULT 0,
+    courses_in_progress INTEGER NOT NULL DEFAULT 0,
+    courses_not_started INTEGER NOT NULL DEFAULT 0,
+    courses_failed INTEGER NOT NULL DEFAULT 0,
+    total_time_minutes BIGINT NOT NULL DEFAULT 0,
+    timed_courses INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE course_progress_summary (
+    course_id VARCHAR(50) PRIMARY KEY,
+    total_employees_assigned INTEGER NOT NULL DEFAULT 0,
+    employees_completed INTEGER NOT NULL DEFAULT 0,
+    employees_in_progress INTEGER NOT NULL DEFAULT 0,
+    employees_not_started INTEGER NOT NULL DEFAULT 0,
+    employees_failed INTEGER NOT NULL DEFAULT 0,
+    total_time_minutes BIGINT NOT NULL DEFAULT 0,
+    timed_employees INTEGER NOT NULL DEFAULT 0,
+    passed_score_sum DECIMAL(14,2) NOT NULL DEFAULT 0,
+    passed_attempts INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMENT ON COLUMN employee_progress_summary.timed_courses IS 'Progress rows with a time_taken_minutes value (denominator of avg_time_minutes)';
+
+-- Attempt history per employee and course. Upserted by submit_quiz in the same
+-- transaction as the attempt: the row lock serializes concurrent submissions and the
+-- returned attempt_count is the new attempt's number.
+CREATE TABLE quiz_attempt_summary (
+    employee_id VARCHAR(50) NOT NULL REFERENCES employees(employee_id) ON DELETE CASCADE,
+    course_id VARCHAR(50) NOT NULL,
+    attempt_count INTEGER NOT NULL DEFAULT 0,
+    best_score DECIMAL(5,2),
+    last_score DECIMAL(5,2),
+    last_attempted_at TIMESTAMP,
+    first_passed_at TIMESTAMP,
+    passed_attempts INTEGER NOT NULL DEFAULT 0,
+    passed_score_sum DECIMAL(12,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (employee_id, course_id)
+);
+
+CREATE INDEX idx_attempt_summary_course ON quiz_attempt_summary(course_id);
+
+COMMENT ON COLUMN quiz_attempt_summary.attempt_count IS 'Includes attempts in archived partitions, so attempt numbers never repeat';
+
+-- One progress row added to (sign = 1) or removed from (sign = -1) the summaries
+CREATE TYPE progress_change AS (
+    employee_id VARCHAR(50),
+    course_id VARCHAR(50),
+    status VARCHAR(20),
+    time_taken_minutes INTEGER,
+    sign INTEGER
+);
+
+-- Apply a statement's changes as one aggregated delta per employee and per course.
+-- Keys that only lose rows are updated, never inserted, so cascaded deletes never
+-- recreate a summary; keys whose deltas cancel out are not written at all.
+CREATE OR REPLACE FUNCTION apply_progress_changes(changes progress_change[])
+RETURNS VOID AS $$
+BEGIN
+    WITH d AS (
+        SELECT employee_id,
+               SUM(sign) AS total,
+               SUM(CASE WHEN status = 'completed' THEN sign ELSE 0 END) AS completed,
+               SUM(CASE WHEN status = 'in_progress' THEN sign ELSE 0 END) AS in_progress,
+               SUM(CASE WHEN status = 'assigned' THEN sign ELSE 0 END) AS not_started,
+               SUM(CASE WHEN status = 'failed' THEN sign ELSE 0 END) AS failed,
+               SUM(COALESCE(time_taken_minutes, 0) * sign) AS total_time,
+               SUM(CASE WHEN time_taken_minutes IS NOT NULL THEN sign ELSE 0 END) AS timed,
+               bool_or(sign > 0) AS adds
+        FROM unnest(changes)
+        GROUP BY employee_id
+    ),
+    changed AS (
+        SELECT * FROM d
+        WHERE (total, completed, in_progress, not_started, failed, total_time, timed)
+              <> (0, 0, 0, 0, 0, 0, 0)
+    ),
+    removed AS (
+        UPDATE employee_progress_summary s
+        SET total_courses_assigned = s.total_courses_assigned + c.total,
+            courses_completed = s.courses_completed + c.completed,
+            courses_in_progress = s.courses_in_progress + c.in_progress,
+            courses_not_started = s.courses_not_started + c.not_started,
+            courses_failed = s.courses_failed + c.failed,
+            total_time_minutes = s.total_time_minutes + c.total_time,
+            timed_courses = s.timed_courses + c.timed,
+            updated_at = CURRENT_TIMESTAMP
+        FROM changed c
+        WHERE s.employee_id = c.employee_id AND NOT c.adds
+    )
+    INSERT INTO employee_progress_summary AS s
+        (employee_id, total_courses_assigned, courses_completed, courses_in_progress,
+         courses_not_started, courses_failed, total_time_minutes, timed_courses)
+    SELECT employee_id, total, completed, in_progress, not_started, failed, total_time, timed
+    FROM changed
+    WHERE adds
+    ON CONFLICT (employee_id) DO UPDATE
+    SET total_courses_assigned = s.total_courses_assigned + EXCLUDED.total_courses_assigned,
+        courses_completed = s.courses_completed + EXCLUDED.courses_completed,
+        courses_in_progress = s.courses_in_progress + EXCLUDED.courses_in_progress,
+        courses_not_started = s.courses_not_started + EXCLUDED.courses_not_started,
+        courses_failed = s.courses_failed + EXCLUDED.courses_failed,
+        total_time_minutes = s.total_time_minutes + EXCLUDED.total_time_minutes,
+        timed_courses = s.timed_courses + EXCLUDED.timed_courses,
+        updated_at = CURRENT_TIMESTAMP;
+
+    WITH d AS (
+        SELECT course_id,
+               SUM(sign) AS total,
+               SUM(CASE WHEN status = 'completed' THEN sign ELSE 0 END) AS completed,
+               SUM(CASE WHEN status = 'in_progress' THEN sign ELSE 0 END) AS in_progress,
+               SUM(CASE WHEN status = 'assigned' THEN sign ELSE 0 END) AS not_started,
+               SUM(CASE WHEN status = 'failed' THEN sign ELSE 0 END) AS failed,
+               SUM(COALESCE(time_taken_minutes, 0) * sign) AS total_time,
+               SUM(CASE WHEN time_taken_minutes IS NOT NULL THEN sign ELSE 0 END) AS timed,
+               bool_or(sign > 0) AS adds
+        FROM unnest(changes)
+        GROUP BY course_id
+    ),
+    changed AS (
+        SELECT * FROM d
+        WHERE (total, completed, in_progress, not_started, failed, total_time, timed)
+              <> (0, 0, 0, 0, 0, 0, 0)
+    ),
+    removed AS (
+        UPDATE course_progress_summary s
+        SET total_employees_assigned = s.total_employees_assigned + c.total,
+            employees_completed = s.employees_completed + c.completed,
+            employees_in_progress = s.employees_in_progress + c.in_progress,
+            employees_not_started = s.employees_not_started + c.not_started,
+            employees_failed = s.employees_failed + c.failed,
+            total_time_minutes = s.total_time_minutes + c.total_time,
+            timed_employees = s.timed_employees + c.timed,
+            updated_at = CURRENT_TIMESTAMP
+        FROM changed c
+        WHERE s.course_id = c.course_id AND NOT c.adds
+    )
+    INSERT INTO course_progress_summary AS s
+        (course_id, total_employees_assigned, employees_completed, employees_in_progress,
+         employees_not_started, employees_failed, total_time_minutes, timed_employees)
+    SELECT course_id, total, completed, in_progress, not_started, failed, total_time, timed
+    FROM changed
+    WHERE adds
+    ON CONFLICT (course_id) DO UPDATE
+    SET total_employees_assigned = s.total_employees_assigned + EXCLUDED.total_employees_assigned,
+        employees_completed = s.employees_completed + EXCLUDED.employees_completed,
+        employees_in_progress = s.employees_in_progress + EXCLUDED.employees_in_progress,
+        employees_not_started = s.employees_not_started + EXCLUDED.employees_not_started,
+        employees_failed = s.employees_failed + EXCLUDED.employees_failed,
+        total_time_minutes = s.total_time_minutes + EXCLUDED.total_time_minutes,
+        timed_employees = s.timed_employees + EXCLUDED.timed_employees,
+        updated_at = CURRENT_TIMESTAMP;
+END;
+$$ language 'plpgsql';
+
+-- Statement-level, like the notification counters: an UPDATE contributes its old rows
+-- with sign -1 and its new rows with sign 1, so unchanged rows cancel out.
+CREATE OR REPLACE FUNCTION maintain_progress_summaries()
+RETURNS TRIGGER AS $$
+DECLARE
+    changes progress_change[] := '{}';
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        changes := changes || ARRAY(
+            SELECT ROW(employee_id, course_id, status, time_taken_minutes, -1)::progress_change
+            FROM old_rows
+        );
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        changes := changes || ARRAY(
+            SELECT ROW(employee_id, course_id, status, time_taken_minutes, 1)::progress_change
+            FROM new_rows
+        );
+    END IF;
+    PERFORM apply_progress_changes(changes);
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE OR REPLACE FUNCTION maintain_course_quiz_summary()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO course_progress_summary AS s (course_id, passed_score_sum, passed_attempts)
+        SELECT course_id, SUM(score), COUNT(*)
+        FROM new_rows
+        WHERE passed
+        GROUP BY course_id
+        ON CONFLICT (course_id) DO UPDATE
+        SET passed_score_sum = s.passed_score_sum + EXCLUDED.passed_score_sum,
+            passed_attempts = s.passed_attempts + EXCLUDED.passed_attempts,
+            updated_at = CURRENT_TIMESTAMP;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE course_progress_summary s
+        SET passed_score_sum = s.passed_score_sum - d.score_sum,
+            passed_attempts = s.passed_attempts - d.passed,
+            updated_at = CURRENT_TIMESTAMP
+        FROM (
+            SELECT course_id, SUM(score) AS score_sum, COUNT(*) AS passed
+            FROM old_rows
+            WHERE passed
+            GROUP BY course_id
+        ) d
+        WHERE s.course_id = d.course_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE OR REPLACE FUNCTION delete_employee_progress_summary()
+RETURNS TRIGGER AS $$
+BEGIN
+    DELETE FROM employee_progress_summary WHERE employee_id = OLD.employee_id;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+-- Transition tables require one trigger per event
+CREATE TRIGGER maintain_progress_summaries_insert
+    AFTER INSERT ON employee_course_progress
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION maintain_progress_summaries();
+
+CREATE TRIGGER maintain_progress_summaries_update
+    AFTER UPDATE ON employee_course_progress
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION maintain_progress_summaries();
+
+CREATE TRIGGER maintain_progress_summaries_delete
+    AFTER DELETE ON employee_course_progress
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION maintain_progress_summaries();
+
+CREATE TRIGGER maintain_course_quiz_summary_insert
+    AFTER INSERT ON quiz_attempts
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION maintain_course_quiz_summary();
+
+CREATE TRIGGER maintain_course_quiz_summary_delete
+    AFTER DELETE ON quiz_attempts
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION maintain_course_quiz_summary();
+
+CREATE TRIGGER delete_employee_progress_summary
+    AFTER DELETE ON employees
+    FOR EACH ROW
+    EXECUTE FUNCTION delete_employee_progress_summary();
+
+-- Notification unread counters. Statement-level triggers with transition tables apply
+-- one aggregated delta per employee, so set-based inserts and updates stay cheap.
+CREATE OR REPLACE FUNCTION maintain_notification_counters()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO notification_counters AS c (employee_id, unread_count)
+        SELECT employee_id, COUNT(*)
+        FROM new_rows
+        WHERE NOT is_read
+        GROUP BY employee_id
+        ON CONFLICT (employee_id) DO UPDATE
+        SET unread_count = c.unread_count + EXCLUDED.unread_count,
+            updated_at = CURRENT_TIMESTAMP;
+    ELSIF TG_OP = 'UPDATE' THEN
+        -- Upsert like INSERT: marking a notification unread may be an employee's first unread
+        INSERT INTO notification_counters AS c (employee_id, unread_count)
+        SELECT employee_id, SUM(delta)
+        FROM (
+            SELECT employee_id, CASE WHEN is_read THEN 0 ELSE 1 END AS delta FROM new_rows
+            UNION ALL
+            SELECT employee_id, CASE WHEN is_read THEN 0 ELSE -1 END FROM old_rows
+        ) changes
+        GROUP BY employee_id
+        HAVING SUM(delta) <> 0
+        ON CONFLICT (employee_id) DO UPDATE
+        SET unread_count = c.unread_count + EXCLUDED.unread_count,
+            updated_at = CURRENT_TIMESTAMP;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE notification_counters c
+        SET unread_count = c.unread_count - d.unread,
+            updated_at = CURRENT_TIMESTAMP
+        FROM (
+            SELECT employee_id, COUNT(*) AS unread
+            FROM old_rows
+            WHERE NOT is_read
+            GROUP BY employee_id
+        ) d
+        WHERE c.employee_id = d.employee_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+-- Transition tables require one trigger per event
+CREATE TRIGGER maintain_notification_counters_insert
+    AFTER INSERT ON notifications
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION maintain_notification_counters();
+
+CREATE TRIGGER maintain_notification_counters_update
+    AFTER UPDATE ON notifications
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION maintain_notification_counters();
+
+CREATE TRIGGER maintain_notification_counters_delete
+    AFTER DELETE ON notifications
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION maintain_notification_counters();
+
+-- Recompute unread counters from scratch (to repair drift)
+CREATE OR REPLACE FUNCTION rebuild_notification_counters()
+RETURNS VOID AS $$
+BEGIN
+    LOCK TABLE notifications IN SHARE MODE;
+    TRUNCATE notification_counters;
+    INSERT INTO notification_counters (employee_id, unread_count)
+    SELECT employee_id, COUNT(*)
+    FROM notifications
+    WHERE NOT is_read
+    GROUP BY employee_id;
+END;
+$$ language 'plpgsql';
+
+-- Recompute attempt summaries from quiz_attempts and the partitions archived from it
+-- (after bulk loads or to repair drift). attempt_count never goes down, so attempt
+-- numbers are not reused after archived partitions are dropped; rows with no
+-- remaining attempts are kept as they are.
+CREATE OR REPLACE FUNCTION rebuild_quiz_attempt_summary()
+RETURNS VOID AS $$
+DECLARE
+    columns TEXT := 'employee_id, course_id, attempt_id, attempt_number, score, passed, attempted_at';
+    source TEXT := 'SELECT ' || columns || ' FROM quiz_attempts';
+    archived RECORD;
+BEGIN
+    FOR archived IN
+        SELECT c.relname
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'archive' AND c.relkind = 'r' AND c.relname ~ '^quiz_attempts_p[0-9]{6}$'
+    LOOP
+        source := source || format(' UNION ALL SELECT %s FROM archive.%I', columns, archived.relname);
+    END LOOP;
+
+    LOCK TABLE quiz_attempts, quiz_attempt_summary IN SHARE ROW EXCLUSIVE MODE;
+    EXECUTE format($query$
+        INSERT INTO quiz_attempt_summary AS s
+            (employee_id, course_id, attempt_count, best_score, last_score, last_attempted_at,
+             first_passed_at, passed_attempts, passed_score_sum)
+        SELECT employee_id,
+               course_id,
+               MAX(attempt_number),
+               MAX(score),
+               (array_agg(score ORDER BY attempted_at DESC, attempt_id DESC))[1],
+               MAX(attempted_at),
+               MIN(attempted_at) FILTER (WHERE passed),
+               COUNT(*) FILTER (WHERE passed),
+               COALESCE(SUM(score) FILTER (WHERE passed), 0)
+        FROM (%s) a
+        GROUP BY employee_id, course_id
+        ON CONFLICT (employee_id, course_id) DO UPDATE
+        SET attempt_count = GREATEST(s.attempt_count, EXCLUDED.attempt_count),
+            best_score = EXCLUDED.best_score,
+            last_score = EXCLUDED.last_score,
+            last_attempted_at = EXCLUDED.last_attempted_at,
+            first_passed_at = EXCLUDED.first_passed_at,
+            passed_attempts = EXCLUDED.passed_attempts,
+            passed_score_sum = EXCLUDED.passed_score_sum
+    $query$, source);
+END;
+$$ language 'plpgsql';
+
+-- Recompute both summaries from scratch (after bulk loads or to repair drift)
+CREATE OR REPLACE FUNCTION rebuild_progress_summaries()
+RETURNS VOID AS $$
+BEGIN
+    LOCK TABLE employee_course_progress, quiz_attempts IN SHARE MODE;
+    TRUNCATE employee_progress_summary, course_progress_summary;
+
+    INSERT INTO employee_progress_summary
+        (employee_id, total_courses_assigned, courses_completed, courses_in_progress,
+         courses_not_started, courses_failed, total_time_minutes, timed_courses)
+    SELECT employee_id,
+           COUNT(*),
+           COUNT(*) FILTER (WHERE status = 'completed'),
+           COUNT(*) FILTER (WHERE status = 'in_progress'),
+           COUNT(*) FILTER (WHERE status = 'assigned'),
+           COUNT(*) FILTER (WHERE status = 'failed'),
+           COALESCE(SUM(time_taken_minutes), 0),
+           COUNT(time_taken_minutes)
+    FROM employee_course_progress
+    GROUP BY employee_id;
+
+    INSERT INTO course_progress_summary
+        (course_id, total_employees_assigned, employees_completed, employees_in_progress,
+         employees_not_started, employees_failed, total_time_minutes, timed_employees,
+         passed_score_sum, passed_attempts)
+    SELECT COALESCE(p.course_id, q.course_id),
+           COALESCE(p.total, 0), COALESCE(p.completed, 0), COALESCE(p.in_progress, 0),
+           COALESCE(p.not_started, 0), COALESCE(p.failed, 0),
+           COALESCE(p.total_time, 0), COALESCE(p.timed, 0),
+           COALESCE(q.score_sum, 0), COALESCE(q.passed, 0)
+    FROM (
+        SELECT course_id,
+               COUNT(*) AS total,
+               COUNT(*) FILTER (WHERE status = 'completed') AS completed,
+               COUNT(*) FILTER (WHERE status = 'in_progress') AS in_progress,
+               COUNT(*) FILTER (WHERE status = 'assigned') AS not_started,
+               COUNT(*) FILTER (WHERE status = 'failed') AS failed,
+               SUM(time_taken_minutes) AS total_time,
+               COUNT(time_taken_minutes) AS timed
+        FROM employee_course_progress
+        GROUP BY course_id
+    ) p
+    FULL JOIN (
+        SELECT course_id, SUM(score) AS score_sum, COUNT(*) AS passed
+        FROM quiz_attempts
+        WHERE passed
+        GROUP BY course_id
+    ) q ON q.course_id = p.course_id;
+END;
+$$ language 'plpgsql';
+
+-- ============================================================================
+-- REPORT ROLLUP TABLES
+-- ============================================================================
+-- Department x course aggregates; track and subtrack rollups sum these through
+-- course_catalog. Refreshed incrementally by the report_rollup_refresh job, which
+-- recomputes only courses touched since the last watermark.
+
+CREATE TABLE report_rollup_department_course (
+    department VARCHAR(100) NOT NULL,
+    course_id VARCHAR(50) NOT NULL,
+    total_assigned INTEGER NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT 0,
+    in_progress INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    total_time_minutes BIGINT NOT NULL DEFAULT 0,
+    timed_count INTEGER NOT NULL DEFAULT 0,
+    passed_score_sum DECIMAL(14,2) NOT NULL DEFAULT 0,
+    passed_attempts INTEGER NOT NULL DEFAULT 0,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (department, course_id)
+);
+
+CREATE INDEX idx_rollup_course ON report_rollup_department_course(course_id);
+
+COMMENT ON COLUMN report_rollup_department_course.department IS 'Employee department, empty string when unset';
+
+-- Courses that lost progress rows (directly or by deleting employees); the updated_at
+-- watermark cannot see deletes, so the next refresh recomputes these too
+CREATE TABLE report_rollup_dirty_courses (
+    course_id VARCHAR(50) PRIMARY KEY,
+    marked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE OR REPLACE FUNCTION mark_rollup_courses_dirty()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO report_rollup_dirty_courses (course_id)
+    SELECT DISTINCT course_id FROM old_rows
+    ON CONFLICT (course_id) DO NOTHING;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER mark_rollup_courses_dirty
+    AFTER DELETE ON employee_course_progress
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION mark_rollup_courses_dirty();
+
+CREATE TABLE report_refresh_state (
+    report_name VARCHAR(50) PRIMARY KEY,
+    watermark TIMESTAMP NOT NULL,
+    last_id BIGINT,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMENT ON COLUMN report_refresh_state.last_id IS 'Highest id processed, for reports over append-only tables';
+
+-- ============================================================================
+-- QUESTION ITEM STATISTICS
+-- ============================================================================
+-- Additive sums per course and question, accumulated from new quiz attempts by the
+-- item_analysis job. Difficulty, point-biserial discrimination and option rates are
+-- derived from them on read, so each response row is only ever aggregated once.
+
+CREATE TABLE question_item_stats (
+    course_id VARCHAR(50) NOT NULL,
+    question_id VARCHAR(50) NOT NULL,
+    responses BIGINT NOT NULL DEFAULT 0,
+    correct BIGINT NOT NULL DEFAULT 0,
+    score_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    score_sq_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    correct_score_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    selected_a BIGINT NOT NULL DEFAULT 0,
+    selected_b BIGINT NOT NULL DEFAULT 0,
+    selected_c BIGINT NOT NULL DEFAULT 0,
+    selected_d BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (course_id, question_id)
+);
+
+CREATE INDEX idx_item_stats_question ON question_item_stats(question_id);
+
+COMMENT ON COLUMN question_item_stats.correct_score_sum IS 'Sum of attempt scores over correct responses';
+
+-- ============================================================================
+-- PARTITION MANAGEMENT
+-- ============================================================================
+-- Partitioned tables (the three quiz attempt tables, and notifications once converted with
+-- backend/database/partitioning/) get one partition per month named <parent>_pYYYYMM.
+-- There is no DEFAULT partition: rows in it would block creating their month's partition,
+-- and moving them out would fire ON DELETE CASCADE. Partitions are instead created a year
+-- ahead at startup and by the maintenance jobs, which also detach, archive or drop old ones.
+
+CREATE OR REPLACE FUNCTION create_monthly_partitions(parent TEXT, from_date DATE, to_date DATE)
+RETURNS INTEGER AS $$
+DECLARE
+    month_start DATE := date_trunc('month', from_date)::date;
+    partition_name TEXT;
+    default_name TEXT := parent || '_default';
+    partition_key TEXT;
+    blocked BOOLEAN;
+    created INTEGER := 0;
+BEGIN
+    -- Drop a DEFAULT partition left by earlier versions once it is empty
+    IF to_regclass(default_name) IS NOT NULL THEN
+        EXECUTE format('SELECT EXISTS (SELECT 1 FROM %I)', default_name) INTO blocked;
+        IF NOT blocked THEN
+            EXECUTE format('ALTER TABLE %I DETACH PARTITION %I', parent, default_name);
+            EXECUTE format('DROP TABLE %I', default_name);
+        ELSE
+            SELECT a.attname INTO partition_key
+            FROM pg_partitioned_table p
+            JOIN pg_attribute a ON a.attrelid = p.partrelid AND a.attnum = p.partattrs[0]
+            WHERE p.partrelid = to_regclass(parent);
+        END IF;
+    END IF;
+
+    WHILE month_start <= to_date LOOP
+        partition_name := parent || '_p' || to_char(month_start, 'YYYYMM');
+        IF to_regclass(partition_name) IS NULL THEN
+            blocked := FALSE;
+            IF partition_key IS NOT NULL THEN
+                EXECUTE format('SELECT EXISTS (SELECT 1 FROM %I WHERE %I >= %L AND %I < %L)',
+                    default_name, partition_key, month_start,
+                    partition_key, (month_start + INTERVAL '1 month')::date) INTO blocked;
+            END IF;
+
+            IF blocked THEN
+                RAISE WARNING '% holds rows for %; move them before % can be created',
+                    default_name, to_char(month_start, 'YYYY-MM'), partition_name;
+            ELSE
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                    partition_name, parent, month_start, (month_start + INTERVAL '1 month')::date
+                );
+                created := created + 1;
+            END IF;
+        END IF;
+        month_start := (month_start + INTERVAL '1 month')::date;
+    END LOOP;
+    RETURN created;
+END;
+$$ language 'plpgsql';
+
+SELECT create_monthly_partitions('quiz_attempts', CURRENT_DATE, (CURRENT_DATE + INTERVAL '12 months')::date);
+SELECT create_monthly_partitions('quiz_responses', CURRENT_DATE, (CURRENT_DATE + INTERVAL '12 months')::date);
+SELECT create_monthly_partitions('quiz_attempt_answers', CURRENT_DATE, (CURRENT_DATE + INTERVAL '12 months')::date);
+
 -- ============================================================================
 -- VIEWS FOR REPORTING
 -- ============================================================================
+-- Both views read the summary tables, so filtering by id is a primary-key lookup.
 
 -- View: Employee Progress Summary
 CREATE OR REPLACE VIEW v_employee_progress_summary AS
@@ -169,36 +1042,30 @@ SELECT
     e.employee_name,
     e.email,
     e.department,
-    COUNT(DISTINCT ecp.course_id) as total_courses_assigned,
-    COUNT(DISTINCT CASE WHEN ecp.status = 'completed' THEN ecp.course_id END) as courses_completed,
-    COUNT(DISTINCT CASE WHEN ecp.status = 'in_progress' THEN ecp.course_id END) as courses_in_progress,
-    COUNT(DISTINCT CASE WHEN ecp.status = 'assigned' THEN ecp.course_id END) as courses_not_started,
+    COALESCE(s.total_courses_assigned, 0) as total_courses_assigned,
+    COALESCE(s.courses_completed, 0) as courses_completed,
+    COALESCE(s.courses_in_progress, 0) as courses_in_progress,
+    COALESCE(s.courses_not_started, 0) as courses_not_started,
     ROUND(
-        CAST(COUNT(DISTINCT CASE WHEN ecp.status = 'completed' THEN ecp.course_id END) AS DECIMAL) /
-        NULLIF(COUNT(DISTINCT ecp.course_id), 0) * 100,
+        CAST(s.courses_completed AS DECIMAL) / NULLIF(s.total_courses_assigned, 0) * 100,
         2
     ) as completion_rate,
-    AVG(ecp.time_taken_minutes) as avg_time_minutes
+    CAST(s.total_time_minutes AS DECIMAL) / NULLIF(s.timed_courses, 0) as avg_time_minutes
 FROM employees e
-LEFT JOIN employee_course_progress ecp ON e.employee_id = ecp.employee_id
-GROUP BY e.employee_id, e.employee_name, e.email, e.department;
+LEFT JOIN employee_progress_summary s ON s.employee_id = e.employee_id;
 
 -- View: Course Completion Statistics
 CREATE OR REPLACE VIEW v_course_statistics AS
 SELECT
-    ecp.course_id,
-    COUNT(DISTINCT ecp.employee_id) as total_employees_assigned,
-    COUNT(DISTINCT CASE WHEN ecp.status = 'completed' THEN ecp.employee_id END) as employees_completed,
-    COUNT(DISTINCT CASE WHEN ecp.status = 'in_progress' THEN ecp.employee_id END) as employees_in_progress,
-    COUNT(DISTINCT CASE WHEN ecp.status = 'failed' THEN ecp.employee_id END) as employees_failed,
-    ROUND(
-        AVG(CASE WHEN qa.passed = TRUE THEN qa.score END),
-        2
-    ) as avg_quiz_score,
-    AVG(ecp.time_taken_minutes) as avg_time_minutes
-FROM employee_course_progress ecp
-LEFT JOIN quiz_attempts qa ON ecp.employee_id = qa.employee_id AND ecp.course_id = qa.course_id
-GROUP BY ecp.course_id;
+    s.course_id,
+    s.total_employees_assigned,
+    s.employees_completed,
+    s.employees_in_progress,
+    s.employees_failed,
+    ROUND(s.passed_score_sum / NULLIF(s.passed_attempts, 0), 2) as avg_quiz_score,
+    CAST(s.total_time_minutes AS DECIMAL) / NULLIF(s.timed_employees, 0) as avg_time_minutes
+FROM course_progress_summary s
+WHERE s.total_employees_assigned > 0;
 
 -- ============================================================================
 -- INITIAL DATA
@@ -234,3 +1101,26 @@ VALUES
      'List',
      'C')
 ON CONFLICT (question_id) DO NOTHING;
+
+-- Mirror the sample structure created in FalkorDB
+INSERT INTO track_catalog (track_id, track_name)
+VALUES
+    ('T001', 'Data Science'),
+    ('T002', 'Foundational Skills')
+ON CONFLICT (track_id) DO NOTHING;
+
+INSERT INTO subtrack_catalog (subtrack_id, subtrack_name, track_id)
+VALUES
+    ('ST001', 'Machine Learning', 'T001'),
+    ('ST002', 'Deep Learning', 'T001')
+ON CONFLICT (subtrack_id) DO NOTHING;
+
+INSERT INTO course_catalog (course_id, course_name, parent_type, parent_id, subtrack_id, track_id)
+VALUES
+    ('C001', 'Exploratory Data Analysis (EDA)', 'subtrack', 'ST001', 'ST001', 'T001'),
+    ('C002', 'Principal Component Analysis (PCA)', 'subtrack', 'ST001', 'ST001', 'T001'),
+    ('C003', 'Python Programming Basics', 'track', 'T002', NULL, 'T002'),
+    ('C004', 'Univariate Analysis', 'course', 'C001', 'ST001', 'T001'),
+    ('C005', 'Multivariate Analysis', 'course', 'C001', 'ST001', 'T001'),
+    ('C006', 'Neural Networks Fundamentals', 'subtrack', 'ST002', 'ST002', 'T001')
+ON CONFLICT (course_id) DO NOTHING;
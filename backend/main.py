@@ -9,6 +9,11 @@ import logging
 from backend.config import settings
 from backend.database import postgres_db, falkor_db
 from backend.routers import auth, admin, employee
+from backend.services.employee_import import shutdown_hash_pool
+from backend.services.exports import EXPORT_PURGE_INTERVAL_SECONDS, purge_expired_exports
+from backend.services.jobs import job_runner
+from backend.services.partitions import ensure_all_partitions
+from backend.services.report_cache import report_cache
 
 # Configure logging
 logging.basicConfig(
@@ -55,6 +60,25 @@ async def startup_event():
     except Exception as e:
         logger.error(f"Failed to connect to FalkorDB: {e}")
 
+    # Make sure inserts have partitions even if no worker runs partition_maintenance
+    try:
+        ensure_all_partitions()
+    except Exception as e:
+        logger.error(f"Failed to create partitions: {e}")
+
+    # Start background job workers
+    if settings.JOB_WORKERS > 0:
+        job_runner.schedule("report_rollup_refresh", settings.REPORT_ROLLUP_REFRESH_SECONDS)
+        job_runner.schedule("item_analysis", settings.ITEM_ANALYSIS_REFRESH_SECONDS)
+        job_runner.schedule("course_reminders", settings.REMINDER_RUN_INTERVAL_SECONDS)
+        job_runner.schedule("notification_retention", settings.NOTIFICATION_RETENTION_INTERVAL_SECONDS)
+        job_runner.schedule("partition_maintenance", settings.PARTITION_MAINTENANCE_INTERVAL_SECONDS)
+        if settings.NOTIFICATION_ENABLED:
+            job_runner.schedule("push_delivery", settings.PUSH_POLL_SECONDS)
+        # Export files are local to the worker's host, so each host cleans its own
+        job_runner.schedule_local("export_cleanup", purge_expired_exports, EXPORT_PURGE_INTERVAL_SECONDS)
+        job_runner.start(settings.JOB_WORKERS)
+
     logger.info("Application startup complete")
 
 
@@ -63,12 +87,21 @@ async def shutdown_event():
     """Clean up database connections on shutdown"""
     logger.info("Shutting down Learning Management System...")
 
+    # Stop background job workers before closing their connections
+    job_runner.stop()
+
     # Close PostgreSQL connection pool
     postgres_db.close_pool()
 
     # Close FalkorDB connection
     falkor_db.close()
 
+    # Stop bulk import hashing workers
+    shutdown_hash_pool()
+
+    # Stop background report refreshes
+    report_cache.shutdown()
+
     logger.info("Application shutdown complete")
 
 
@@ -1,8 +1,8 @@
 """
 Pydantic models for request/response validation
 """
-from pydantic import BaseModel, EmailStr, Field, validator
-from typing import Optional, List, Literal
+from pydantic import BaseModel, EmailStr, Field, validator, model_validator
+from typing import Dict, Optional, List, Literal
 from datetime import datetime
 from decimal import Decimal
 
@@ -14,6 +14,11 @@ from decimal import Decimal
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str = Field(..., min_length=1)
 
 
 class TokenData(BaseModel):
@@ -60,6 +65,27 @@ class EmployeeResponse(BaseModel):
         from_attributes = True
 
 
+class EmployeePage(BaseModel):
+    items: List[EmployeeResponse]
+    next_cursor: Optional[str] = None
+
+
+class ImportRowError(BaseModel):
+    row: int
+    employee_id: Optional[str] = None
+    error: str
+
+
+class EmployeeImportReport(BaseModel):
+    total_rows: int
+    imported: int
+    failed: int
+    errors: List[ImportRowError] = []
+    errors_truncated: bool = False
+    elapsed_seconds: float
+    rows_per_second: Optional[float] = None
+
+
 # ============================================================================
 # TRACK MODELS
 # ============================================================================
@@ -99,11 +125,17 @@ class CourseCreate(BaseModel):
     course_name: str = Field(..., min_length=1, max_length=255)
     parent_type: Literal["track", "subtrack", "course"]
     parent_id: str = Field(..., min_length=1, max_length=50)
+    quiz_size: Optional[int] = Field(None, ge=1)
 
 
 class CourseResponse(BaseModel):
     course_id: str
     course_name: str
+    quiz_size: Optional[int] = None
+
+
+class QuizSettings(BaseModel):
+    quiz_size: Optional[int] = Field(None, ge=1)
 
 
 class CourseDetail(CourseResponse):
@@ -159,6 +191,23 @@ class QuestionWithAnswer(QuestionResponse):
         from_attributes = True
 
 
+class QuestionQuality(BaseModel):
+    question_id: str
+    question_text: Optional[str] = None
+    correct_answer: Optional[Literal["A", "B", "C", "D"]] = None
+    responses: int
+    difficulty: float
+    discrimination: Optional[float] = None
+    option_rates: Dict[str, float]
+    flags: List[str]
+
+
+class QuestionQualityReport(BaseModel):
+    course_id: Optional[str] = None
+    items: List[QuestionQuality]
+    next_offset: Optional[int] = None
+
+
 # ============================================================================
 # ASSIGNMENT MODELS
 # ============================================================================
@@ -176,6 +225,28 @@ class AssignmentResponse(BaseModel):
     message: str
 
 
+class BulkAssignmentCreate(BaseModel):
+    employee_ids: Optional[List[str]] = Field(None, min_length=1, max_length=50000)
+    department: Optional[str] = Field(None, min_length=1, max_length=100)
+    assignment_type: Literal["track", "subtrack", "course"]
+    assignment_id: str = Field(..., min_length=1, max_length=50)
+
+    @model_validator(mode="after")
+    def check_selector(self):
+        if bool(self.employee_ids) == bool(self.department):
+            raise ValueError("Provide exactly one of employee_ids or department")
+        return self
+
+
+class BulkAssignmentResponse(BaseModel):
+    assignment_type: str
+    assignment_id: str
+    employees_matched: int
+    courses: int
+    progress_records_created: int
+    notifications_created: int
+
+
 # ============================================================================
 # QUIZ MODELS
 # ============================================================================
@@ -187,7 +258,7 @@ class QuizAnswer(BaseModel):
 
 class QuizSubmission(BaseModel):
     course_id: str
-    answers: List[QuizAnswer]
+    answers: List[QuizAnswer] = Field(..., min_length=1)
 
 
 class QuizResult(BaseModel):
@@ -201,11 +272,46 @@ class QuizResult(BaseModel):
     passing_score: Decimal
     attempted_at: datetime
     incorrect_questions: List[dict] = []
+    incorrect_question_ids: List[str] = []
 
     class Config:
         from_attributes = True
 
 
+class QuizAttempt(BaseModel):
+    attempt_id: int
+    course_id: str
+    attempt_number: int
+    score: Decimal
+    total_questions: int
+    correct_answers: int
+    passed: bool
+    passing_score: Decimal
+    attempted_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class QuizAttemptPage(BaseModel):
+    items: List[QuizAttempt]
+    next_cursor: Optional[str] = None
+
+
+class QuizResponseDetail(BaseModel):
+    question_id: str
+    question_text: Optional[str] = None
+    selected_answer: str
+    correct_answer: Optional[str] = None
+    is_correct: bool
+    options: Optional[Dict[str, Optional[str]]] = None
+
+
+class QuizAttemptDetail(QuizAttempt):
+    employee_id: str
+    responses: List[QuizResponseDetail] = []
+
+
 # ============================================================================
 # PROGRESS MODELS
 # ============================================================================
@@ -220,6 +326,10 @@ class CourseProgress(BaseModel):
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     time_taken_minutes: Optional[int] = None
+    attempt_count: int = 0
+    best_score: Optional[Decimal] = None
+    last_score: Optional[Decimal] = None
+    first_passed_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
@@ -249,6 +359,116 @@ class CourseStatistics(BaseModel):
     avg_time_minutes: Optional[Decimal] = None
 
 
+# ============================================================================
+# JOB MODELS
+# ============================================================================
+
+class JobResponse(BaseModel):
+    job_id: int
+    job_type: str
+    status: Literal["queued", "running", "succeeded", "failed"]
+    progress: Optional[dict] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    attempts: int
+    max_attempts: int
+    created_by: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+# ============================================================================
+# SEARCH MODELS
+# ============================================================================
+
+class SearchResult(BaseModel):
+    result_type: Literal["employee", "course", "question"]
+    id: str
+    title: str
+    subtitle: Optional[str] = None
+    score: float
+
+
+class SearchResults(BaseModel):
+    items: List[SearchResult]
+    next_offset: Optional[int] = None
+
+
+class RollupRow(BaseModel):
+    department: str
+    group_id: str
+    group_name: Optional[str] = None
+    total_assigned: int
+    completed: int
+    in_progress: int
+    failed: int
+    completion_rate: Optional[Decimal] = None
+    avg_quiz_score: Optional[Decimal] = None
+    avg_time_minutes: Optional[Decimal] = None
+
+
+class RollupReport(BaseModel):
+    group_by: Literal["track", "subtrack", "course"]
+    refreshed_at: Optional[datetime] = None
+    rows: List[RollupRow]
+
+
+class ExportCreate(BaseModel):
+    format: Literal["csv", "parquet"] = "csv"
+    department: Optional[str] = None
+    course_id: Optional[str] = None
+    status: Optional[Literal["assigned", "in_progress", "completed", "failed"]] = None
+
+
+# ============================================================================
+# ANALYTICS MODELS
+# ============================================================================
+
+class ProgressBreakdownCell(BaseModel):
+    row: str
+    column: Optional[str] = None
+    assigned: int
+    completed: int
+    in_progress: int
+    failed: int
+    completion_rate: float
+    avg_time_minutes: Optional[float] = None
+
+
+class ProgressBreakdown(BaseModel):
+    rows: str
+    columns: Optional[str] = None
+    refreshed_at: datetime
+    cells: List[ProgressBreakdownCell]
+
+
+class ScoreHistogramGroup(BaseModel):
+    group: str
+    total: int
+    counts: List[int]
+
+
+class ScoreHistogram(BaseModel):
+    group_by: Optional[str] = None
+    bin_edges: List[float]
+    refreshed_at: datetime
+    groups: List[ScoreHistogramGroup]
+
+
+class ScorePercentileGroup(BaseModel):
+    group: str
+    count: int
+    mean: float
+    percentiles: Dict[str, float]
+
+
+class ScorePercentiles(BaseModel):
+    group_by: Optional[str] = None
+    refreshed_at: datetime
+    groups: List[ScorePercentileGroup]
+
+
 # ============================================================================
 # NOTIFICATION MODELS
 # ============================================================================
@@ -272,3 +492,43 @@ class NotificationResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class NotificationPage(BaseModel):
+    items: List[NotificationResponse]
+    next_cursor: Optional[str] = None
+
+
+class UnreadCount(BaseModel):
+    unread_count: int
+
+
+class NotificationReadRequest(BaseModel):
+    notification_ids: Optional[List[int]] = Field(None, min_length=1, max_length=1000)
+    up_to_cursor: Optional[str] = None
+    all: bool = False
+
+    @model_validator(mode="after")
+    def check_selector(self):
+        if sum([bool(self.notification_ids), bool(self.up_to_cursor), self.all]) != 1:
+            raise ValueError("Provide exactly one of notification_ids, up_to_cursor or all")
+        return self
+
+
+class NotificationReadResponse(BaseModel):
+    updated: int
+    unread_count: int
+
+
+class DeviceTokenCreate(BaseModel):
+    token: str = Field(..., min_length=1, max_length=512)
+    platform: Literal["android", "ios", "web"]
+
+
+class PushDeliveryStats(BaseModel):
+    pending: int
+    due: int
+    sent: int
+    failed: int
+    skipped: int
+    oldest_pending_at: Optional[datetime] = None
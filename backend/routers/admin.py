@@ -2,23 +2,52 @@
 Admin Router
 Endpoints for content management, assignments, and reporting
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, UploadFile, File, status
+from fastapi.concurrency import run_in_threadpool
+from typing import List, Optional, Literal
+from datetime import datetime
+from pathlib import Path
+import shutil
+import socket
+import uuid
 import logging
 
 from backend.models.schemas import (
     TrackCreate, TrackResponse,
     SubTrackCreate, SubTrackResponse,
-    CourseCreate, CourseResponse,
+    CourseCreate, CourseResponse, QuizSettings,
     LinkCreate, LinkResponse,
     QuestionCreate, QuestionWithAnswer,
     AssignmentCreate, AssignmentResponse,
-    EmployeeCreate, EmployeeResponse,
-    EmployeeProgressReport, CourseStatistics
+    BulkAssignmentCreate, BulkAssignmentResponse,
+    EmployeeCreate, EmployeeResponse, EmployeePage, EmployeeImportReport,
+    EmployeeProgressReport, CourseStatistics, RollupReport,
+    SearchResults, JobResponse, ExportCreate,
+    ProgressBreakdown, ScoreHistogram, ScorePercentiles, QuestionQualityReport,
+    PushDeliveryStats, QuizAttemptPage, QuizAttemptDetail
 )
 from backend.utils.auth import get_current_admin_user, get_password_hash
+from backend.utils.ranges import range_file_response
+from backend.utils.pagination import (
+    encode_cursor, decode_timestamp_cursor, escape_like, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+)
 from backend.database import get_postgres_db, get_falkor_db
 from backend.database.init_falkordb import GraphInitializer
+from backend.services.employee_import import import_employees_csv
+from backend.services.jobs import JobContext, job_handler, enqueue_job, get_job
+from backend.services.assignments import create_assignment_records
+from backend.services.reports import get_rollup
+from backend.services.quiz_history import list_attempts, get_attempt_detail
+from backend.services.quiz_sampling import add_to_question_bank
+from backend.services.report_cache import report_cache
+from backend.services.exports import MEDIA_TYPES, export_path, parquet_available
+from backend.services.analytics import analytics_engine
+from backend.services.item_analysis import get_question_quality
+from backend.services import reminders  # noqa: F401  (registers the course_reminders job)
+from backend.services import push  # noqa: F401  (registers the push_delivery job)
+from backend.services import retention  # noqa: F401  (registers the notification_retention job)
+from backend.services import partitions  # noqa: F401  (registers the partition_maintenance job)
+from backend.config import settings
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -39,6 +68,15 @@ async def create_track(
 
     try:
         initializer.create_track(track.track_id, track.track_name)
+
+        # Mirror the track into PostgreSQL for reporting
+        query = """
+        INSERT INTO track_catalog (track_id, track_name)
+        VALUES (%s, %s)
+        ON CONFLICT (track_id) DO UPDATE SET track_name = EXCLUDED.track_name
+        """
+        get_postgres_db().execute_query(query, (track.track_id, track.track_name))
+
         return TrackResponse(track_id=track.track_id, track_name=track.track_name)
     except Exception as e:
         logger.error(f"Failed to create track: {e}")
@@ -80,6 +118,17 @@ async def create_subtrack(
             subtrack.subtrack_name,
             subtrack.track_id
         )
+
+        # Mirror the subtrack into PostgreSQL for reporting
+        query = """
+        INSERT INTO subtrack_catalog (subtrack_id, subtrack_name, track_id)
+        VALUES (%s, %s, %s)
+        ON CONFLICT (subtrack_id) DO UPDATE
+        SET subtrack_name = EXCLUDED.subtrack_name,
+            track_id = EXCLUDED.track_id
+        """
+        get_postgres_db().execute_query(query, (subtrack.subtrack_id, subtrack.subtrack_name, subtrack.track_id))
+
         return SubTrackResponse(
             subtrack_id=subtrack.subtrack_id,
             subtrack_name=subtrack.subtrack_name,
@@ -128,12 +177,85 @@ async def create_course(
             course.parent_id,
             course.parent_type
         )
-        return CourseResponse(course_id=course.course_id, course_name=course.course_name)
+
+        # Mirror the course into PostgreSQL for search and reporting,
+        # resolving its subtrack and track from the parent
+        query = """
+        INSERT INTO course_catalog (course_id, course_name, parent_type, parent_id, subtrack_id, track_id, quiz_size)
+        SELECT %(course_id)s, %(course_name)s, %(parent_type)s, %(parent_id)s,
+               CASE %(parent_type)s
+                   WHEN 'subtrack' THEN %(parent_id)s
+                   WHEN 'course' THEN (SELECT subtrack_id FROM course_catalog WHERE course_id = %(parent_id)s)
+               END,
+               CASE %(parent_type)s
+                   WHEN 'track' THEN %(parent_id)s
+                   WHEN 'subtrack' THEN (SELECT track_id FROM subtrack_catalog WHERE subtrack_id = %(parent_id)s)
+                   ELSE (SELECT track_id FROM course_catalog WHERE course_id = %(parent_id)s)
+               END,
+               %(quiz_size)s
+        ON CONFLICT (course_id) DO UPDATE
+        SET course_name = EXCLUDED.course_name,
+            parent_type = EXCLUDED.parent_type,
+            parent_id = EXCLUDED.parent_id,
+            subtrack_id = EXCLUDED.subtrack_id,
+            track_id = EXCLUDED.track_id,
+            quiz_size = EXCLUDED.quiz_size
+        """
+        with get_postgres_db().get_cursor() as cursor:
+            cursor.execute(query, {
+                "course_id": course.course_id,
+                "course_name": course.course_name,
+                "parent_type": course.parent_type,
+                "parent_id": course.parent_id,
+                "quiz_size": course.quiz_size
+            })
+
+            # Give employees already assigned above this course their new progress rows.
+            # Queued in the same transaction, so a failure leaves no catalog row without
+            # its propagation; the graph MERGE makes a retried request safe.
+            enqueue_job(
+                "course_propagation", {"course_id": course.course_id},
+                created_by=current_user["id"], cursor=cursor
+            )
+
+        return CourseResponse(course_id=course.course_id, course_name=course.course_name, quiz_size=course.quiz_size)
     except Exception as e:
         logger.error(f"Failed to create course: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.put("/courses/{course_id}/quiz-settings", response_model=CourseResponse)
+async def update_quiz_settings(
+    course_id: str,
+    quiz_settings: QuizSettings,
+    current_user: dict = Depends(get_current_admin_user)
+):
+    """
+    Set how many questions are drawn from the course's bank per attempt
+    A null quiz_size serves the whole bank. Quizzes already served keep their questions.
+    """
+    postgres_db = get_postgres_db()
+
+    try:
+        query = """
+        UPDATE course_catalog
+        SET quiz_size = %s, updated_at = CURRENT_TIMESTAMP
+        WHERE course_id = %s
+        RETURNING course_id, course_name, quiz_size
+        """
+        result = postgres_db.execute_query(query, (quiz_settings.quiz_size, course_id), fetch=True)
+
+        if not result:
+            raise HTTPException(status_code=404, detail="Course not found")
+
+        return dict(result[0])
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to update quiz settings: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/courses", response_model=List[CourseResponse])
 async def get_all_courses(current_user: dict = Depends(get_current_admin_user)):
     """Get all courses"""
@@ -216,12 +338,33 @@ async def assign_question_to_course(
 
     try:
         initializer.add_question(question_id, course_id)
+        add_to_question_bank(course_id, question_id)
         return {"message": f"Question {question_id} assigned to course {course_id}"}
     except Exception as e:
         logger.error(f"Failed to assign question: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/questions/quality", response_model=QuestionQualityReport)
+async def get_question_quality_report(
+    course_id: Optional[str] = None,
+    min_responses: int = Query(30, ge=1),
+    sort: Literal["discrimination", "difficulty", "responses"] = "discrimination",
+    limit: int = Query(100, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    current_user: dict = Depends(get_current_admin_user)
+):
+    """
+    Difficulty, discrimination and option selection rates per question, with flags
+    for questions worth reviewing. Updated by the item_analysis job.
+    """
+    try:
+        return get_question_quality(course_id, min_responses, sort, limit, offset)
+    except Exception as e:
+        logger.error(f"Failed to get question quality: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # ============================================================================
 # EMPLOYEE MANAGEMENT
 # ============================================================================
@@ -266,32 +409,129 @@ async def create_employee(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/employees", response_model=List[EmployeeResponse])
-async def get_all_employees(current_user: dict = Depends(get_current_admin_user)):
-    """Get all employees"""
+@router.post("/employees/import", response_model=EmployeeImportReport)
+async def import_employees(
+    file: UploadFile = File(...),
+    current_user: dict = Depends(get_current_admin_user)
+):
+    """
+    Bulk create or update employees from a CSV file
+    Columns: employee_id, employee_name, email, department, role, password.
+    Invalid rows are skipped and reported; valid rows are loaded in batches.
+    """
+    try:
+        return await run_in_threadpool(import_employees_csv, file.file)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to import employees: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/employees/import/jobs", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def import_employees_job(
+    file: UploadFile = File(...),
+    current_user: dict = Depends(get_current_admin_user)
+):
+    """
+    Queue a bulk employee import as a background job (poll GET /jobs/{job_id}).
+    The upload is stored in this host's JOB_STORAGE_DIR, so the job is pinned to it.
+    """
+    upload_dir = Path(settings.JOB_STORAGE_DIR) / "imports"
+    path = upload_dir / f"{uuid.uuid4().hex}.csv"
+
+    try:
+        upload_dir.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as out:
+            await run_in_threadpool(shutil.copyfileobj, file.file, out)
+        return enqueue_job(
+            "employee_import", {"path": str(path)}, created_by=current_user["id"], pin_to_host=True
+        )
+    except Exception as e:
+        path.unlink(missing_ok=True)
+        logger.error(f"Failed to queue employee import: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _remove_import_upload(params: dict):
+    """Delete the uploaded CSV of an import that failed for good"""
+    Path(params["path"]).unlink(missing_ok=True)
+
+
+@job_handler("employee_import", on_failure=_remove_import_upload)
+def _run_employee_import_job(context: JobContext) -> dict:
+    """Import an uploaded CSV; rows are upserted, so a retry simply re-reads the file"""
+    path = Path(context.params["path"])
+    with open(path, "rb") as stream:
+        report = import_employees_csv(stream, on_batch=lambda counts: context.checkpoint(progress=counts))
+    path.unlink(missing_ok=True)
+    return report
+
+
+@router.get("/employees", response_model=EmployeePage)
+async def get_all_employees(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    role: Optional[Literal["admin", "employee"]] = None,
+    department: Optional[str] = None,
+    q: Optional[str] = Query(None, min_length=1, max_length=255),
+    current_user: dict = Depends(get_current_admin_user)
+):
+    """
+    Get employees, newest first, one keyset page at a time
+    Filter by role and department; `q` is a case-insensitive prefix of name or email.
+    Pass the returned `next_cursor` back as `cursor` to fetch the following page.
+    """
     postgres_db = get_postgres_db()
 
+    conditions = []
+    params: list = []
+
+    if role:
+        conditions.append("role = %s")
+        params.append(role)
+    if department:
+        conditions.append("department = %s")
+        params.append(department)
+    if q:
+        prefix = escape_like(q.lower()) + "%"
+        conditions.append("(LOWER(employee_name) LIKE %s OR LOWER(email) LIKE %s)")
+        params.extend([prefix, prefix])
+    if cursor:
+        last_created_at, last_employee_id = decode_timestamp_cursor(cursor)
+        conditions.append("(created_at, employee_id) < (%s::timestamp, %s)")
+        params.extend([last_created_at, last_employee_id])
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
     try:
-        query = """
-        SELECT employee_id, employee_name, email, role, created_at
+        # Shape rows into the response format in SQL, fetching one extra row to detect a next page
+        query = f"""
+        SELECT employee_id AS id,
+               SPLIT_PART(email, '@', 1) AS username,
+               email,
+               employee_name AS full_name,
+               role,
+               created_at
         FROM employees
-        ORDER BY created_at DESC
+        {where}
+        ORDER BY created_at DESC, employee_id DESC
+        LIMIT %s
         """
-        result = postgres_db.execute_query(query, fetch=True)
-
-        employees = []
-        for row in result:
-            user_data = dict(row)
-            employees.append({
-                "id": user_data["employee_id"],
-                "username": user_data["email"].split("@")[0],
-                "email": user_data["email"],
-                "full_name": user_data["employee_name"],
-                "role": user_data["role"],
-                "created_at": user_data["created_at"].isoformat() if user_data.get("created_at") else None
-            })
-
-        return employees
+        params.append(limit + 1)
+        result = postgres_db.execute_query(query, tuple(params), fetch=True)
+
+        rows = result[:limit]
+        next_cursor = None
+        if len(result) > limit:
+            last = rows[-1]
+            next_cursor = encode_cursor(last["created_at"].isoformat(), last["id"])
+
+        items = [
+            {**row, "created_at": row["created_at"].isoformat()}
+            for row in rows
+        ]
+        return {"items": items, "next_cursor": next_cursor}
     except Exception as e:
         logger.error(f"Failed to get employees: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -307,7 +547,6 @@ async def assign_employee(
     current_user: dict = Depends(get_current_admin_user)
 ):
     """Assign employee to Track, SubTrack, or Course"""
-    postgres_db = get_postgres_db()
     falkor_db = get_falkor_db()
     initializer = GraphInitializer(falkor_db)
 
@@ -325,23 +564,13 @@ async def assign_employee(
             assignment.assignment_id
         )
 
-        # Create records in employee_course_progress for each course
-        for course_id in courses:
-            query = """
-            INSERT INTO employee_course_progress
-            (employee_id, course_id, assignment_type, assignment_id, status)
-            VALUES (%s, %s, %s, %s, 'assigned')
-            ON CONFLICT (employee_id, course_id) DO NOTHING
-            """
-            postgres_db.execute_query(query, (
-                assignment.employee_id,
-                course_id,
-                assignment.assignment_type,
-                assignment.assignment_id
-            ))
-
-        # Send notification (placeholder - implement notification service)
-        _send_assignment_notification(assignment.employee_id, assignment.assignment_id)
+        # Create progress records and notification
+        create_assignment_records(
+            [assignment.employee_id],
+            courses,
+            assignment.assignment_type,
+            assignment.assignment_id
+        )
 
         return AssignmentResponse(
             employee_id=assignment.employee_id,
@@ -354,58 +583,285 @@ async def assign_employee(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/assignments/bulk", response_model=BulkAssignmentResponse)
+async def assign_employees_bulk(
+    assignment: BulkAssignmentCreate,
+    current_user: dict = Depends(get_current_admin_user)
+):
+    """Assign a list of employees, or a whole department, to a Track, SubTrack, or Course"""
+    postgres_db = get_postgres_db()
+    falkor_db = get_falkor_db()
+    initializer = GraphInitializer(falkor_db)
+
+    try:
+        # Resolve the cohort to existing employee ids
+        if assignment.employee_ids:
+            query = "SELECT employee_id FROM employees WHERE employee_id = ANY(%s)"
+            params = (list(assignment.employee_ids),)
+        else:
+            query = "SELECT employee_id FROM employees WHERE department = %s"
+            params = (assignment.department,)
+        employee_ids = [row["employee_id"] for row in postgres_db.execute_query(query, params, fetch=True)]
+
+        if not employee_ids:
+            raise HTTPException(status_code=404, detail="No matching employees found")
+
+        initializer.assign_employees(employee_ids, assignment.assignment_type, assignment.assignment_id)
+
+        # Expand the course set once for the whole cohort
+        courses = _get_accessible_courses(assignment.assignment_type, assignment.assignment_id)
+
+        progress_created, notifications_created = create_assignment_records(
+            employee_ids,
+            courses,
+            assignment.assignment_type,
+            assignment.assignment_id
+        )
+
+        return BulkAssignmentResponse(
+            assignment_type=assignment.assignment_type,
+            assignment_id=assignment.assignment_id,
+            employees_matched=len(employee_ids),
+            courses=len(courses),
+            progress_records_created=progress_created,
+            notifications_created=notifications_created
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to create bulk assignment: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/assignments/bulk/jobs", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def assign_employees_bulk_job(
+    assignment: BulkAssignmentCreate,
+    current_user: dict = Depends(get_current_admin_user)
+):
+    """Queue a bulk assignment as a background job (poll GET /jobs/{job_id})"""
+    try:
+        return enqueue_job("bulk_assignment", assignment.model_dump(), created_by=current_user["id"])
+    except Exception as e:
+        logger.error(f"Failed to queue bulk assignment: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+BULK_ASSIGNMENT_CHUNK_SIZE = 500
+
+
+@job_handler("bulk_assignment")
+def _run_bulk_assignment_job(context: JobContext) -> dict:
+    """Assign the cohort in chunks of employees, checkpointing after each chunk"""
+    params = context.params
+    postgres_db = get_postgres_db()
+
+    if params.get("employee_ids"):
+        query = "SELECT employee_id FROM employees WHERE employee_id = ANY(%s) ORDER BY employee_id"
+        query_params = (params["employee_ids"],)
+    else:
+        query = "SELECT employee_id FROM employees WHERE department = %s ORDER BY employee_id"
+        query_params = (params["department"],)
+    employee_ids = [row["employee_id"] for row in postgres_db.execute_query(query, query_params, fetch=True)]
+
+    courses = _get_accessible_courses(params["assignment_type"], params["assignment_id"])
+    initializer = GraphInitializer(get_falkor_db())
+
+    # Resume after the last completed chunk when retried
+    state = {"offset": 0, "progress_records_created": 0, "notifications_created": 0, **context.state}
+
+    while state["offset"] < len(employee_ids):
+        chunk = employee_ids[state["offset"]:state["offset"] + BULK_ASSIGNMENT_CHUNK_SIZE]
+        initializer.assign_employees(chunk, params["assignment_type"], params["assignment_id"])
+        progress_created, notifications_created = create_assignment_records(
+            chunk, courses, params["assignment_type"], params["assignment_id"]
+        )
+        state["offset"] += len(chunk)
+        state["progress_records_created"] += progress_created
+        state["notifications_created"] += notifications_created
+        context.checkpoint(state, progress={"employees_done": state["offset"], "employees_total": len(employee_ids)})
+
+    return {
+        "assignment_type": params["assignment_type"],
+        "assignment_id": params["assignment_id"],
+        "employees_matched": len(employee_ids),
+        "courses": len(courses),
+        "progress_records_created": state["progress_records_created"],
+        "notifications_created": state["notifications_created"],
+    }
+
+
 def _get_accessible_courses(assignment_type: str, assignment_id: str) -> List[str]:
     """Get all courses accessible by an assignment"""
     falkor_db = get_falkor_db()
 
+    if assignment_type == "track":
+        # Get all courses under track and its subtracks
+        query = """
+        MATCH (t:Track {track_id: $assignment_id})-[:has_subtrack*0..1]->(st)
+        -[:has_course*1..]->(c:Course)
+        RETURN DISTINCT c.course_id AS course_id
+        """
+    elif assignment_type == "subtrack":
+        # Get all courses under subtrack
+        query = """
+        MATCH (st:SubTrack {subtrack_id: $assignment_id})-[:has_course*1..]->(c:Course)
+        RETURN DISTINCT c.course_id AS course_id
+        """
+    else:  # course
+        # Get course and child courses
+        query = """
+        MATCH (c:Course {course_id: $assignment_id})-[:has_course*0..]->(child:Course)
+        RETURN DISTINCT child.course_id AS course_id
+        """
+
+    return [row[0] for row in falkor_db.execute_query(query, {"assignment_id": assignment_id})]
+
+
+@router.post("/reminders/run", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def run_course_reminders(current_user: dict = Depends(get_current_admin_user)):
+    """Queue a reminder run now instead of waiting for the daily schedule"""
     try:
-        if assignment_type == "track":
-            # Get all courses under track and its subtracks
-            query = f"""
-            MATCH (t:Track {{track_id: '{assignment_id}'}})-[:has_subtrack*0..1]->(st)
-            -[:has_course*1..]->(c:Course)
-            RETURN DISTINCT c.course_id AS course_id
-            """
-        elif assignment_type == "subtrack":
-            # Get all courses under subtrack
-            query = f"""
-            MATCH (st:SubTrack {{subtrack_id: '{assignment_id}'}})-[:has_course*1..]->(c:Course)
-            RETURN DISTINCT c.course_id AS course_id
-            """
-        else:  # course
-            # Get course and child courses
-            query = f"""
-            MATCH (c:Course {{course_id: '{assignment_id}'}})-[:has_course*0..]->(child:Course)
-            RETURN DISTINCT child.course_id AS course_id
-            """
+        return enqueue_job("course_reminders", {}, created_by=current_user["id"])
+    except Exception as e:
+        logger.error(f"Failed to queue course reminders: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
 
-        result = falkor_db.execute_query(query)
-        # Parse result - adjust based on actual FalkorDB response format
-        # This is a placeholder
-        return [assignment_id]  # Simplified for now
+
+@router.post("/notifications/deliver", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def run_push_delivery(current_user: dict = Depends(get_current_admin_user)):
+    """Queue a push delivery run now; the job result reports throughput"""
+    try:
+        return enqueue_job("push_delivery", {}, created_by=current_user["id"])
     except Exception as e:
-        logger.error(f"Failed to get accessible courses: {e}")
-        return [assignment_id]
+        logger.error(f"Failed to queue push delivery: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
 
 
-def _send_assignment_notification(employee_id: str, assignment_id: str):
-    """Send notification to employee about new assignment"""
+@router.post("/notifications/retention/run", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def run_notification_retention(current_user: dict = Depends(get_current_admin_user)):
+    """Queue a notification purge now instead of waiting for the hourly schedule"""
+    try:
+        return enqueue_job("notification_retention", {}, created_by=current_user["id"])
+    except Exception as e:
+        logger.error(f"Failed to queue notification retention: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/notifications/delivery/stats", response_model=PushDeliveryStats)
+async def get_push_delivery_stats(current_user: dict = Depends(get_current_admin_user)):
+    """Notification counts by delivery status, plus how many are due now"""
     postgres_db = get_postgres_db()
 
     try:
         query = """
-        INSERT INTO notifications
-        (employee_id, notification_type, title, message, course_id)
-        VALUES (%s, 'course_assigned', %s, %s, %s)
+        SELECT COUNT(*) FILTER (WHERE delivery_status = 'pending') AS pending,
+               COUNT(*) FILTER (WHERE delivery_status = 'pending' AND next_delivery_at <= CURRENT_TIMESTAMP) AS due,
+               COUNT(*) FILTER (WHERE delivery_status = 'sent') AS sent,
+               COUNT(*) FILTER (WHERE delivery_status = 'failed') AS failed,
+               COUNT(*) FILTER (WHERE delivery_status = 'skipped') AS skipped,
+               MIN(created_at) FILTER (WHERE delivery_status = 'pending') AS oldest_pending_at
+        FROM notifications
         """
-        postgres_db.execute_query(query, (
-            employee_id,
-            "New Course Assigned",
-            f"You have been assigned to: {assignment_id}",
-            assignment_id
-        ))
+        return postgres_db.execute_query(query, fetch=True)[0]
+    except Exception as e:
+        logger.error(f"Failed to get push delivery stats: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# ============================================================================
+# BACKGROUND JOBS
+# ============================================================================
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job_status(
+    job_id: int,
+    current_user: dict = Depends(get_current_admin_user)
+):
+    """Get status, progress and result of a background job"""
+    try:
+        job = get_job(job_id)
     except Exception as e:
-        logger.error(f"Failed to send notification: {e}")
+        logger.error(f"Failed to get job: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+# ============================================================================
+# SEARCH
+# ============================================================================
+
+# One ranked branch per searchable entity. Each branch is served by the trigram
+# (and for questions, full-text) GIN indexes; `%%` is the pg_trgm similarity operator.
+_SEARCH_QUERIES = {
+    "employee": """
+        SELECT 'employee' AS result_type, employee_id AS id,
+               employee_name AS title, email AS subtitle,
+               GREATEST(similarity(employee_name, %(q)s), similarity(email, %(q)s)) AS score
+        FROM employees
+        WHERE employee_name %% %(q)s OR email %% %(q)s
+           OR employee_name ILIKE %(pattern)s OR email ILIKE %(pattern)s
+    """,
+    "course": """
+        SELECT 'course' AS result_type, course_id AS id,
+               course_name AS title, course_id AS subtitle,
+               similarity(course_name, %(q)s) AS score
+        FROM course_catalog
+        WHERE course_name %% %(q)s OR course_name ILIKE %(pattern)s
+    """,
+    "question": """
+        SELECT 'question' AS result_type, question_id AS id,
+               question_text AS title, NULL AS subtitle,
+               GREATEST(
+                   ts_rank(search_vector, websearch_to_tsquery('english', %(q)s)),
+                   similarity(question_text, %(q)s)
+               ) AS score
+        FROM question_master
+        WHERE search_vector @@ websearch_to_tsquery('english', %(q)s)
+           OR question_text ILIKE %(pattern)s
+    """,
+}
+
+
+@router.get("/search", response_model=SearchResults)
+async def search(
+    q: str = Query(..., min_length=2, max_length=255),
+    types: List[Literal["employee", "course", "question"]] = Query(["employee", "course", "question"]),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=1000),
+    current_user: dict = Depends(get_current_admin_user)
+):
+    """Search employees, courses and questions, best matches first"""
+    postgres_db = get_postgres_db()
+
+    # Each branch only needs enough rows to cover the requested window
+    window = offset + limit + 1
+    branches = [
+        f"(SELECT * FROM ({_SEARCH_QUERIES[t]}) AS m ORDER BY score DESC, id LIMIT {window})"
+        for t in dict.fromkeys(types)
+    ]
+
+    try:
+        query = f"""
+        {" UNION ALL ".join(branches)}
+        ORDER BY score DESC, result_type, id
+        LIMIT %(limit)s OFFSET %(offset)s
+        """
+        result = postgres_db.execute_query(query, {
+            "q": q,
+            "pattern": f"%{escape_like(q)}%",
+            "limit": limit + 1,
+            "offset": offset
+        }, fetch=True)
+
+        items = [dict(row) for row in result[:limit]]
+        next_offset = offset + limit if len(result) > limit else None
+        return {"items": items, "next_offset": next_offset}
+    except Exception as e:
+        logger.error(f"Search failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
 
 
 # ============================================================================
@@ -420,14 +876,20 @@ async def get_employee_progress_report(
     """Get progress report for a specific employee"""
     postgres_db = get_postgres_db()
 
-    try:
+    def load():
         query = "SELECT * FROM v_employee_progress_summary WHERE employee_id = %s"
         result = postgres_db.execute_query(query, (employee_id,), fetch=True)
+        return dict(result[0]) if result else None
 
-        if not result:
+    try:
+        report = await run_in_threadpool(
+            report_cache.get_or_compute, "employee_progress", {"employee_id": employee_id}, load
+        )
+
+        if report is None:
             raise HTTPException(status_code=404, detail="Employee not found")
 
-        return dict(result[0])
+        return report
     except HTTPException:
         raise
     except Exception as e:
@@ -435,6 +897,45 @@ async def get_employee_progress_report(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/employees/{employee_id}/quiz-attempts", response_model=QuizAttemptPage)
+async def get_employee_quiz_attempts(
+    employee_id: str,
+    course_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    current_user: dict = Depends(get_current_admin_user)
+):
+    """
+    Get an employee's quiz attempts, newest first, one keyset page at a time
+    Pass the returned `next_cursor` back as `cursor` to fetch the following page.
+    """
+    try:
+        return list_attempts(employee_id, course_id=course_id, cursor=cursor, limit=limit)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to get quiz attempts: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/quiz-attempts/{attempt_id}", response_model=QuizAttemptDetail)
+async def get_quiz_attempt(
+    attempt_id: int,
+    attempted_at: Optional[datetime] = None,
+    current_user: dict = Depends(get_current_admin_user)
+):
+    """Get a quiz attempt with every answer and its question"""
+    try:
+        attempt = get_attempt_detail(attempt_id, attempted_at=attempted_at)
+    except Exception as e:
+        logger.error(f"Failed to get quiz attempt: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if not attempt:
+        raise HTTPException(status_code=404, detail="Quiz attempt not found")
+    return attempt
+
+
 @router.get("/reports/course/{course_id}", response_model=CourseStatistics)
 async def get_course_statistics(
     course_id: str,
@@ -443,16 +944,170 @@ async def get_course_statistics(
     """Get statistics for a specific course"""
     postgres_db = get_postgres_db()
 
-    try:
+    def load():
         query = "SELECT * FROM v_course_statistics WHERE course_id = %s"
         result = postgres_db.execute_query(query, (course_id,), fetch=True)
+        return dict(result[0]) if result else None
 
-        if not result:
+    try:
+        report = await run_in_threadpool(
+            report_cache.get_or_compute, "course_statistics", {"course_id": course_id}, load
+        )
+
+        if report is None:
             raise HTTPException(status_code=404, detail="Course not found")
 
-        return dict(result[0])
+        return report
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Failed to get course statistics: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/reports/rollup", response_model=RollupReport)
+async def get_rollup_report(
+    group_by: Literal["track", "subtrack", "course"] = "track",
+    department: Optional[str] = None,
+    track_id: Optional[str] = None,
+    subtrack_id: Optional[str] = None,
+    current_user: dict = Depends(get_current_admin_user)
+):
+    """
+    Completion rate, average quiz score and average time by department and
+    track, subtrack or course, served from pre-aggregated rollups
+    """
+    params = {"group_by": group_by, "department": department, "track_id": track_id, "subtrack_id": subtrack_id}
+
+    try:
+        return await run_in_threadpool(
+            report_cache.get_or_compute, "rollup", params, lambda: get_rollup(**params)
+        )
+    except Exception as e:
+        logger.error(f"Failed to get rollup report: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/reports/cache/stats")
+async def get_report_cache_stats(current_user: dict = Depends(get_current_admin_user)):
+    """Report cache hit/miss counters per report type"""
+    try:
+        return report_cache.stats()
+    except Exception as e:
+        logger.error(f"Failed to get report cache stats: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/reports/exports", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_report_export(
+    export: ExportCreate,
+    current_user: dict = Depends(get_current_admin_user)
+):
+    """
+    Queue an export of every progress record and quiz attempt (poll GET /jobs/{job_id},
+    then download from GET /reports/exports/{job_id}/download)
+    """
+    if export.format == "parquet" and not parquet_available():
+        raise HTTPException(status_code=400, detail="Parquet export requires pyarrow")
+
+    try:
+        return enqueue_job("report_export", export.model_dump(), created_by=current_user["id"])
+    except Exception as e:
+        logger.error(f"Failed to queue report export: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/reports/exports/{job_id}/download")
+async def download_report_export(
+    job_id: int,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    current_user: dict = Depends(get_current_admin_user)
+):
+    """Download a finished export; supports `Range: bytes=...` for resumable downloads"""
+    try:
+        job = get_job(job_id)
+    except Exception as e:
+        logger.error(f"Failed to get export job: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if not job or job["job_type"] != "report_export":
+        raise HTTPException(status_code=404, detail="Export not found")
+    if job["status"] != "succeeded":
+        raise HTTPException(status_code=409, detail=f"Export is {job['status']}")
+
+    # Export files live in the JOB_STORAGE_DIR of the host whose worker wrote them
+    host = (job["result"] or {}).get("host")
+    if host and host != socket.gethostname():
+        raise HTTPException(status_code=409, detail=f"Export is stored on host {host}")
+
+    export_format = job["params"]["format"]
+    path = export_path(job_id, export_format)
+    try:
+        return range_file_response(path, range_header, MEDIA_TYPES[export_format], path.name)
+    except FileNotFoundError:
+        raise HTTPException(status_code=410, detail="Export file has expired")
+
+
+# ============================================================================
+# ANALYTICS
+# ============================================================================
+
+ProgressDimension = Literal["department", "course", "track", "subtrack", "status"]
+ScoreDimension = Literal["department", "course", "track", "subtrack"]
+
+
+@router.get("/analytics/progress", response_model=ProgressBreakdown)
+async def get_progress_analytics(
+    rows: ProgressDimension = "department",
+    columns: Optional[ProgressDimension] = None,
+    department: Optional[str] = None,
+    track_id: Optional[str] = None,
+    current_user: dict = Depends(get_current_admin_user)
+):
+    """Assignment and completion counts cross-tabulated by two dimensions (e.g. department x course)"""
+    try:
+        return await run_in_threadpool(analytics_engine.progress_breakdown, rows, columns, department, track_id)
+    except Exception as e:
+        logger.error(f"Failed to get progress analytics: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/analytics/scores/histogram", response_model=ScoreHistogram)
+async def get_score_histogram(
+    group_by: Optional[ScoreDimension] = None,
+    bins: int = Query(10, ge=1, le=100),
+    best_only: bool = True,
+    department: Optional[str] = None,
+    track_id: Optional[str] = None,
+    current_user: dict = Depends(get_current_admin_user)
+):
+    """Quiz score distribution per group (best attempt per employee and course by default)"""
+    try:
+        return await run_in_threadpool(
+            analytics_engine.score_histogram, group_by, bins, best_only, department, track_id
+        )
+    except Exception as e:
+        logger.error(f"Failed to get score histogram: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/analytics/scores/percentiles", response_model=ScorePercentiles)
+async def get_score_percentiles(
+    group_by: Optional[ScoreDimension] = None,
+    p: List[float] = Query([25, 50, 75, 90]),
+    best_only: bool = True,
+    department: Optional[str] = None,
+    track_id: Optional[str] = None,
+    current_user: dict = Depends(get_current_admin_user)
+):
+    """Quiz score percentiles and mean per group"""
+    if any(value < 0 or value > 100 for value in p):
+        raise HTTPException(status_code=400, detail="Percentiles must be between 0 and 100")
+
+    try:
+        return await run_in_threadpool(
+            analytics_engine.score_percentiles, group_by, p, best_only, department, track_id
+        )
+    except Exception as e:
+        logger.error(f"Failed to get score percentiles: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -2,24 +2,49 @@
 Authentication Router
 Login, logout, and user info endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from datetime import timedelta
 
-from backend.models.schemas import Token, LoginRequest, EmployeeResponse
-from backend.utils.auth import authenticate_user, create_access_token, get_current_user
+from backend.models.schemas import Token, LoginRequest, RefreshRequest, EmployeeResponse
+from backend.utils.auth import (
+    authenticate_user,
+    create_access_token,
+    create_refresh_token,
+    rotate_refresh_token,
+    revoke_refresh_tokens,
+    get_current_user
+)
+from backend.utils.rate_limit import login_throttle, resolve_client_ip, RateLimitExceeded
 from backend.config import settings
 
 router = APIRouter()
 
 
 @router.post("/login", response_model=Token)
-async def login(form_data: OAuth2PasswordRequestForm = Depends()):
+async def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends()):
     """
     User login endpoint
-    Returns JWT access token
+    Returns JWT access token and a refresh token
+    Attempts are throttled per email and client IP before any bcrypt work is done
     """
-    user = authenticate_user(form_data.username, form_data.password)
+    client_ip = resolve_client_ip(
+        request.client.host if request.client else None,
+        request.headers.get("x-forwarded-for"),
+        request.headers.get("x-real-ip")
+    )
+
+    try:
+        login_throttle.check(form_data.username, client_ip)
+        with login_throttle.admission.slot():
+            user = await run_in_threadpool(authenticate_user, form_data.username, form_data.password)
+    except RateLimitExceeded as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, please try again later",
+            headers={"Retry-After": str(e.retry_after)},
+        )
 
     if not user:
         raise HTTPException(
@@ -34,16 +59,46 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
         data={"sub": user["employee_id"], "role": user["role"]},
         expires_delta=access_token_expires
     )
+    refresh_token = create_refresh_token(user["employee_id"])
+
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh(request: RefreshRequest):
+    """
+    Exchange a refresh token for a new access token
+    The refresh token is rotated: the presented token is consumed and a new one returned
+    """
+    rotated = rotate_refresh_token(request.refresh_token)
+
+    if not rotated:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        data={"sub": rotated["employee_id"], "role": rotated["role"]},
+        expires_delta=access_token_expires
+    )
 
-    return {"access_token": access_token, "token_type": "bearer"}
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "refresh_token": rotated["refresh_token"]
+    }
 
 
 @router.post("/logout")
 async def logout(current_user: dict = Depends(get_current_user)):
     """
     User logout endpoint
-    (Token invalidation handled on client side)
+    Revokes the user's refresh tokens; access tokens expire on their own
     """
+    revoke_refresh_tokens(current_user["id"])
     return {"message": "Successfully logged out"}
 
 
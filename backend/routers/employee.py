@@ -2,8 +2,8 @@
 Employee Router
 Endpoints for viewing courses, taking quizzes, and managing profile
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List, Optional
 from datetime import datetime
 import logging
 
@@ -13,11 +13,20 @@ from backend.models.schemas import (
     QuestionResponse,
     QuizSubmission,
     QuizResult,
+    QuizAttemptPage,
+    QuizAttemptDetail,
     EmployeeProgressReport,
-    NotificationResponse
+    NotificationPage,
+    UnreadCount,
+    NotificationReadRequest,
+    NotificationReadResponse,
+    DeviceTokenCreate
 )
 from backend.utils.auth import get_current_user
+from backend.utils.pagination import encode_cursor, decode_timestamp_cursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from backend.database import get_postgres_db, get_falkor_db
+from backend.services.quiz_history import list_attempts, get_attempt_detail
+from backend.services.quiz_sampling import open_quiz_session, get_quiz_session
 from backend.config import settings
 
 logger = logging.getLogger(__name__)
@@ -35,13 +44,15 @@ async def get_my_courses(current_user: dict = Depends(get_current_user)):
 
     try:
         query = """
-        SELECT progress_id, course_id, assignment_type, assignment_id,
-               status, started_at, completed_at, time_taken_minutes
-        FROM employee_course_progress
-        WHERE employee_id = %s
-        ORDER BY created_at DESC
+        SELECT p.progress_id, p.course_id, p.assignment_type, p.assignment_id,
+               p.status, p.started_at, p.completed_at, p.time_taken_minutes,
+               COALESCE(s.attempt_count, 0) AS attempt_count, s.best_score, s.last_score, s.first_passed_at
+        FROM employee_course_progress p
+        LEFT JOIN quiz_attempt_summary s ON s.employee_id = p.employee_id AND s.course_id = p.course_id
+        WHERE p.employee_id = %s
+        ORDER BY p.created_at DESC
         """
-        result = postgres_db.execute_query(query, (current_user["employee_id"],), fetch=True)
+        result = postgres_db.execute_query(query, (current_user["id"],), fetch=True)
 
         courses = []
         for row in result:
@@ -71,7 +82,7 @@ async def get_course_detail(
     SELECT 1 FROM employee_course_progress
     WHERE employee_id = %s AND course_id = %s
     """
-    result = postgres_db.execute_query(query, (current_user["employee_id"], course_id), fetch=True)
+    result = postgres_db.execute_query(query, (current_user["id"], course_id), fetch=True)
 
     if not result:
         raise HTTPException(status_code=403, detail="Access denied to this course")
@@ -109,7 +120,7 @@ async def start_course(
         WHERE employee_id = %s AND course_id = %s
         RETURNING progress_id
         """
-        result = postgres_db.execute_query(query, (current_user["employee_id"], course_id), fetch=True)
+        result = postgres_db.execute_query(query, (current_user["id"], course_id), fetch=True)
 
         if not result:
             raise HTTPException(status_code=404, detail="Course assignment not found")
@@ -131,7 +142,11 @@ async def get_quiz_questions(
     course_id: str,
     current_user: dict = Depends(get_current_user)
 ):
-    """Get quiz questions for a course (without correct answers)"""
+    """
+    Get this attempt's quiz questions (without correct answers), in serving order
+    The course's quiz_size questions are sampled from its bank once per attempt;
+    reloading returns the same questions until the quiz is submitted.
+    """
     postgres_db = get_postgres_db()
 
     # Verify access
@@ -139,26 +154,25 @@ async def get_quiz_questions(
     SELECT 1 FROM employee_course_progress
     WHERE employee_id = %s AND course_id = %s
     """
-    result = postgres_db.execute_query(query, (current_user["employee_id"], course_id), fetch=True)
+    result = postgres_db.execute_query(query, (current_user["id"], course_id), fetch=True)
 
     if not result:
         raise HTTPException(status_code=403, detail="Access denied to this course")
 
     try:
-        # Get question IDs from FalkorDB
-        question_ids = _get_course_questions(course_id)
+        session = open_quiz_session(current_user["id"], course_id)
 
-        if not question_ids:
+        if not session:
             raise HTTPException(status_code=404, detail="No questions found for this course")
 
         # Get question details from PostgreSQL (without correct answers)
-        placeholders = ",".join(["%s"] * len(question_ids))
-        query = f"""
-        SELECT question_id, question_text, option_a, option_b, option_c, option_d
-        FROM question_master
-        WHERE question_id IN ({placeholders})
+        query = """
+        SELECT q.question_id, q.question_text, q.option_a, q.option_b, q.option_c, q.option_d
+        FROM unnest(%s::int[]) WITH ORDINALITY AS s(question_no, position)
+        JOIN question_master q ON q.question_no = s.question_no
+        ORDER BY s.position
         """
-        result = postgres_db.execute_query(query, tuple(question_ids), fetch=True)
+        result = postgres_db.execute_query(query, (session["question_nos"],), fetch=True)
 
         return [dict(row) for row in result]
     except HTTPException:
@@ -172,9 +186,14 @@ async def get_quiz_questions(
 async def submit_quiz(
     course_id: str,
     submission: QuizSubmission,
+    slim: bool = False,
     current_user: dict = Depends(get_current_user)
 ):
-    """Submit quiz answers and get results"""
+    """
+    Submit quiz answers and get results
+    With `slim=true` only the ids of wrongly answered questions are returned; fetch
+    their text and options later from GET /quiz-attempts/{attempt_id}.
+    """
     postgres_db = get_postgres_db()
 
     # Verify access
@@ -182,97 +201,153 @@ async def submit_quiz(
     SELECT 1 FROM employee_course_progress
     WHERE employee_id = %s AND course_id = %s
     """
-    result = postgres_db.execute_query(query, (current_user["employee_id"], course_id), fetch=True)
+    result = postgres_db.execute_query(query, (current_user["id"], course_id), fetch=True)
 
     if not result:
         raise HTTPException(status_code=403, detail="Access denied to this course")
 
+    # The served questions are redrawn from the session's seed
+    session = get_quiz_session(current_user["id"], course_id)
+    if not session:
+        raise HTTPException(status_code=409, detail="No quiz in progress; load the quiz questions first")
+
     try:
-        # Get correct answers from PostgreSQL
-        question_ids = [answer.question_id for answer in submission.answers]
-        placeholders = ",".join(["%s"] * len(question_ids))
+        # Get correct answers for the served questions from PostgreSQL
+        columns = "question_id, correct_answer"
+        if not slim:
+            columns += ", question_text, option_a, option_b, option_c, option_d"
         query = f"""
-        SELECT question_id, correct_answer, question_text, option_a, option_b, option_c, option_d
-        FROM question_master
-        WHERE question_id IN ({placeholders})
+        SELECT {columns}
+        FROM unnest(%s::int[]) WITH ORDINALITY AS s(question_no, position)
+        JOIN question_master q ON q.question_no = s.question_no
+        ORDER BY s.position
         """
-        correct_answers_result = postgres_db.execute_query(query, tuple(question_ids), fetch=True)
+        correct_answers_result = postgres_db.execute_query(query, (session["question_nos"],), fetch=True)
         correct_answers_map = {row["question_id"]: dict(row) for row in correct_answers_result}
 
-        # Calculate score
-        total_questions = len(submission.answers)
+        # Only served questions can be answered, each once
+        question_ids = [answer.question_id for answer in submission.answers]
+        unknown = [question_id for question_id in question_ids if question_id not in correct_answers_map]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Questions not in this quiz: {', '.join(unknown)}")
+        if len(set(question_ids)) != len(question_ids):
+            raise HTTPException(status_code=400, detail="Each question can be answered only once")
+
+        # Calculate score; unanswered questions count as incorrect
+        selected = {answer.question_id: answer.selected_answer for answer in submission.answers}
+        total_questions = len(correct_answers_map)
         correct_count = 0
         incorrect_questions = []
+        incorrect_question_ids = []
 
-        for answer in submission.answers:
-            is_correct = (
-                answer.selected_answer == correct_answers_map[answer.question_id]["correct_answer"]
-            )
+        for question_id, question in correct_answers_map.items():
+            is_correct = selected.get(question_id) == question["correct_answer"]
             if is_correct:
                 correct_count += 1
+            elif slim:
+                incorrect_question_ids.append(question_id)
             else:
                 incorrect_questions.append({
-                    "question_id": answer.question_id,
-                    "question_text": correct_answers_map[answer.question_id]["question_text"],
-                    "selected_answer": answer.selected_answer,
-                    "correct_answer": correct_answers_map[answer.question_id]["correct_answer"],
+                    "question_id": question_id,
+                    "question_text": question["question_text"],
+                    "selected_answer": selected.get(question_id),
+                    "correct_answer": question["correct_answer"],
                     "options": {
-                        "A": correct_answers_map[answer.question_id]["option_a"],
-                        "B": correct_answers_map[answer.question_id]["option_b"],
-                        "C": correct_answers_map[answer.question_id]["option_c"],
-                        "D": correct_answers_map[answer.question_id]["option_d"]
+                        "A": question["option_a"],
+                        "B": question["option_b"],
+                        "C": question["option_c"],
+                        "D": question["option_d"]
                     }
                 })
 
         score = (correct_count / total_questions) * 100
         passed = score >= settings.QUIZ_PASSING_SCORE
 
-        # Get attempt number
-        query = """
-        SELECT COALESCE(MAX(attempt_number), 0) + 1 AS next_attempt
-        FROM quiz_attempts
-        WHERE employee_id = %s AND course_id = %s
-        """
-        result = postgres_db.execute_query(query, (current_user["employee_id"], course_id), fetch=True)
-        attempt_number = result[0]["next_attempt"]
-
-        # Insert quiz attempt
-        query = """
-        INSERT INTO quiz_attempts
-        (employee_id, course_id, attempt_number, score, total_questions, correct_answers, passed, passing_score)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        RETURNING attempt_id, attempted_at
-        """
-        result = postgres_db.execute_query(query, (
-            current_user["employee_id"],
-            course_id,
-            attempt_number,
-            score,
-            total_questions,
-            correct_count,
-            passed,
-            settings.QUIZ_PASSING_SCORE
-        ), fetch=True)
-
-        attempt_id = result[0]["attempt_id"]
-        attempted_at = result[0]["attempted_at"]
-
-        # Insert quiz responses
-        for answer in submission.answers:
-            is_correct = (
-                answer.selected_answer == correct_answers_map[answer.question_id]["correct_answer"]
-            )
-            query = """
-            INSERT INTO quiz_responses
-            (attempt_id, question_id, selected_answer, is_correct)
-            VALUES (%s, %s, %s, %s)
-            """
-            postgres_db.execute_query(query, (
-                attempt_id,
-                answer.question_id,
-                answer.selected_answer,
-                is_correct
+        with postgres_db.get_cursor() as cursor:
+            # Close the session first, so a quiz is scored at most once
+            cursor.execute("""
+                DELETE FROM quiz_sessions
+                WHERE employee_id = %s AND course_id = %s AND seed = %s
+            """, (current_user["id"], course_id, session["seed"]))
+            if not cursor.rowcount:
+                raise HTTPException(status_code=409, detail="This quiz has already been submitted")
+
+            # The summary row lock serializes concurrent submissions for this employee and
+            # course (quiz_attempts is partitioned, so attempt_number cannot be UNIQUE), and
+            # the updated count is the new attempt's number - no scan of past attempts
+            cursor.execute("""
+                INSERT INTO quiz_attempt_summary AS s
+                    (employee_id, course_id, attempt_count, best_score, last_score, last_attempted_at,
+                     first_passed_at, passed_attempts, passed_score_sum)
+                VALUES (%(employee_id)s, %(course_id)s, 1, %(score)s, %(score)s, CURRENT_TIMESTAMP,
+                        CASE WHEN %(passed)s THEN CURRENT_TIMESTAMP END,
+                        CASE WHEN %(passed)s THEN 1 ELSE 0 END,
+                        CASE WHEN %(passed)s THEN %(score)s ELSE 0 END)
+                ON CONFLICT (employee_id, course_id) DO UPDATE
+                SET attempt_count = s.attempt_count + 1,
+                    best_score = GREATEST(s.best_score, EXCLUDED.best_score),
+                    last_score = EXCLUDED.last_score,
+                    last_attempted_at = EXCLUDED.last_attempted_at,
+                    first_passed_at = COALESCE(s.first_passed_at, EXCLUDED.first_passed_at),
+                    passed_attempts = s.passed_attempts + EXCLUDED.passed_attempts,
+                    passed_score_sum = s.passed_score_sum + EXCLUDED.passed_score_sum
+                RETURNING attempt_count
+            """, {
+                "employee_id": current_user["id"],
+                "course_id": course_id,
+                "score": round(score, 2),
+                "passed": passed,
+            })
+            attempt_number = cursor.fetchone()["attempt_count"]
+
+            cursor.execute("""
+                INSERT INTO quiz_attempts
+                (employee_id, course_id, attempt_number, score, total_questions, correct_answers, passed,
+                 passing_score, question_seed)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                RETURNING attempt_id, attempted_at
+            """, (
+                current_user["id"],
+                course_id,
+                attempt_number,
+                score,
+                total_questions,
+                correct_count,
+                passed,
+                settings.QUIZ_PASSING_SCORE,
+                session["seed"]
             ))
+            row = cursor.fetchone()
+            attempt_id = row["attempt_id"]
+            attempted_at = row["attempted_at"]
+
+            # All responses in one statement, into the attempt's partition
+            selected_answers = [answer.selected_answer for answer in submission.answers]
+            if settings.QUIZ_RESPONSE_FORMAT == "packed":
+                cursor.execute("""
+                    INSERT INTO quiz_attempt_answers (attempt_id, attempted_at, question_nos, answers)
+                    SELECT %s, %s,
+                           array_agg(q.question_no ORDER BY a.position),
+                           pack_answers(array_agg(a.selected_answer ORDER BY a.position))
+                    FROM unnest(%s::varchar[], %s::char(1)[]) WITH ORDINALITY AS a(question_id, selected_answer, position)
+                    JOIN question_master q ON q.question_id = a.question_id
+                """, (attempt_id, attempted_at, question_ids, selected_answers))
+            else:
+                cursor.execute("""
+                    INSERT INTO quiz_responses
+                    (attempt_id, question_id, selected_answer, is_correct, answered_at)
+                    SELECT %s, r.question_id, r.selected_answer, r.is_correct, %s
+                    FROM unnest(%s::varchar[], %s::char(1)[], %s::boolean[]) AS r(question_id, selected_answer, is_correct)
+                """, (
+                    attempt_id,
+                    attempted_at,
+                    question_ids,
+                    selected_answers,
+                    [
+                        answer.selected_answer == correct_answers_map[answer.question_id]["correct_answer"]
+                        for answer in submission.answers
+                    ]
+                ))
 
         # Update course progress
         if passed:
@@ -289,7 +364,7 @@ async def submit_quiz(
             SET status = 'failed'
             WHERE employee_id = %s AND course_id = %s
             """
-        postgres_db.execute_query(query, (current_user["employee_id"], course_id))
+        postgres_db.execute_query(query, (current_user["id"], course_id))
 
         return QuizResult(
             attempt_id=attempt_id,
@@ -301,7 +376,8 @@ async def submit_quiz(
             passed=passed,
             passing_score=settings.QUIZ_PASSING_SCORE,
             attempted_at=attempted_at,
-            incorrect_questions=incorrect_questions
+            incorrect_questions=incorrect_questions,
+            incorrect_question_ids=incorrect_question_ids
         )
     except HTTPException:
         raise
@@ -310,6 +386,49 @@ async def submit_quiz(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/quiz-attempts", response_model=QuizAttemptPage)
+async def get_my_quiz_attempts(
+    course_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Get the current employee's quiz attempts, newest first, one keyset page at a time
+    Pass the returned `next_cursor` back as `cursor` to fetch the following page.
+    """
+    try:
+        return list_attempts(current_user["id"], course_id=course_id, cursor=cursor, limit=limit)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to get quiz attempts: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/quiz-attempts/{attempt_id}", response_model=QuizAttemptDetail)
+async def get_my_quiz_attempt(
+    attempt_id: int,
+    attempted_at: Optional[datetime] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Get one of the current employee's attempts with every answer and its question
+    Passing the attempt's `attempted_at` limits the lookup to its month partition.
+    """
+    try:
+        attempt = get_attempt_detail(
+            attempt_id, employee_id=current_user["id"], attempted_at=attempted_at
+        )
+    except Exception as e:
+        logger.error(f"Failed to get quiz attempt: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if not attempt:
+        raise HTTPException(status_code=404, detail="Quiz attempt not found")
+    return attempt
+
+
 # ============================================================================
 # PROFILE
 # ============================================================================
@@ -321,13 +440,13 @@ async def get_my_profile(current_user: dict = Depends(get_current_user)):
 
     try:
         query = "SELECT * FROM v_employee_progress_summary WHERE employee_id = %s"
-        result = postgres_db.execute_query(query, (current_user["employee_id"],), fetch=True)
+        result = postgres_db.execute_query(query, (current_user["id"],), fetch=True)
 
         if not result:
             # Return empty profile if no data
             return EmployeeProgressReport(
-                employee_id=current_user["employee_id"],
-                employee_name=current_user["employee_name"],
+                employee_id=current_user["id"],
+                employee_name=current_user["full_name"],
                 email=current_user["email"],
                 department=current_user.get("department"),
                 total_courses_assigned=0,
@@ -348,27 +467,111 @@ async def get_my_profile(current_user: dict = Depends(get_current_user)):
 # NOTIFICATIONS
 # ============================================================================
 
-@router.get("/notifications", response_model=List[NotificationResponse])
-async def get_my_notifications(current_user: dict = Depends(get_current_user)):
-    """Get all notifications for the current employee"""
+@router.get("/notifications", response_model=NotificationPage)
+async def get_my_notifications(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    unread_only: bool = False,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Get notifications for the current employee, newest first, one keyset page at a time
+    Pass the returned `next_cursor` back as `cursor` to fetch the following page.
+    """
     postgres_db = get_postgres_db()
 
+    conditions = ["employee_id = %s"]
+    params: list = [current_user["id"]]
+
+    if unread_only:
+        conditions.append("NOT is_read")
+    if cursor:
+        last_created_at, last_notification_id = decode_timestamp_cursor(cursor)
+        conditions.append("(created_at, notification_id) < (%s::timestamp, %s)")
+        params.extend([last_created_at, last_notification_id])
+
     try:
-        query = """
+        # Fetch one extra row to detect a next page
+        query = f"""
         SELECT notification_id, notification_type, title, message, course_id, is_read, created_at
         FROM notifications
-        WHERE employee_id = %s
-        ORDER BY created_at DESC
-        LIMIT 50
+        WHERE {' AND '.join(conditions)}
+        ORDER BY created_at DESC, notification_id DESC
+        LIMIT %s
         """
-        result = postgres_db.execute_query(query, (current_user["employee_id"],), fetch=True)
+        params.append(limit + 1)
+        result = postgres_db.execute_query(query, tuple(params), fetch=True)
 
-        return [dict(row) for row in result]
+        rows = result[:limit]
+        next_cursor = None
+        if len(result) > limit:
+            last = rows[-1]
+            next_cursor = encode_cursor(last["created_at"].isoformat(), last["notification_id"])
+
+        return {"items": [dict(row) for row in rows], "next_cursor": next_cursor}
     except Exception as e:
         logger.error(f"Failed to get notifications: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/notifications/unread-count", response_model=UnreadCount)
+async def get_unread_notification_count(current_user: dict = Depends(get_current_user)):
+    """Get the number of unread notifications (a single counter row lookup)"""
+    postgres_db = get_postgres_db()
+
+    try:
+        query = "SELECT unread_count FROM notification_counters WHERE employee_id = %s"
+        result = postgres_db.execute_query(query, (current_user["id"],), fetch=True)
+
+        return {"unread_count": result[0]["unread_count"] if result else 0}
+    except Exception as e:
+        logger.error(f"Failed to get unread notification count: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/notifications/read", response_model=NotificationReadResponse)
+async def mark_notifications_read(
+    request: NotificationReadRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Mark notifications as read in one statement: the given ids, every notification
+    from the newest down to `up_to_cursor` (a `next_cursor` from GET /notifications), or all
+    """
+    postgres_db = get_postgres_db()
+
+    conditions = ["employee_id = %s", "NOT is_read"]
+    params: list = [current_user["id"]]
+
+    if request.notification_ids:
+        conditions.append("notification_id = ANY(%s)")
+        params.append(request.notification_ids)
+    elif request.up_to_cursor:
+        last_created_at, last_notification_id = decode_timestamp_cursor(request.up_to_cursor)
+        conditions.append("(created_at, notification_id) >= (%s::timestamp, %s)")
+        params.extend([last_created_at, last_notification_id])
+
+    try:
+        # The counter trigger runs within this transaction, so the count read back is consistent
+        with postgres_db.get_cursor() as cursor:
+            cursor.execute(f"""
+                UPDATE notifications
+                SET is_read = TRUE
+                WHERE {' AND '.join(conditions)}
+            """, tuple(params))
+            updated = cursor.rowcount
+            cursor.execute(
+                "SELECT unread_count FROM notification_counters WHERE employee_id = %s",
+                (current_user["id"],)
+            )
+            counter = cursor.fetchone()
+
+        return {"updated": updated, "unread_count": counter["unread_count"] if counter else 0}
+    except Exception as e:
+        logger.error(f"Failed to mark notifications as read: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.put("/notifications/{notification_id}/read")
 async def mark_notification_read(
     notification_id: int,
@@ -384,7 +587,7 @@ async def mark_notification_read(
         WHERE notification_id = %s AND employee_id = %s
         RETURNING notification_id
         """
-        result = postgres_db.execute_query(query, (notification_id, current_user["employee_id"]), fetch=True)
+        result = postgres_db.execute_query(query, (notification_id, current_user["id"]), fetch=True)
 
         if not result:
             raise HTTPException(status_code=404, detail="Notification not found")
@@ -397,6 +600,55 @@ async def mark_notification_read(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/devices", status_code=status.HTTP_201_CREATED)
+async def register_device(
+    device: DeviceTokenCreate,
+    current_user: dict = Depends(get_current_user)
+):
+    """Register (or refresh) a device push token for the current employee"""
+    postgres_db = get_postgres_db()
+
+    try:
+        # A token moves to whoever registered it last (shared or handed-over devices)
+        query = """
+        INSERT INTO device_tokens (token, employee_id, platform)
+        VALUES (%s, %s, %s)
+        ON CONFLICT (token) DO UPDATE
+        SET employee_id = EXCLUDED.employee_id,
+            platform = EXCLUDED.platform,
+            last_seen_at = CURRENT_TIMESTAMP
+        """
+        postgres_db.execute_query(query, (device.token, current_user["id"], device.platform))
+
+        return {"message": "Device registered"}
+    except Exception as e:
+        logger.error(f"Failed to register device: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete("/devices/{token}")
+async def unregister_device(
+    token: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """Stop push notifications to a device (e.g. on logout)"""
+    postgres_db = get_postgres_db()
+
+    try:
+        query = "DELETE FROM device_tokens WHERE token = %s AND employee_id = %s RETURNING token"
+        result = postgres_db.execute_query(query, (token, current_user["id"]), fetch=True)
+
+        if not result:
+            raise HTTPException(status_code=404, detail="Device not found")
+
+        return {"message": "Device unregistered"}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to unregister device: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -0,0 +1,640 @@
+"""
+Progress Analytics
+Columnar copy of progress and quiz attempt data for vectorized group-by queries,
+published as memory-mapped snapshots shared by all workers on a host
+"""
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import fcntl
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+import logging
+
+import numpy as np
+
+from backend.config import settings
+from backend.database import get_postgres_db
+
+logger = logging.getLogger(__name__)
+
+STATUSES = ("assigned", "in_progress", "completed", "failed")
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+PROGRESS_DIMENSIONS = ("department", "course", "track", "subtrack", "status")
+ATTEMPT_DIMENSIONS = ("department", "course", "track", "subtrack")
+
+FETCH_CHUNK_ROWS = 50000
+# Rows committed slightly before the previous watermark may become visible after it
+WATERMARK_OVERLAP = "5 minutes"
+# Attempts newer than this are left for the next refresh, so ids allocated by
+# still-open transactions are not skipped past
+ATTEMPT_SAFETY_LAG = "1 minute"
+
+PROGRESS_COLUMNS = ("progress_id", "employee", "course", "status", "time_taken")
+ATTEMPT_COLUMNS = ("attempt_id", "employee", "course", "score")
+
+
+class Encoder:
+    """Maps string ids to dense integer codes; codes are never reassigned"""
+
+    def __init__(self, values: Sequence[str] = ()):
+        self.values: List[str] = list(values)
+        self._index: Optional[Dict[str, int]] = None
+
+    @property
+    def index(self) -> Dict[str, int]:
+        # Built on first lookup so mapping a snapshot does not pay for large encoders
+        if self._index is None:
+            self._index = {value: code for code, value in enumerate(self.values)}
+        return self._index
+
+    def encode(self, value: str) -> int:
+        index = self.index
+        code = index.get(value)
+        if code is None:
+            code = len(self.values)
+            index[value] = code
+            self.values.append(value)
+        return code
+
+    def encode_many(self, values: Sequence[str]) -> np.ndarray:
+        return np.fromiter((self.encode(value) for value in values), dtype=np.int32, count=len(values))
+
+    def copy(self) -> "Encoder":
+        """Independent encoder with the same codes, for building the next snapshot"""
+        encoder = Encoder(self.values)
+        if self._index is not None:
+            encoder._index = dict(self._index)
+        return encoder
+
+
+class AnalyticsSnapshot:
+    """
+    Immutable set of arrays. Refreshes build a new snapshot and swap the reference,
+    so queries never see a half-applied refresh. Arrays of a published snapshot are
+    read-only memory maps.
+    """
+
+    def __init__(self, progress: Dict[str, np.ndarray], attempts: Dict[str, np.ndarray],
+                 employee_department: np.ndarray, course_track: np.ndarray, course_subtrack: np.ndarray,
+                 encoders: Dict[str, Encoder], watermarks: dict):
+        self.progress = progress
+        self.attempts = attempts
+        self.employee_department = employee_department
+        self.course_track = course_track
+        self.course_subtrack = course_subtrack
+        self.encoders = encoders
+        self.watermarks = watermarks
+
+    def dimension(self, dimension: Optional[str], table: Dict[str, np.ndarray]) -> Tuple[np.ndarray, List[str]]:
+        """Per-row group codes (-1 = unknown) and labels for a dimension"""
+        employees, courses = table["employee"], table["course"]
+        if dimension is None:
+            return np.zeros(len(employees), dtype=np.int32), ["all"]
+        if dimension == "department":
+            return self.employee_department[employees], self.encoders["departments"].values
+        if dimension == "course":
+            return courses, self.encoders["courses"].values
+        if dimension == "track":
+            return self.course_track[courses], self.encoders["tracks"].values
+        if dimension == "subtrack":
+            return self.course_subtrack[courses], self.encoders["subtracks"].values
+        if dimension == "status":
+            return table["status"].astype(np.int32), list(STATUSES)
+        raise ValueError(f"Unknown dimension: {dimension}")
+
+    def filter_mask(self, table: Dict[str, np.ndarray], department: Optional[str], track_id: Optional[str]) -> np.ndarray:
+        mask = np.ones(len(table["employee"]), dtype=bool)
+        if department is not None:
+            code = self.encoders["departments"].index.get(department, -1)
+            mask &= self.employee_department[table["employee"]] == code
+        if track_id:
+            code = self.encoders["tracks"].index.get(track_id, -1)
+            mask &= self.course_track[table["course"]] == code
+        return mask
+
+
+def _empty_progress() -> Dict[str, np.ndarray]:
+    return {
+        "progress_id": np.empty(0, dtype=np.int64),
+        "employee": np.empty(0, dtype=np.int32),
+        "course": np.empty(0, dtype=np.int32),
+        "status": np.empty(0, dtype=np.int8),
+        "time_taken": np.empty(0, dtype=np.float32),
+    }
+
+
+def _empty_attempts() -> Dict[str, np.ndarray]:
+    return {
+        "attempt_id": np.empty(0, dtype=np.int64),
+        "employee": np.empty(0, dtype=np.int32),
+        "course": np.empty(0, dtype=np.int32),
+        "score": np.empty(0, dtype=np.float32),
+    }
+
+
+def _fetch_chunks(query: str, params: tuple) -> Iterator[List[tuple]]:
+    """Stream rows from a server-side cursor"""
+    postgres_db = get_postgres_db()
+    with postgres_db.get_connection() as conn:
+        try:
+            with conn.cursor(name=f"analytics_{uuid.uuid4().hex}") as cursor:
+                cursor.itersize = FETCH_CHUNK_ROWS
+                cursor.execute(query, params)
+                while rows := cursor.fetchmany(FETCH_CHUNK_ROWS):
+                    yield rows
+        finally:
+            conn.rollback()
+
+
+def _concat(chunks: List[Dict[str, np.ndarray]], empty: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    if not chunks:
+        return empty
+    return {column: np.concatenate([chunk[column] for chunk in chunks]) for column in empty}
+
+
+def _merge_by_id(current: Dict[str, np.ndarray], changed: Dict[str, np.ndarray], id_column: str) -> Dict[str, np.ndarray]:
+    """Overwrite rows whose id is already present and append the rest, keeping ids sorted"""
+    if len(changed[id_column]) == 0:
+        return current
+
+    ids = current[id_column]
+    if len(ids):
+        positions = np.minimum(np.searchsorted(ids, changed[id_column]), len(ids) - 1)
+        existing = ids[positions] == changed[id_column]
+    else:
+        positions = np.zeros(len(changed[id_column]), dtype=np.int64)
+        existing = np.zeros(len(changed[id_column]), dtype=bool)
+
+    merged = {}
+    for column, values in current.items():
+        updated = values.copy()
+        updated[positions[existing]] = changed[column][existing]
+        merged[column] = np.concatenate([updated, changed[column][~existing]])
+
+    new_ids = changed[id_column][~existing]
+    if len(new_ids) and len(ids) and new_ids.min() < ids[-1]:
+        order = np.argsort(merged[id_column], kind="stable")
+        merged = {column: values[order] for column, values in merged.items()}
+    return merged
+
+
+class SnapshotStore:
+    """
+    Versioned snapshot directories on local disk. A CURRENT file names the published
+    version and is replaced atomically; every worker on the host maps the same files.
+    """
+
+    KEEP_VERSIONS = 3
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def current_version(self) -> Optional[str]:
+        try:
+            return (self.root / "CURRENT").read_text().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def load_current(self) -> Optional[Tuple[str, AnalyticsSnapshot]]:
+        """
+        The published version and its snapshot. A version read from CURRENT can be
+        pruned before it is opened once two newer ones were published; then CURRENT
+        has moved on, so it is read again.
+        """
+        for attempt in range(2):
+            version = self.current_version()
+            if version is None:
+                return None
+            try:
+                return version, self.load(version)
+            except FileNotFoundError:
+                if attempt:
+                    raise
+                logger.info(f"Analytics snapshot {version} was pruned while loading; rereading CURRENT")
+
+    def load(self, version: str) -> AnalyticsSnapshot:
+        path = self.root / version
+        meta = json.loads((path / "meta.json").read_text())
+
+        def array(name: str) -> np.ndarray:
+            return np.load(path / f"{name}.npy", mmap_mode="r")
+
+        return AnalyticsSnapshot(
+            {column: array(f"progress_{column}") for column in PROGRESS_COLUMNS},
+            {column: array(f"attempts_{column}") for column in ATTEMPT_COLUMNS},
+            array("employee_department"),
+            array("course_track"),
+            array("course_subtrack"),
+            {name: Encoder(values) for name, values in meta["encoders"].items()},
+            {
+                "updated_at": datetime.fromisoformat(meta["watermarks"]["updated_at"]),
+                "attempt_id": meta["watermarks"]["attempt_id"],
+                "refreshed_at": datetime.fromisoformat(meta["watermarks"]["refreshed_at"]),
+                "built_at": meta["watermarks"]["built_at"],
+                "reloaded_at": meta["watermarks"].get("reloaded_at", meta["watermarks"]["built_at"]),
+            }
+        )
+
+    def save(self, snapshot: AnalyticsSnapshot) -> str:
+        """Write a new version, then point CURRENT at it"""
+        version = f"v{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}"
+        staging = self.root / f".{version}.tmp"
+        staging.mkdir()
+
+        arrays = {
+            **{f"progress_{column}": snapshot.progress[column] for column in PROGRESS_COLUMNS},
+            **{f"attempts_{column}": snapshot.attempts[column] for column in ATTEMPT_COLUMNS},
+            "employee_department": snapshot.employee_department,
+            "course_track": snapshot.course_track,
+            "course_subtrack": snapshot.course_subtrack,
+        }
+        for name, values in arrays.items():
+            np.save(staging / f"{name}.npy", np.ascontiguousarray(values))
+
+        watermarks = snapshot.watermarks
+        (staging / "meta.json").write_text(json.dumps({
+            "encoders": {name: encoder.values for name, encoder in snapshot.encoders.items()},
+            "watermarks": {
+                "updated_at": watermarks["updated_at"].isoformat(),
+                "attempt_id": watermarks["attempt_id"],
+                "refreshed_at": watermarks["refreshed_at"].isoformat(),
+                "built_at": watermarks["built_at"],
+                "reloaded_at": watermarks["reloaded_at"],
+            },
+        }))
+
+        staging.rename(self.root / version)
+        pointer = self.root / ".CURRENT.tmp"
+        pointer.write_text(version)
+        os.replace(pointer, self.root / "CURRENT")
+        self._prune(version)
+        return version
+
+    def _prune(self, current: str):
+        """Remove old versions; workers still mapping them keep their open files"""
+        versions = sorted(path for path in self.root.glob("v*") if path.is_dir() and path.name != current)
+        for path in versions[:-(self.KEEP_VERSIONS - 1)] if self.KEEP_VERSIONS > 1 else versions:
+            shutil.rmtree(path, ignore_errors=True)
+
+    @contextmanager
+    def build_lock(self, blocking: bool):
+        """Host-wide lock so only one worker rebuilds at a time; yields whether it was acquired"""
+        with open(self.root / ".build.lock", "w") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class AnalyticsEngine:
+    """
+    Loads progress and attempts into columnar arrays with integer-encoded ids and
+    keeps them current from updated_at / attempt_id watermarks. Snapshots are
+    published to a SnapshotStore and memory-mapped, so a warm start only maps files.
+    """
+
+    def __init__(self):
+        self.store: Optional[SnapshotStore] = None
+        self._snapshot: Optional[AnalyticsSnapshot] = None
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def _get_store(self) -> SnapshotStore:
+        if self.store is None:
+            self.store = SnapshotStore(Path(settings.ANALYTICS_SNAPSHOT_DIR))
+        return self.store
+
+    def _is_stale(self, snapshot: AnalyticsSnapshot) -> bool:
+        return time.time() - snapshot.watermarks["built_at"] > settings.ANALYTICS_REFRESH_SECONDS
+
+    def _map_published(self) -> bool:
+        """Switch to the published version if another worker swapped it; returns True if mapped"""
+        store = self._get_store()
+        version = store.current_version()
+        if version is None or version == self._version:
+            return False
+        published = store.load_current()
+        if published is None or published[0] == self._version:
+            return False
+        self._version, self._snapshot = published
+        return True
+
+    def snapshot(self) -> AnalyticsSnapshot:
+        """
+        Current snapshot. Maps the published version when there is one; otherwise
+        the first call builds it. A stale snapshot is returned while one worker on
+        the host refreshes it in the background.
+        """
+        if self._get_store().current_version() != self._version or self._snapshot is None:
+            with self._lock:
+                self._map_published()
+                if self._snapshot is None:
+                    self._publish(blocking=True)
+
+        if self._is_stale(self._snapshot) and self._lock.acquire(blocking=False):
+            threading.Thread(target=self._refresh_and_release, name="analytics-refresh", daemon=True).start()
+        return self._snapshot
+
+    def refresh(self, full: bool = False) -> AnalyticsSnapshot:
+        """Apply changes since the last refresh (or reload everything) and publish the snapshot"""
+        with self._lock:
+            self._publish(blocking=True, full=full)
+        return self._snapshot
+
+    def _refresh_and_release(self):
+        try:
+            self._publish(blocking=False)
+        except Exception as e:
+            logger.error(f"Analytics refresh failed: {e}")
+        finally:
+            self._lock.release()
+
+    def _publish(self, blocking: bool, full: bool = False):
+        """Build from the latest published snapshot and publish it, holding the host lock"""
+        store = self._get_store()
+        with store.build_lock(blocking) as acquired:
+            if not acquired:
+                return
+            # Another worker may have published while we waited for the lock
+            self._map_published()
+            if not full and self._snapshot is not None and not self._is_stale(self._snapshot):
+                return
+
+            # Watermarks cannot see deletes (e.g. cascades from removed employees); reload periodically
+            if self._snapshot is not None and \
+                    time.time() - self._snapshot.watermarks["reloaded_at"] > settings.ANALYTICS_RELOAD_SECONDS:
+                full = True
+
+            built = self._build(None if full else self._snapshot)
+            self._version = store.save(built)
+            self._snapshot = store.load(self._version)
+
+    def _build(self, previous: Optional[AnalyticsSnapshot]) -> AnalyticsSnapshot:
+        started = time.monotonic()
+        postgres_db = get_postgres_db()
+        bounds = postgres_db.execute_query(f"""
+            SELECT CURRENT_TIMESTAMP AS now,
+                   (SELECT COALESCE(MAX(attempt_id), 0) FROM quiz_attempts
+                    WHERE attempted_at < CURRENT_TIMESTAMP - INTERVAL '{ATTEMPT_SAFETY_LAG}') AS attempt_upto
+        """, fetch=True)[0]
+        now = bounds["now"]
+
+        if previous is None:
+            encoders = {
+                "employees": Encoder(),
+                "departments": Encoder([""]),
+                "courses": Encoder(),
+                "tracks": Encoder(),
+                "subtracks": Encoder(),
+            }
+            since = datetime.min
+            max_attempt_id = 0
+            progress, attempts = _empty_progress(), _empty_attempts()
+            employee_department = np.zeros(0, dtype=np.int32)
+        else:
+            # The previous snapshot's encoders may be in use by queries; extend copies
+            encoders = {name: encoder.copy() for name, encoder in previous.encoders.items()}
+            since = previous.watermarks["updated_at"]
+            max_attempt_id = previous.watermarks["attempt_id"]
+            progress, attempts = previous.progress, previous.attempts
+            employee_department = previous.employee_department
+
+        employee_department = self._load_departments(encoders, employee_department, since, previous is None)
+        progress = _merge_by_id(progress, self._load_progress(encoders, since, previous is None), "progress_id")
+        upto = max(max_attempt_id, bounds["attempt_upto"])
+        attempts = _merge_by_id(attempts, self._load_attempts(encoders, max_attempt_id, upto), "attempt_id")
+
+        # Encoders may have grown while loading rows; pad lookup arrays to match
+        employee_department = np.pad(
+            employee_department, (0, len(encoders["employees"].values) - len(employee_department))
+        )
+        course_track, course_subtrack = self._load_course_hierarchy(encoders)
+
+        snapshot = AnalyticsSnapshot(
+            progress, attempts, employee_department, course_track, course_subtrack, encoders,
+            {
+                "updated_at": now,
+                "attempt_id": upto,
+                "refreshed_at": now,
+                "built_at": time.time(),
+                "reloaded_at": time.time() if previous is None else previous.watermarks["reloaded_at"],
+            }
+        )
+        logger.info(
+            f"Analytics {'reloaded' if previous is None else 'refreshed'}: "
+            f"{len(progress['progress_id'])} progress rows, {len(attempts['attempt_id'])} attempts "
+            f"in {time.monotonic() - started:.2f}s"
+        )
+        return snapshot
+
+    def _load_departments(self, encoders: Dict[str, Encoder], current: np.ndarray,
+                          since: datetime, full: bool) -> np.ndarray:
+        query = "SELECT employee_id, COALESCE(department, '') FROM employees"
+        params: tuple = ()
+        if not full:
+            query += f" WHERE updated_at > %s - INTERVAL '{WATERMARK_OVERLAP}'"
+            params = (since,)
+
+        departments = current.copy()
+        for rows in _fetch_chunks(query, params):
+            employees = encoders["employees"].encode_many([row[0] for row in rows])
+            codes = encoders["departments"].encode_many([row[1] for row in rows])
+            if len(departments) < len(encoders["employees"].values):
+                departments = np.pad(departments, (0, len(encoders["employees"].values) - len(departments)))
+            departments[employees] = codes
+        return departments
+
+    def _load_progress(self, encoders: Dict[str, Encoder], since: datetime, full: bool) -> Dict[str, np.ndarray]:
+        query = """
+        SELECT progress_id, employee_id, course_id, status, time_taken_minutes
+        FROM employee_course_progress
+        """
+        params: tuple = ()
+        if not full:
+            query += f" WHERE updated_at > %s - INTERVAL '{WATERMARK_OVERLAP}'"
+            params = (since,)
+        query += " ORDER BY progress_id"
+
+        chunks = []
+        for rows in _fetch_chunks(query, params):
+            chunks.append({
+                "progress_id": np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows)),
+                "employee": encoders["employees"].encode_many([row[1] for row in rows]),
+                "course": encoders["courses"].encode_many([row[2] for row in rows]),
+                "status": np.fromiter((STATUS_CODES[row[3]] for row in rows), dtype=np.int8, count=len(rows)),
+                "time_taken": np.array(
+                    [np.nan if row[4] is None else row[4] for row in rows], dtype=np.float32
+                ),
+            })
+        return _concat(chunks, _empty_progress())
+
+    def _load_attempts(self, encoders: Dict[str, Encoder], after_attempt_id: int,
+                       upto_attempt_id: int) -> Dict[str, np.ndarray]:
+        """Attempts are append-only, so the highest attempt_id past the safety lag is the watermark"""
+        query = """
+        SELECT attempt_id, employee_id, course_id, score
+        FROM quiz_attempts
+        WHERE attempt_id > %s AND attempt_id <= %s
+        ORDER BY attempt_id
+        """
+        chunks = []
+        for rows in _fetch_chunks(query, (after_attempt_id, upto_attempt_id)):
+            chunks.append({
+                "attempt_id": np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows)),
+                "employee": encoders["employees"].encode_many([row[1] for row in rows]),
+                "course": encoders["courses"].encode_many([row[2] for row in rows]),
+                "score": np.fromiter((float(row[3]) for row in rows), dtype=np.float32, count=len(rows)),
+            })
+        return _concat(chunks, _empty_attempts())
+
+    def _load_course_hierarchy(self, encoders: Dict[str, Encoder]) -> Tuple[np.ndarray, np.ndarray]:
+        """Track and subtrack code per course code (-1 when unknown); the catalog is small"""
+        rows = get_postgres_db().execute_query(
+            "SELECT course_id, track_id, subtrack_id FROM course_catalog", fetch=True
+        )
+        course_track = np.full(len(encoders["courses"].values), -1, dtype=np.int32)
+        course_subtrack = np.full(len(encoders["courses"].values), -1, dtype=np.int32)
+        for row in rows:
+            code = encoders["courses"].index.get(row["course_id"])
+            if code is None:
+                continue
+            if row["track_id"]:
+                course_track[code] = encoders["tracks"].encode(row["track_id"])
+            if row["subtrack_id"]:
+                course_subtrack[code] = encoders["subtracks"].encode(row["subtrack_id"])
+        return course_track, course_subtrack
+
+    # ------------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------------
+
+    def progress_breakdown(self, rows: str, columns: Optional[str] = None,
+                           department: Optional[str] = None, track_id: Optional[str] = None) -> dict:
+        """Assignment and completion counts for every (rows, columns) combination present"""
+        snapshot = self.snapshot()
+        progress = snapshot.progress
+
+        row_codes, row_labels = snapshot.dimension(rows, progress)
+        column_codes, column_labels = snapshot.dimension(columns, progress)
+        valid = snapshot.filter_mask(progress, department, track_id) & (row_codes >= 0) & (column_codes >= 0)
+
+        width = len(column_labels)
+        size = len(row_labels) * width
+        keys = (row_codes[valid].astype(np.int64) * width + column_codes[valid])
+        status = progress["status"][valid]
+        time_taken = progress["time_taken"][valid]
+
+        assigned = np.bincount(keys, minlength=size)
+        by_status = {name: np.bincount(keys[status == code], minlength=size) for name, code in STATUS_CODES.items()}
+        timed = ~np.isnan(time_taken)
+        time_sum = np.bincount(keys[timed], weights=time_taken[timed], minlength=size)
+        time_count = np.bincount(keys[timed], minlength=size)
+
+        cells = []
+        for key in np.flatnonzero(assigned):
+            cells.append({
+                "row": row_labels[key // width],
+                "column": column_labels[key % width] if columns else None,
+                "assigned": int(assigned[key]),
+                "completed": int(by_status["completed"][key]),
+                "in_progress": int(by_status["in_progress"][key]),
+                "failed": int(by_status["failed"][key]),
+                "completion_rate": round(float(100.0 * by_status["completed"][key] / assigned[key]), 2),
+                "avg_time_minutes": round(float(time_sum[key] / time_count[key]), 2) if time_count[key] else None,
+            })
+        return {
+            "rows": rows,
+            "columns": columns,
+            "refreshed_at": snapshot.watermarks["refreshed_at"],
+            "cells": cells,
+        }
+
+    def _scores(self, snapshot: AnalyticsSnapshot, group_by: Optional[str], best_only: bool,
+                department: Optional[str], track_id: Optional[str]) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """Scores with their group codes, optionally reduced to each employee's best per course"""
+        attempts = snapshot.attempts
+        mask = snapshot.filter_mask(attempts, department, track_id)
+        groups, labels = snapshot.dimension(group_by, attempts)
+        mask &= groups >= 0
+
+        scores, groups = attempts["score"][mask], groups[mask]
+        if best_only and len(scores):
+            pairs = attempts["employee"][mask].astype(np.int64) * len(snapshot.encoders["courses"].values) \
+                + attempts["course"][mask]
+            order = np.lexsort((scores, pairs))
+            pairs = pairs[order]
+            last = np.append(pairs[1:] != pairs[:-1], True)
+            scores, groups = scores[order][last], groups[order][last]
+        return scores, groups, labels
+
+    def score_histogram(self, group_by: Optional[str] = None, bins: int = 10, best_only: bool = True,
+                        department: Optional[str] = None, track_id: Optional[str] = None) -> dict:
+        """Score counts in equal-width bins over 0-100, per group"""
+        snapshot = self.snapshot()
+        scores, groups, labels = self._scores(snapshot, group_by, best_only, department, track_id)
+
+        bin_index = np.minimum((scores * bins / 100.0).astype(np.int64), bins - 1)
+        counts = np.bincount(
+            groups.astype(np.int64) * bins + bin_index, minlength=len(labels) * bins
+        ).reshape(len(labels), bins)
+        totals = counts.sum(axis=1)
+
+        return {
+            "group_by": group_by,
+            "bin_edges": np.linspace(0, 100, bins + 1).round(2).tolist(),
+            "refreshed_at": snapshot.watermarks["refreshed_at"],
+            "groups": [
+                {"group": labels[code], "total": int(totals[code]), "counts": counts[code].tolist()}
+                for code in np.flatnonzero(totals)
+            ],
+        }
+
+    def score_percentiles(self, group_by: Optional[str] = None, percentiles: Sequence[float] = (25, 50, 75, 90),
+                          best_only: bool = True, department: Optional[str] = None,
+                          track_id: Optional[str] = None) -> dict:
+        """Linear-interpolated score percentiles and mean per group"""
+        snapshot = self.snapshot()
+        scores, groups, labels = self._scores(snapshot, group_by, best_only, department, track_id)
+
+        # Sort by group then score; each group is then a contiguous sorted run
+        order = np.lexsort((scores, groups))
+        scores, groups = scores[order].astype(np.float64), groups[order]
+        present, starts, counts = np.unique(groups, return_index=True, return_counts=True)
+        means = np.add.reduceat(scores, starts) / counts if len(scores) else np.empty(0)
+
+        values = {}
+        for p in percentiles:
+            position = starts + (p / 100.0) * (counts - 1)
+            low = np.floor(position).astype(np.int64)
+            high = np.ceil(position).astype(np.int64)
+            values[p] = scores[low] + (scores[high] - scores[low]) * (position - low)
+
+        return {
+            "group_by": group_by,
+            "refreshed_at": snapshot.watermarks["refreshed_at"],
+            "groups": [
+                {
+                    "group": labels[code],
+                    "count": int(counts[i]),
+                    "mean": round(float(means[i]), 2),
+                    "percentiles": {f"p{p:g}": round(float(values[p][i]), 2) for p in percentiles},
+                }
+                for i, code in enumerate(present)
+            ],
+        }
+
+
+# Global analytics engine instance
+analytics_engine = AnalyticsEngine()
@@ -0,0 +1,139 @@
+"""
+Assignment Services
+Set-based creation of course progress records and incremental propagation of new courses
+"""
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from backend.database import get_postgres_db, get_falkor_db
+from backend.services.jobs import JobContext, job_handler
+
+logger = logging.getLogger(__name__)
+
+PROPAGATION_BATCH_SIZE = 1000
+
+# Relationship written by GraphInitializer.assign_employees -> assignment_type
+ASSIGNMENT_RELATIONSHIPS = {
+    "assigned_track": "track",
+    "assigned_subtrack": "subtrack",
+    "assigned_course": "course",
+}
+
+
+def create_assignment_records(
+    employee_ids: List[str],
+    course_ids: List[str],
+    assignment_type: str,
+    assignment_id: str,
+    title: str = "New Course Assigned",
+    message: Optional[str] = None,
+    notification_course_id: Optional[str] = None
+) -> Tuple[int, int]:
+    """
+    Insert progress rows for every employee x course pair and one notification per
+    employee that received new courses, in a single transaction.
+    Returns (progress rows created, notifications created).
+    """
+    postgres_db = get_postgres_db()
+
+    query = """
+    WITH created AS (
+        INSERT INTO employee_course_progress
+        (employee_id, course_id, assignment_type, assignment_id, status)
+        SELECT e.employee_id, c.course_id, %(assignment_type)s, %(assignment_id)s, 'assigned'
+        FROM unnest(%(employee_ids)s::varchar[]) AS e(employee_id)
+        CROSS JOIN unnest(%(course_ids)s::varchar[]) AS c(course_id)
+        ON CONFLICT (employee_id, course_id) DO NOTHING
+        RETURNING employee_id
+    ),
+    notified AS (
+        INSERT INTO notifications
+        (employee_id, notification_type, title, message, course_id)
+        SELECT DISTINCT employee_id, 'course_assigned', %(title)s, %(message)s, %(notification_course_id)s
+        FROM created
+        RETURNING 1
+    )
+    SELECT (SELECT COUNT(*) FROM created) AS progress_created,
+           (SELECT COUNT(*) FROM notified) AS notifications_created
+    """
+    result = postgres_db.execute_query(query, {
+        "employee_ids": employee_ids,
+        "course_ids": course_ids,
+        "assignment_type": assignment_type,
+        "assignment_id": assignment_id,
+        "title": title,
+        "message": message or f"You have been assigned to: {assignment_id}",
+        "notification_course_id": notification_course_id or assignment_id,
+    }, fetch=True)
+
+    return result[0]["progress_created"], result[0]["notifications_created"]
+
+
+def find_affected_assignments(course_id: str) -> Tuple[List[str], Dict[Tuple[str, str], List[str]]]:
+    """
+    Find the courses under a (new) course node and the existing assignments that reach it.
+    Returns (course_ids, {(assignment_type, assignment_id): [employee_id, ...]}).
+    """
+    falkor_db = get_falkor_db()
+
+    query = f"""
+    MATCH (c:Course {{course_id: '{course_id}'}})-[:has_course*0..]->(d:Course)
+    RETURN DISTINCT d.course_id
+    """
+    course_ids = [row[0] for row in falkor_db.execute_query(query)]
+
+    # Every ancestor (Track, SubTrack or Course) of the new course that an employee is assigned to
+    query = f"""
+    MATCH (c:Course {{course_id: '{course_id}'}})<-[:has_course|has_subtrack*1..]-(n)
+    MATCH (e:Employees)-[r:assigned_track|assigned_subtrack|assigned_course]->(n)
+    RETURN DISTINCT e.employee_id, type(r), coalesce(n.track_id, n.subtrack_id, n.course_id)
+    """
+    assignments: Dict[Tuple[str, str], List[str]] = defaultdict(list)
+    for employee_id, relationship, assignment_id in falkor_db.execute_query(query):
+        assignments[(ASSIGNMENT_RELATIONSHIPS[relationship], assignment_id)].append(employee_id)
+
+    return course_ids, dict(assignments)
+
+
+def propagate_new_course(course_id: str, context: Optional[JobContext] = None) -> dict:
+    """
+    Give employees already assigned to an ancestor of `course_id` the progress rows
+    for it (and its sub-courses), inserting only the missing rows in batches.
+    """
+    course_ids, assignments = find_affected_assignments(course_id)
+    totals = {"course_id": course_id, "assignments": len(assignments), "employees": 0,
+              "progress_records_created": 0, "notifications_created": 0}
+
+    if not course_ids:
+        return totals
+
+    for (assignment_type, assignment_id), employee_ids in assignments.items():
+        for start in range(0, len(employee_ids), PROPAGATION_BATCH_SIZE):
+            batch = employee_ids[start:start + PROPAGATION_BATCH_SIZE]
+            progress_created, notifications_created = create_assignment_records(
+                batch,
+                course_ids,
+                assignment_type,
+                assignment_id,
+                title="New Course Available",
+                message=f"A new course was added to {assignment_id}: {course_id}",
+                notification_course_id=course_id
+            )
+            totals["employees"] += len(batch)
+            totals["progress_records_created"] += progress_created
+            totals["notifications_created"] += notifications_created
+            if context:
+                context.checkpoint(progress=totals)
+
+    logger.info(
+        f"Course {course_id} propagated to {totals['progress_records_created']} progress records "
+        f"across {totals['assignments']} assignments"
+    )
+    return totals
+
+
+@job_handler("course_propagation")
+def _run_course_propagation_job(context: JobContext) -> dict:
+    """Inserts are idempotent, so a retry simply recomputes the delta"""
+    return propagate_new_course(context.params["course_id"], context)
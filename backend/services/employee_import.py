@@ -0,0 +1,287 @@
+"""
+Bulk Employee Import
+Streams a CSV upload, validates rows, hashes passwords in a process pool and loads in batches
+"""
+from concurrent.futures import ProcessPoolExecutor, Future
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+import codecs
+import csv
+import io
+import os
+import threading
+import time
+import logging
+
+from pydantic import ValidationError
+
+from backend.config import settings
+from backend.database import get_postgres_db
+from backend.models.schemas import EmployeeCreate
+from backend.utils.auth import get_password_hash
+
+logger = logging.getLogger(__name__)
+
+MAX_REPORTED_ERRORS = 1000
+ENCODING_CHECK_CHUNK = 1024 * 1024
+STAGE_COLUMNS = ("row_number", "employee_id", "employee_name", "email", "department", "role", "password_hash")
+
+_hash_pool: Optional[ProcessPoolExecutor] = None
+_hash_pool_workers = 1
+_hash_pool_lock = threading.Lock()
+
+
+def _get_hash_pool() -> ProcessPoolExecutor:
+    """Get the shared password hashing process pool (created on first use)"""
+    global _hash_pool, _hash_pool_workers
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            _hash_pool_workers = settings.IMPORT_HASH_WORKERS or os.cpu_count() or 1
+            _hash_pool = ProcessPoolExecutor(max_workers=_hash_pool_workers)
+            logger.info(f"Password hashing pool started with {_hash_pool_workers} workers")
+        return _hash_pool
+
+
+def shutdown_hash_pool():
+    """Stop the hashing pool if it was started"""
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is not None:
+            _hash_pool.shutdown(wait=False, cancel_futures=True)
+            _hash_pool = None
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in error.errors()
+    )
+
+
+class ImportReport:
+    """Accumulates counts and per-row errors for one import"""
+
+    def __init__(self):
+        self.total_rows = 0
+        self.imported = 0
+        self.failed = 0
+        self.errors: List[Dict] = []
+        self.started = time.monotonic()
+
+    def add_error(self, row_number: int, employee_id: Optional[str], error: str):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row_number, "employee_id": employee_id, "error": error})
+
+    def as_dict(self) -> Dict:
+        elapsed = time.monotonic() - self.started
+        return {
+            "total_rows": self.total_rows,
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(self.total_rows / elapsed, 1) if elapsed > 0 else None,
+        }
+
+
+def _check_encoding(stream: BinaryIO):
+    """Reject a stream that is not valid UTF-8 before any batch is written, then rewind it"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    offset = 0
+    try:
+        while True:
+            chunk = stream.read(ENCODING_CHECK_CHUNK)
+            decoder.decode(chunk, final=not chunk)
+            if not chunk:
+                break
+            offset += len(chunk)
+    except UnicodeDecodeError as e:
+        raise ValueError(f"CSV is not valid UTF-8 (byte {offset + e.start})")
+    stream.seek(0)
+
+
+def _iter_valid_batches(
+    stream: BinaryIO, report: ImportReport, batch_size: int
+) -> Iterator[List[Tuple[int, EmployeeCreate]]]:
+    """Yield batches of validated rows, recording invalid and duplicate rows in the report"""
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""))
+    missing = {"employee_id", "employee_name", "email", "password"} - set(reader.fieldnames or [])
+    if missing:
+        raise ValueError(f"CSV is missing required columns: {', '.join(sorted(missing))}")
+
+    seen_ids = set()
+    seen_emails = set()
+    batch: List[Tuple[int, EmployeeCreate]] = []
+
+    # Row 1 is the header
+    for row_number, row in enumerate(reader, start=2):
+        report.total_rows += 1
+        values = {key: (value.strip() if isinstance(value, str) else value) for key, value in row.items() if key}
+        values = {key: value for key, value in values.items() if value not in ("", None)}
+
+        try:
+            employee = EmployeeCreate(**values)
+        except ValidationError as e:
+            report.add_error(row_number, values.get("employee_id"), _format_validation_error(e))
+            continue
+
+        email = employee.email.lower()
+        if employee.employee_id in seen_ids or email in seen_emails:
+            report.add_error(row_number, employee.employee_id, "Duplicate employee_id or email in file")
+            continue
+        seen_ids.add(employee.employee_id)
+        seen_emails.add(email)
+
+        batch.append((row_number, employee))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+def _load_batch(batch: List[Tuple[int, EmployeeCreate]], hashes: List[Optional[str]], report: ImportReport):
+    """
+    COPY a batch into a staging table and upsert it into employees in one transaction.
+    Rows of existing employees carry no hash; one deleted since the lookup is skipped.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for (row_number, employee), password_hash in zip(batch, hashes):
+        writer.writerow([
+            row_number,
+            employee.employee_id,
+            employee.employee_name,
+            employee.email,
+            employee.department,
+            employee.role,
+            password_hash,
+        ])
+    buffer.seek(0)
+
+    postgres_db = get_postgres_db()
+    with postgres_db.get_cursor() as cursor:
+        cursor.execute("""
+            CREATE TEMP TABLE employee_import_stage (
+                row_number INTEGER,
+                employee_id VARCHAR(50),
+                employee_name VARCHAR(255),
+                email VARCHAR(255),
+                department VARCHAR(100),
+                role VARCHAR(50),
+                password_hash VARCHAR(255)
+            ) ON COMMIT DROP
+        """)
+        cursor.copy_expert(
+            f"COPY employee_import_stage ({', '.join(STAGE_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+
+        # Emails already owned by a different employee would violate the unique constraint
+        cursor.execute("""
+            SELECT s.row_number, s.employee_id
+            FROM employee_import_stage s
+            JOIN employees e ON e.email = s.email AND e.employee_id <> s.employee_id
+        """)
+        for row in cursor.fetchall():
+            report.add_error(row["row_number"], row["employee_id"], "Email already used by another employee")
+
+        cursor.execute("""
+            INSERT INTO employees (employee_id, employee_name, email, department, role, password_hash)
+            SELECT s.employee_id, s.employee_name, s.email, s.department, s.role, s.password_hash
+            FROM employee_import_stage s
+            WHERE NOT EXISTS (
+                SELECT 1 FROM employees e
+                WHERE e.email = s.email AND e.employee_id <> s.employee_id
+            )
+            AND (s.password_hash IS NOT NULL
+                 OR EXISTS (SELECT 1 FROM employees e WHERE e.employee_id = s.employee_id))
+            ON CONFLICT (employee_id) DO UPDATE
+            SET employee_name = EXCLUDED.employee_name,
+                email = EXCLUDED.email,
+                department = EXCLUDED.department
+        """)
+        report.imported += cursor.rowcount
+
+
+def _hash_passwords(passwords: List[str]) -> List[str]:
+    """Hash a chunk of passwords (runs in a worker process)"""
+    return [get_password_hash(password) for password in passwords]
+
+
+def _existing_employee_ids(batch: List[Tuple[int, EmployeeCreate]]) -> set:
+    """Employee ids in the batch that already exist (their passwords are never updated)"""
+    postgres_db = get_postgres_db()
+    result = postgres_db.execute_query(
+        "SELECT employee_id FROM employees WHERE employee_id = ANY(%s)",
+        ([employee.employee_id for _, employee in batch],),
+        fetch=True
+    )
+    return {row["employee_id"] for row in result}
+
+
+def _dispatch_hashing(
+    pool: ProcessPoolExecutor, batch: List[Tuple[int, EmployeeCreate]]
+) -> Tuple[List[bool], List[Future]]:
+    """
+    Split the passwords of the batch's new employees into chunks and submit them to
+    the pool. Returns which rows need a hash, in batch order, and the futures.
+    """
+    existing = _existing_employee_ids(batch)
+    needs_hash = [employee.employee_id not in existing for _, employee in batch]
+    passwords = [employee.password for (_, employee), new in zip(batch, needs_hash) if new]
+    chunk = max(1, len(passwords) // (_hash_pool_workers * 4))
+    futures = [pool.submit(_hash_passwords, passwords[i:i + chunk]) for i in range(0, len(passwords), chunk)]
+    return needs_hash, futures
+
+
+def _collect_and_load(
+    batch: List[Tuple[int, EmployeeCreate]],
+    needs_hash: List[bool],
+    futures: List[Future],
+    report: ImportReport,
+    on_batch: Optional[Callable[[Dict], None]]
+):
+    computed = iter([password_hash for future in futures for password_hash in future.result()])
+    hashes = [next(computed) if new else None for new in needs_hash]
+    _load_batch(batch, hashes, report)
+    if on_batch:
+        on_batch({"rows_read": report.total_rows, "imported": report.imported, "failed": report.failed})
+
+
+def import_employees_csv(
+    stream: BinaryIO,
+    batch_size: Optional[int] = None,
+    on_batch: Optional[Callable[[Dict], None]] = None
+) -> Dict:
+    """
+    Import employees from a CSV stream (columns: employee_id, employee_name, email,
+    department, role, password). Existing employee_ids get their profile (name, email,
+    department) updated; their password and role are never changed by an import.
+    The whole stream is checked to be UTF-8 before anything is written.
+    Only new employees' passwords are hashed, and hashing of the next batch overlaps
+    with loading of the current one.
+    `on_batch` is called with running counts after each batch is loaded.
+    """
+    report = ImportReport()
+    pool = _get_hash_pool()
+    batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+    _check_encoding(stream)
+
+    pending = None
+    for batch in _iter_valid_batches(stream, report, batch_size):
+        needs_hash, futures = _dispatch_hashing(pool, batch)
+        if pending:
+            _collect_and_load(*pending, report, on_batch)
+        pending = (batch, needs_hash, futures)
+
+    if pending:
+        _collect_and_load(*pending, report, on_batch)
+
+    result = report.as_dict()
+    logger.info(
+        f"Employee import finished: {result['imported']} imported, {result['failed']} failed, "
+        f"{result['rows_per_second']} rows/s"
+    )
+    return result
@@ -0,0 +1,212 @@
+"""
+Report Exports
+Streams the completion dataset from a server-side cursor into CSV or Parquet files
+"""
+from pathlib import Path
+from typing import List, Optional, Tuple
+import csv
+import importlib.util
+import socket
+import time
+import logging
+
+from backend.config import settings
+from backend.database import get_postgres_db
+from backend.services.jobs import JobContext, job_handler
+
+logger = logging.getLogger(__name__)
+
+# How often each host deletes its expired export files
+EXPORT_PURGE_INTERVAL_SECONDS = 3600
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# (column, SQL expression, parquet type name)
+EXPORT_COLUMNS: List[Tuple[str, str, str]] = [
+    ("employee_id", "p.employee_id", "string"),
+    ("employee_name", "e.employee_name", "string"),
+    ("email", "e.email", "string"),
+    ("department", "e.department", "string"),
+    ("course_id", "p.course_id", "string"),
+    ("course_name", "c.course_name", "string"),
+    ("assignment_type", "p.assignment_type", "string"),
+    ("assignment_id", "p.assignment_id", "string"),
+    ("status", "p.status", "string"),
+    ("assigned_at", "p.created_at", "timestamp"),
+    ("started_at", "p.started_at", "timestamp"),
+    ("completed_at", "p.completed_at", "timestamp"),
+    ("time_taken_minutes", "p.time_taken_minutes", "int32"),
+    ("attempt_number", "q.attempt_number", "int32"),
+    ("score", "q.score::float8", "float64"),
+    ("passed", "q.passed", "bool"),
+    ("attempted_at", "q.attempted_at", "timestamp"),
+]
+
+
+def parquet_available() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def export_dir() -> Path:
+    return Path(settings.JOB_STORAGE_DIR) / "exports"
+
+
+def export_path(job_id: int, export_format: str) -> Path:
+    return export_dir() / f"completion_{job_id}.{export_format}"
+
+
+def purge_expired_exports() -> int:
+    """
+    Delete this host's export files, and `.part` files left by crashed jobs, last
+    written more than EXPORT_RETENTION_HOURS ago. Returns the number of files deleted.
+    """
+    directory = export_dir()
+    if not directory.exists():
+        return 0
+
+    cutoff = time.time() - settings.EXPORT_RETENTION_HOURS * 3600
+    deleted = 0
+    for path in directory.glob("completion_*"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                deleted += 1
+        except FileNotFoundError:
+            continue
+    if deleted:
+        logger.info(f"Deleted {deleted} expired export files")
+    return deleted
+
+
+def _build_query(department: Optional[str], course_id: Optional[str], status: Optional[str]) -> Tuple[str, dict]:
+    """One row per progress record and quiz attempt (progress without attempts has NULL attempt columns)"""
+    conditions = []
+    params = {}
+    if department:
+        conditions.append("e.department = %(department)s")
+        params["department"] = department
+    if course_id:
+        conditions.append("p.course_id = %(course_id)s")
+        params["course_id"] = course_id
+    if status:
+        conditions.append("p.status = %(status)s")
+        params["status"] = status
+
+    query = f"""
+    SELECT {', '.join(expression for _, expression, _ in EXPORT_COLUMNS)}
+    FROM employee_course_progress p
+    JOIN employees e ON e.employee_id = p.employee_id
+    LEFT JOIN course_catalog c ON c.course_id = p.course_id
+    LEFT JOIN quiz_attempts q ON q.employee_id = p.employee_id AND q.course_id = p.course_id
+    {'WHERE ' + ' AND '.join(conditions) if conditions else ''}
+    ORDER BY p.employee_id, p.course_id, q.attempt_number
+    """
+    return query, params
+
+
+class _CsvWriter:
+    def __init__(self, path: Path):
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow([name for name, _, _ in EXPORT_COLUMNS])
+
+    def write(self, rows: List[tuple]):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+
+
+class _ParquetWriter:
+    """Writes each chunk as one row group, so only one chunk is held in memory"""
+
+    def __init__(self, path: Path):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.pa = pa
+        types = {
+            "string": pa.string(),
+            "timestamp": pa.timestamp("us"),
+            "int32": pa.int32(),
+            "float64": pa.float64(),
+            "bool": pa.bool_(),
+        }
+        self.schema = pa.schema([(name, types[type_name]) for name, _, type_name in EXPORT_COLUMNS])
+        self.writer = pq.ParquetWriter(str(path), self.schema, compression="snappy")
+
+    def write(self, rows: List[tuple]):
+        columns = list(zip(*rows))
+        arrays = [self.pa.array(column, type=field.type) for column, field in zip(columns, self.schema)]
+        self.writer.write_table(self.pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+def write_completion_export(
+    path: Path,
+    export_format: str,
+    department: Optional[str] = None,
+    course_id: Optional[str] = None,
+    status: Optional[str] = None,
+    on_chunk=None
+) -> dict:
+    """
+    Stream the completion dataset into `path` in EXPORT_CHUNK_ROWS chunks.
+    The file is written under a temporary name and renamed when complete.
+    """
+    query, params = _build_query(department, course_id, status)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_suffix(path.suffix + ".part")
+    writer = _ParquetWriter(partial) if export_format == "parquet" else _CsvWriter(partial)
+    rows_written = 0
+
+    postgres_db = get_postgres_db()
+    try:
+        with postgres_db.get_connection() as conn:
+            try:
+                # Named cursor: rows stay on the server and are fetched chunk by chunk
+                with conn.cursor(name="completion_export") as cursor:
+                    cursor.itersize = settings.EXPORT_CHUNK_ROWS
+                    cursor.execute(query, params)
+                    while True:
+                        rows = cursor.fetchmany(settings.EXPORT_CHUNK_ROWS)
+                        if not rows:
+                            break
+                        writer.write(rows)
+                        rows_written += len(rows)
+                        if on_chunk:
+                            on_chunk({"rows_written": rows_written})
+            finally:
+                conn.rollback()
+                writer.close()
+    except Exception:
+        partial.unlink(missing_ok=True)
+        raise
+
+    partial.replace(path)
+    logger.info(f"Export {path.name} written: {rows_written} rows")
+    return {"rows": rows_written, "bytes": path.stat().st_size}
+
+
+@job_handler("report_export")
+def _run_report_export_job(context: JobContext) -> dict:
+    """
+    Write the export file; a retry rewrites it from the start. The file stays on this
+    worker's host, which is recorded so downloads elsewhere can be told apart from expiry.
+    """
+    params = context.params
+    path = export_path(context.job_id, params["format"])
+    result = write_completion_export(
+        path,
+        params["format"],
+        department=params.get("department"),
+        course_id=params.get("course_id"),
+        status=params.get("status"),
+        on_chunk=lambda counts: context.checkpoint(progress=counts)
+    )
+    return {"format": params["format"], "file": path.name, "host": socket.gethostname(), **result}
@@ -0,0 +1,230 @@
+"""
+Question Item Analysis
+Incrementally accumulates per-question response statistics and derives difficulty,
+point-biserial discrimination and option selection rates from them
+"""
+from typing import List, Optional
+import logging
+
+from backend.database import get_postgres_db
+from backend.services.jobs import JobContext, job_handler
+
+logger = logging.getLogger(__name__)
+
+STATE_NAME = "question_item_stats"
+ATTEMPT_BATCH_SIZE = 50000
+
+# Attempts newer than this are left for the next run, so ids allocated by
+# still-open transactions are not skipped past
+SAFETY_LAG = "1 minute"
+
+# Thresholds for flagging questions worth reviewing
+TOO_EASY = 0.9
+TOO_HARD = 0.3
+LOW_DISCRIMINATION = 0.2
+UNUSED_DISTRACTOR = 0.05
+
+_ACCUMULATE_QUERY = """
+INSERT INTO question_item_stats AS s
+    (course_id, question_id, responses, correct, score_sum, score_sq_sum, correct_score_sum,
+     selected_a, selected_b, selected_c, selected_d, updated_at)
+SELECT a.course_id,
+       r.question_id,
+       COUNT(*),
+       COUNT(*) FILTER (WHERE r.is_correct),
+       SUM(a.score::float8),
+       SUM(a.score::float8 * a.score::float8),
+       COALESCE(SUM(a.score::float8) FILTER (WHERE r.is_correct), 0),
+       COUNT(*) FILTER (WHERE r.selected_answer = 'A'),
+       COUNT(*) FILTER (WHERE r.selected_answer = 'B'),
+       COUNT(*) FILTER (WHERE r.selected_answer = 'C'),
+       COUNT(*) FILTER (WHERE r.selected_answer = 'D'),
+       CURRENT_TIMESTAMP
+FROM quiz_attempts a
+JOIN v_quiz_responses r ON r.attempt_id = a.attempt_id AND r.answered_at = a.attempted_at
+WHERE a.attempt_id > %(after)s AND a.attempt_id <= %(upto)s
+  AND a.attempted_at >= %(since)s
+GROUP BY a.course_id, r.question_id
+ON CONFLICT (course_id, question_id) DO UPDATE
+SET responses = s.responses + EXCLUDED.responses,
+    correct = s.correct + EXCLUDED.correct,
+    score_sum = s.score_sum + EXCLUDED.score_sum,
+    score_sq_sum = s.score_sq_sum + EXCLUDED.score_sq_sum,
+    correct_score_sum = s.correct_score_sum + EXCLUDED.correct_score_sum,
+    selected_a = s.selected_a + EXCLUDED.selected_a,
+    selected_b = s.selected_b + EXCLUDED.selected_b,
+    selected_c = s.selected_c + EXCLUDED.selected_c,
+    selected_d = s.selected_d + EXCLUDED.selected_d,
+    updated_at = EXCLUDED.updated_at
+"""
+
+
+def refresh_item_stats(context: Optional[JobContext] = None) -> dict:
+    """
+    Aggregate responses of attempts past the stored attempt_id watermark in batches.
+    Each batch and its watermark advance commit together, so a retried run never
+    counts a response twice.
+
+    The state's `watermark` is the attempted_at cutoff of the last completed run. Later
+    attempts started at most SAFETY_LAG before it, which bounds the scan to recent partitions.
+    """
+    postgres_db = get_postgres_db()
+    upto_result = postgres_db.execute_query(f"""
+        SELECT COALESCE(MAX(attempt_id), 0) AS upto,
+               CURRENT_TIMESTAMP - INTERVAL '{SAFETY_LAG}' AS cutoff
+        FROM quiz_attempts
+        WHERE attempted_at < CURRENT_TIMESTAMP - INTERVAL '{SAFETY_LAG}'
+    """, fetch=True)
+    upto = upto_result[0]["upto"]
+    cutoff = upto_result[0]["cutoff"]
+
+    attempts_processed = 0
+    while True:
+        with postgres_db.get_cursor() as cursor:
+            # Row lock serializes concurrent refreshes
+            cursor.execute("""
+                INSERT INTO report_refresh_state (report_name, watermark, last_id)
+                VALUES (%s, 'epoch', 0)
+                ON CONFLICT (report_name) DO NOTHING
+            """, (STATE_NAME,))
+            cursor.execute(f"""
+                SELECT watermark - INTERVAL '{SAFETY_LAG}' AS since, last_id
+                FROM report_refresh_state WHERE report_name = %s FOR UPDATE
+            """, (STATE_NAME,))
+            state = cursor.fetchone()
+            after = state["last_id"] or 0
+            if after >= upto:
+                break
+
+            batch_upto = min(after + ATTEMPT_BATCH_SIZE, upto)
+            cursor.execute(_ACCUMULATE_QUERY, {
+                "after": after,
+                "upto": batch_upto,
+                "since": state["since"],
+            })
+            # Keep the old cutoff until the last batch: attempts up to `upto` may predate this run's
+            cursor.execute("""
+                UPDATE report_refresh_state
+                SET last_id = %s,
+                    watermark = CASE WHEN %s THEN %s ELSE watermark END,
+                    refreshed_at = CURRENT_TIMESTAMP
+                WHERE report_name = %s
+            """, (batch_upto, batch_upto == upto, cutoff, STATE_NAME))
+
+        attempts_processed += batch_upto - after
+        if context:
+            context.checkpoint(progress={"through_attempt_id": batch_upto, "target_attempt_id": upto})
+
+    if attempts_processed:
+        logger.info(f"Item statistics updated through attempt {upto}")
+    return {"through_attempt_id": upto, "attempt_ids_scanned": attempts_processed}
+
+
+@job_handler("item_analysis")
+def _run_item_analysis_job(context: JobContext) -> dict:
+    return refresh_item_stats(context)
+
+
+def _flags(row: dict) -> List[str]:
+    flags = []
+    if row["difficulty"] is not None:
+        if row["difficulty"] > TOO_EASY:
+            flags.append("too_easy")
+        elif row["difficulty"] < TOO_HARD:
+            flags.append("too_hard")
+    if row["discrimination"] is not None and row["discrimination"] < LOW_DISCRIMINATION:
+        flags.append("low_discrimination")
+
+    # Without a known correct answer every option would count as a distractor
+    if row["correct_answer"] is None:
+        return flags
+
+    distractors = {option: rate for option, rate in row["option_rates"].items() if option != row["correct_answer"]}
+    if any(rate < UNUSED_DISTRACTOR for rate in distractors.values()):
+        flags.append("unused_distractor")
+    if any(rate > row["option_rates"].get(row["correct_answer"], 0) for rate in distractors.values()):
+        flags.append("distractor_preferred")
+    return flags
+
+
+def get_question_quality(
+    course_id: Optional[str] = None,
+    min_responses: int = 30,
+    sort: str = "discrimination",
+    limit: int = 100,
+    offset: int = 0
+) -> dict:
+    """
+    Item statistics per question (within one course, or pooled across courses).
+    Discrimination is the point-biserial correlation between answering correctly
+    and the attempt score.
+    """
+    conditions = []
+    params = {"min_responses": min_responses, "limit": limit + 1, "offset": offset}
+    if course_id:
+        conditions.append("s.course_id = %(course_id)s")
+        params["course_id"] = course_id
+
+    order = {
+        "discrimination": "discrimination ASC NULLS FIRST",
+        "difficulty": "difficulty ASC",
+        "responses": "responses DESC",
+    }[sort]
+
+    query = f"""
+    WITH totals AS (
+        SELECT s.question_id,
+               SUM(s.responses)::float8 AS n,
+               SUM(s.correct)::float8 AS sx,
+               SUM(s.score_sum) AS sy,
+               SUM(s.score_sq_sum) AS syy,
+               SUM(s.correct_score_sum) AS sxy,
+               SUM(s.selected_a)::float8 AS a,
+               SUM(s.selected_b)::float8 AS b,
+               SUM(s.selected_c)::float8 AS c,
+               SUM(s.selected_d)::float8 AS d
+        FROM question_item_stats s
+        {'WHERE ' + ' AND '.join(conditions) if conditions else ''}
+        GROUP BY s.question_id
+        HAVING SUM(s.responses) >= %(min_responses)s
+    )
+    SELECT t.question_id,
+           q.question_text,
+           q.correct_answer,
+           t.n::bigint AS responses,
+           ROUND((t.sx / t.n)::numeric, 4)::float8 AS difficulty,
+           ROUND(((t.n * t.sxy - t.sx * t.sy)
+                  / NULLIF(SQRT(GREATEST((t.n * t.sx - t.sx * t.sx) * (t.n * t.syy - t.sy * t.sy), 0)), 0)
+                 )::numeric, 4)::float8 AS discrimination,
+           t.a / t.n AS rate_a,
+           t.b / t.n AS rate_b,
+           t.c / t.n AS rate_c,
+           t.d / t.n AS rate_d
+    FROM totals t
+    LEFT JOIN question_master q ON q.question_id = t.question_id
+    ORDER BY {order}, t.question_id
+    LIMIT %(limit)s OFFSET %(offset)s
+    """
+
+    postgres_db = get_postgres_db()
+    rows = postgres_db.execute_query(query, params, fetch=True)
+
+    items = []
+    for row in rows[:limit]:
+        item = {
+            "question_id": row["question_id"],
+            "question_text": row["question_text"],
+            "correct_answer": row["correct_answer"],
+            "responses": row["responses"],
+            "difficulty": row["difficulty"],
+            "discrimination": row["discrimination"],
+            "option_rates": {option: round(row[f"rate_{option.lower()}"], 4) for option in "ABCD"},
+        }
+        item["flags"] = _flags(item)
+        items.append(item)
+
+    return {
+        "course_id": course_id,
+        "items": items,
+        "next_offset": offset + limit if len(rows) > limit else None,
+    }
@@ -0,0 +1,418 @@
+"""
+Background Job Runner
+Durable PostgreSQL-backed job queue processed by in-process worker threads
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import os
+import socket
+import threading
+import time
+import traceback
+import logging
+
+from psycopg2.extras import Json
+
+from backend.config import settings
+from backend.database import get_postgres_db
+
+logger = logging.getLogger(__name__)
+
+JOB_COLUMNS = """
+    job_id, job_type, params, status, checkpoint, progress, result, error,
+    attempts, max_attempts, created_by, created_at, started_at, finished_at
+"""
+
+# Registered job handlers by job type
+_handlers: Dict[str, Callable[["JobContext"], Optional[dict]]] = {}
+
+# How often the scheduler deletes old runs of scheduled jobs
+PURGE_INTERVAL_SECONDS = 3600
+
+# Called with a job's params once it has failed for good, e.g. to delete its input files
+_failure_hooks: Dict[str, Callable[[dict], None]] = {}
+
+
+def job_handler(job_type: str, on_failure: Optional[Callable[[dict], None]] = None):
+    """Register a function as the handler for a job type"""
+    def decorator(func: Callable[["JobContext"], Optional[dict]]):
+        _handlers[job_type] = func
+        if on_failure:
+            _failure_hooks[job_type] = on_failure
+        return func
+    return decorator
+
+
+class JobLost(Exception):
+    """Raised when a job was reclaimed by another worker while running"""
+
+
+class JobContext:
+    """Handle passed to job handlers for reading params and saving progress"""
+
+    def __init__(self, job: dict, worker_id: str):
+        self.job_id: int = job["job_id"]
+        self.params: dict = job["params"] or {}
+        self.state: dict = job["checkpoint"] or {}
+        self.attempt: int = job["attempts"]
+        self.worker_id = worker_id
+
+    def checkpoint(self, state: Optional[dict] = None, progress: Optional[dict] = None):
+        """
+        Persist resumable state and progress, and refresh the heartbeat.
+        Handlers should call this after each chunk of work.
+        """
+        if state is not None:
+            self.state = state
+
+        postgres_db = get_postgres_db()
+        query = """
+        UPDATE jobs
+        SET checkpoint = %s,
+            progress = COALESCE(%s, progress),
+            heartbeat_at = CURRENT_TIMESTAMP
+        WHERE job_id = %s AND locked_by = %s AND status = 'running'
+        """
+        updated = postgres_db.execute_query(query, (
+            Json(self.state),
+            Json(progress) if progress is not None else None,
+            self.job_id,
+            self.worker_id
+        ))
+        if not updated:
+            raise JobLost(f"Job {self.job_id} is no longer owned by {self.worker_id}")
+
+        if settings.JOB_THROTTLE_SECONDS > 0:
+            time.sleep(settings.JOB_THROTTLE_SECONDS)
+
+
+def enqueue_job(job_type: str, params: Dict[str, Any], created_by: Optional[str] = None,
+                max_attempts: Optional[int] = None, pin_to_host: bool = False, cursor=None) -> dict:
+    """
+    Add a job to the queue and return its row. `pin_to_host` restricts it to
+    workers on this host, for jobs whose input sits in local JOB_STORAGE_DIR.
+    Passing a `cursor` queues the job in that cursor's transaction.
+    """
+    if job_type not in _handlers:
+        raise ValueError(f"Unknown job type: {job_type}")
+
+    postgres_db = get_postgres_db()
+    query = f"""
+    INSERT INTO jobs (job_type, params, created_by, max_attempts, pinned_host)
+    VALUES (%s, %s, %s, %s, %s)
+    RETURNING {JOB_COLUMNS}
+    """
+    values = (
+        job_type,
+        Json(params),
+        created_by,
+        max_attempts or settings.JOB_MAX_ATTEMPTS,
+        socket.gethostname() if pin_to_host else None
+    )
+    if cursor is not None:
+        cursor.execute(query, values)
+        result = [cursor.fetchone()]
+    else:
+        result = postgres_db.execute_query(query, values, fetch=True)
+    logger.info(f"Job {result[0]['job_id']} ({job_type}) queued")
+    return dict(result[0])
+
+
+def enqueue_unique_job(job_type: str, params: Optional[Dict[str, Any]] = None) -> bool:
+    """
+    Queue a job unless one of the same type is already queued or running.
+    Every process's scheduler calls this at startup, so the check and insert run under
+    a transaction-scoped advisory lock on the job type; the INSERT is a separate
+    statement so its snapshot sees a row committed by the previous lock holder.
+    """
+    postgres_db = get_postgres_db()
+    with postgres_db.get_cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (job_type,))
+        cursor.execute("""
+            INSERT INTO jobs (job_type, params, max_attempts)
+            SELECT %s, %s, %s
+            WHERE NOT EXISTS (
+                SELECT 1 FROM jobs WHERE job_type = %s AND status IN ('queued', 'running')
+            )
+        """, (job_type, Json(params or {}), settings.JOB_MAX_ATTEMPTS, job_type))
+        return cursor.rowcount > 0
+
+
+def purge_scheduled_jobs() -> int:
+    """
+    Delete succeeded runs of scheduled jobs (queued without a user) older than
+    JOB_RETENTION_DAYS; jobs queued by users and failed runs are kept
+    """
+    postgres_db = get_postgres_db()
+    return postgres_db.execute_query("""
+        DELETE FROM jobs
+        WHERE status = 'succeeded'
+          AND created_by IS NULL
+          AND finished_at < CURRENT_TIMESTAMP - make_interval(days => %s)
+    """, (settings.JOB_RETENTION_DAYS,))
+
+
+def get_job(job_id: int) -> Optional[dict]:
+    """Get a job by id"""
+    postgres_db = get_postgres_db()
+    query = f"SELECT {JOB_COLUMNS} FROM jobs WHERE job_id = %s"
+    result = postgres_db.execute_query(query, (job_id,), fetch=True)
+    return dict(result[0]) if result else None
+
+
+class JobRunner:
+    """Pool of worker threads claiming jobs with FOR UPDATE SKIP LOCKED"""
+
+    def __init__(self):
+        self.host = socket.gethostname()
+        self.runner_id = f"{self.host}:{os.getpid()}"
+        self._threads: List[threading.Thread] = []
+        self._schedules: Dict[str, float] = {}
+        self._local_tasks: Dict[str, Tuple[Callable[[], Any], float]] = {}
+        self._stop = threading.Event()
+
+    def schedule(self, job_type: str, interval_seconds: float):
+        """Queue `job_type` every `interval_seconds` while the runner is started"""
+        self._schedules[job_type] = interval_seconds
+
+    def schedule_local(self, name: str, task: Callable[[], Any], interval_seconds: float):
+        """
+        Call `task` in this process every `interval_seconds` while the runner is started.
+        For host-local work (such as cleaning JOB_STORAGE_DIR) that a queued job, which
+        any host may claim, cannot do.
+        """
+        self._local_tasks[name] = (task, interval_seconds)
+
+    def start(self, workers: int):
+        """Start worker threads"""
+        self._stop.clear()
+        for i in range(workers):
+            thread = threading.Thread(
+                target=self._run, args=(f"{self.runner_id}:{i}",), name=f"job-worker-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        if self._schedules or self._local_tasks:
+            thread = threading.Thread(target=self._run_scheduler, name="job-scheduler", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Job runner started with {workers} workers ({self.runner_id})")
+
+    def stop(self, timeout: float = 10.0):
+        """Signal workers to stop and wait for them to finish their current job"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        logger.info("Job runner stopped")
+
+    def _run_scheduler(self):
+        """Enqueue scheduled jobs when due; duplicates across processes are suppressed"""
+        next_run = {job_type: 0.0 for job_type in self._schedules}
+        next_local_run = {name: 0.0 for name in self._local_tasks}
+        next_purge = 0.0
+        intervals = list(self._schedules.values()) + [interval for _, interval in self._local_tasks.values()]
+        while not self._stop.is_set():
+            now = time.monotonic()
+            if now >= next_purge:
+                try:
+                    purged = purge_scheduled_jobs()
+                    if purged:
+                        logger.info(f"Purged {purged} old scheduled jobs")
+                except Exception as e:
+                    logger.error(f"Failed to purge old jobs: {e}")
+                next_purge = now + PURGE_INTERVAL_SECONDS
+            for job_type, interval in self._schedules.items():
+                if now < next_run[job_type]:
+                    continue
+                try:
+                    enqueue_unique_job(job_type)
+                except Exception as e:
+                    logger.error(f"Failed to schedule {job_type}: {e}")
+                next_run[job_type] = now + interval
+            for name, (task, interval) in self._local_tasks.items():
+                if now < next_local_run[name]:
+                    continue
+                try:
+                    task()
+                except Exception as e:
+                    logger.error(f"Local task {name} failed: {e}")
+                next_local_run[name] = now + interval
+            self._stop.wait(min(1.0, min(intervals)))
+
+    def _run(self, worker_id: str):
+        while not self._stop.is_set():
+            try:
+                job = self._claim(worker_id)
+            except Exception as e:
+                logger.error(f"Failed to claim job: {e}")
+                job = None
+
+            if job is None:
+                self._stop.wait(settings.JOB_POLL_INTERVAL_SECONDS)
+                continue
+
+            self._execute(job, worker_id)
+
+    def run_pending(self, max_jobs: Optional[int] = None) -> int:
+        """
+        Run due jobs in the calling thread until none is left (or `max_jobs` ran).
+        For scripts and tests, where no worker threads are started.
+        """
+        worker_id = f"{self.runner_id}:inline"
+        ran = 0
+        while max_jobs is None or ran < max_jobs:
+            job = self._claim(worker_id)
+            if job is None:
+                break
+            self._execute(job, worker_id)
+            ran += 1
+        return ran
+
+    def _claim(self, worker_id: str) -> Optional[dict]:
+        """Take the next due job, or a running job whose worker stopped heartbeating"""
+        self._fail_exhausted()
+
+        postgres_db = get_postgres_db()
+        query = """
+        UPDATE jobs
+        SET status = 'running',
+            attempts = attempts + 1,
+            locked_by = %(worker_id)s,
+            heartbeat_at = CURRENT_TIMESTAMP,
+            started_at = COALESCE(started_at, CURRENT_TIMESTAMP)
+        WHERE job_id = (
+            SELECT job_id FROM jobs
+            WHERE ((status = 'queued' AND run_after <= CURRENT_TIMESTAMP)
+                   OR (status = 'running'
+                       AND heartbeat_at < CURRENT_TIMESTAMP - make_interval(secs => %(stale)s)
+                       AND attempts < max_attempts))
+              AND (pinned_host IS NULL OR pinned_host = %(host)s)
+            ORDER BY run_after, job_id
+            LIMIT 1
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING job_id, job_type, params, checkpoint, attempts, max_attempts
+        """
+        result = postgres_db.execute_query(query, {
+            "worker_id": worker_id,
+            "stale": settings.JOB_STALE_SECONDS,
+            "host": self.host,
+        }, fetch=True)
+        return dict(result[0]) if result else None
+
+    def _fail_exhausted(self):
+        """Fail stale running jobs that have used all attempts, e.g. ones that keep killing their worker"""
+        postgres_db = get_postgres_db()
+        query = """
+        UPDATE jobs
+        SET status = 'failed',
+            error = COALESCE(error || E'\n', '') || 'Worker stopped responding on the last attempt',
+            locked_by = NULL,
+            finished_at = CURRENT_TIMESTAMP
+        WHERE status = 'running'
+          AND heartbeat_at < CURRENT_TIMESTAMP - make_interval(secs => %s)
+          AND attempts >= max_attempts
+          AND (pinned_host IS NULL OR pinned_host = %s)
+        RETURNING job_id, job_type, params
+        """
+        for job in postgres_db.execute_query(query, (settings.JOB_STALE_SECONDS, self.host), fetch=True):
+            logger.error(f"Job {job['job_id']} failed: worker stopped responding on the last attempt")
+            self._run_failure_hook(job)
+
+    def _run_failure_hook(self, job: dict):
+        hook = _failure_hooks.get(job["job_type"])
+        if hook is None:
+            return
+        try:
+            hook(job["params"] or {})
+        except Exception as e:
+            logger.error(f"Failure hook for job {job['job_id']} failed: {e}")
+
+    def _heartbeat(self, job: dict, worker_id: str, done: threading.Event):
+        """Keep a running job's heartbeat fresh between checkpoints"""
+        interval = max(1.0, settings.JOB_STALE_SECONDS / 3)
+        postgres_db = get_postgres_db()
+        while not done.wait(interval):
+            try:
+                updated = postgres_db.execute_query("""
+                    UPDATE jobs SET heartbeat_at = CURRENT_TIMESTAMP
+                    WHERE job_id = %s AND locked_by = %s AND status = 'running'
+                """, (job["job_id"], worker_id))
+            except Exception as e:
+                logger.error(f"Heartbeat for job {job['job_id']} failed: {e}")
+                continue
+            if not updated:
+                logger.warning(f"Job {job['job_id']} is no longer owned by {worker_id}")
+                return
+
+    def _execute(self, job: dict, worker_id: str):
+        handler = _handlers.get(job["job_type"])
+        if handler is None:
+            self._finish(job, worker_id, "failed", error=f"No handler for job type {job['job_type']}")
+            return
+
+        context = JobContext(job, worker_id)
+        logger.info(f"Job {job['job_id']} ({job['job_type']}) started, attempt {job['attempts']}")
+
+        done = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat, args=(job, worker_id, done), name=f"job-heartbeat-{job['job_id']}", daemon=True
+        )
+        heartbeat.start()
+        try:
+            result = handler(context)
+        except JobLost as e:
+            logger.warning(str(e))
+            return
+        except Exception as e:
+            logger.error(f"Job {job['job_id']} failed: {e}")
+            if job["attempts"] < job["max_attempts"]:
+                self._retry(job, worker_id, error=str(e))
+            else:
+                error = "".join(traceback.format_exception_only(type(e), e)).strip()
+                self._finish(job, worker_id, "failed", error=error)
+                self._run_failure_hook(job)
+            return
+        finally:
+            done.set()
+            heartbeat.join()
+
+        self._finish(job, worker_id, "succeeded", result=result)
+        logger.info(f"Job {job['job_id']} succeeded")
+
+    def _retry(self, job: dict, worker_id: str, error: str):
+        """Requeue a failed job with exponential backoff, keeping its checkpoint"""
+        delay = min(settings.JOB_RETRY_BASE_SECONDS * 2 ** (job["attempts"] - 1), 3600)
+        postgres_db = get_postgres_db()
+        query = """
+        UPDATE jobs
+        SET status = 'queued',
+            error = %s,
+            locked_by = NULL,
+            run_after = CURRENT_TIMESTAMP + make_interval(secs => %s)
+        WHERE job_id = %s AND locked_by = %s
+        """
+        postgres_db.execute_query(query, (error, delay, job["job_id"], worker_id))
+
+    def _finish(self, job: dict, worker_id: str, status: str, result: Optional[dict] = None, error: Optional[str] = None):
+        postgres_db = get_postgres_db()
+        query = """
+        UPDATE jobs
+        SET status = %s,
+            result = %s,
+            error = %s,
+            locked_by = NULL,
+            finished_at = CURRENT_TIMESTAMP
+        WHERE job_id = %s AND locked_by = %s
+        """
+        postgres_db.execute_query(query, (
+            status,
+            Json(result) if result is not None else None,
+            error,
+            job["job_id"],
+            worker_id
+        ))
+
+
+# Global job runner instance
+job_runner = JobRunner()
@@ -0,0 +1,129 @@
+"""
+Partition Maintenance
+Helpers for tables converted to monthly range partitions (<parent>_pYYYYMM)
+"""
+from datetime import date, datetime
+from typing import Callable, List, Optional
+import logging
+
+from backend.config import settings
+from backend.database import get_postgres_db
+from backend.services.jobs import JobContext, job_handler
+
+logger = logging.getLogger(__name__)
+
+# Partitioned tables have no DEFAULT partition, so an insert past the last month fails;
+# keep a year's margin in case maintenance stops running
+MONTHS_AHEAD = 12
+ARCHIVE_SCHEMA = "archive"
+
+# Referencing tables come first: a referenced partition can only be detached once the
+# partition holding rows that point at it has been
+QUIZ_TABLES = ["quiz_responses", "quiz_attempt_answers", "quiz_attempts"]
+PARTITIONED_TABLES = QUIZ_TABLES + ["notifications"]
+
+
+def is_partitioned(table: str) -> bool:
+    postgres_db = get_postgres_db()
+    result = postgres_db.execute_query(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)", (table,), fetch=True
+    )
+    return bool(result)
+
+
+def ensure_partitions(table: str, months_ahead: int = MONTHS_AHEAD) -> int:
+    """Create the current and next `months_ahead` monthly partitions; returns how many were missing"""
+    postgres_db = get_postgres_db()
+    result = postgres_db.execute_query("""
+        SELECT create_monthly_partitions(
+            %s, CURRENT_DATE, (CURRENT_DATE + make_interval(months => %s))::date
+        ) AS created
+    """, (table, months_ahead), fetch=True)
+    return result[0]["created"]
+
+
+def ensure_all_partitions() -> dict:
+    """Create upcoming partitions of every partitioned table; run at startup, with or without job workers"""
+    return {table: ensure_partitions(table) for table in PARTITIONED_TABLES if is_partitioned(table)}
+
+
+def partitions_before(table: str, cutoff: datetime) -> List[str]:
+    """Monthly partitions of `table` holding only rows older than `cutoff`, oldest first"""
+    postgres_db = get_postgres_db()
+    result = postgres_db.execute_query("""
+        SELECT c.relname AS partition_name
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass(%(table)s)
+          AND c.relname ~ ('^' || %(table)s || '_p[0-9]{6}$')
+          AND to_date(right(c.relname, 6), 'YYYYMM') + INTERVAL '1 month' <= %(cutoff)s
+        ORDER BY c.relname
+    """, {"table": table, "cutoff": cutoff}, fetch=True)
+    return [row["partition_name"] for row in result]
+
+
+def detach_partition(
+    table: str,
+    partition: str,
+    drop: bool = True,
+    after_detach: Optional[Callable] = None
+):
+    """
+    Detach one partition and drop it, or with `drop=False` move it into the archive
+    schema as a standalone table to dump or query. `after_detach(cursor, partition)`
+    runs in the same transaction once the partition no longer takes writes, e.g. to
+    adjust counters that DELETE triggers would otherwise maintain.
+    """
+    postgres_db = get_postgres_db()
+    with postgres_db.get_cursor() as cursor:
+        cursor.execute(f'ALTER TABLE "{table}" DETACH PARTITION "{partition}"')
+        if after_detach:
+            after_detach(cursor, partition)
+        if drop:
+            cursor.execute(f'DROP TABLE "{partition}"')
+        else:
+            # Archived tables stand alone; kept foreign keys would pin rows in live partitions
+            cursor.execute(
+                "SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(%s) AND contype = 'f'",
+                (partition,)
+            )
+            for row in cursor.fetchall():
+                cursor.execute(f'ALTER TABLE "{partition}" DROP CONSTRAINT "{row["conname"]}"')
+            cursor.execute(f'CREATE SCHEMA IF NOT EXISTS "{ARCHIVE_SCHEMA}"')
+            cursor.execute(f'ALTER TABLE "{partition}" SET SCHEMA "{ARCHIVE_SCHEMA}"')
+    logger.info(f"{'Dropped' if drop else 'Archived'} partition {partition}")
+
+
+def _months_ago(months: int) -> datetime:
+    """Start of the month `months` before the current one"""
+    today = date.today()
+    month_index = today.year * 12 + today.month - 1 - months
+    return datetime(month_index // 12, month_index % 12 + 1, 1)
+
+
+def maintain_quiz_partitions(context: Optional[JobContext] = None) -> dict:
+    """
+    Create the quiz attempt tables' partitions MONTHS_AHEAD months ahead and
+    archive months older than QUIZ_ARCHIVE_AFTER_MONTHS. Archived attempts stay
+    counted in the course summaries and item statistics.
+    """
+    created = {}
+    archived = []
+    for table in QUIZ_TABLES:
+        if not is_partitioned(table):
+            continue
+        created[table] = ensure_partitions(table)
+
+        if settings.QUIZ_ARCHIVE_AFTER_MONTHS:
+            for partition in partitions_before(table, _months_ago(settings.QUIZ_ARCHIVE_AFTER_MONTHS)):
+                detach_partition(table, partition, drop=False)
+                archived.append(partition)
+                if context:
+                    context.checkpoint(progress={"archived": archived})
+
+    return {"created": created, "archived": archived}
+
+
+@job_handler("partition_maintenance")
+def _run_partition_maintenance_job(context: JobContext) -> dict:
+    return maintain_quiz_partitions(context)
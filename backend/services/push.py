@@ -0,0 +1,394 @@
+"""
+Push Notification Delivery
+Drains undelivered notifications in batches, groups them into one digest per recipient
+and sends them through a pluggable transport
+"""
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import logging
+
+from jose import jwt
+
+from backend.config import settings
+from backend.database import get_postgres_db
+from backend.services.jobs import JobContext, job_handler
+
+logger = logging.getLogger(__name__)
+
+# Pending rows are leased for this long when claimed; a crashed run's rows become due again after it
+CLAIM_LEASE_SECONDS = 300
+DIGEST_PREVIEW_TITLES = 3
+
+
+@dataclass
+class PushMessage:
+    employee_id: str
+    tokens: List[str]
+    title: str
+    body: str
+    data: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class PushResult:
+    delivered: bool
+    retryable: bool = True
+    invalid_tokens: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+class PushTransport:
+    """Sends one message to all of a recipient's devices"""
+
+    def send(self, message: PushMessage) -> PushResult:
+        raise NotImplementedError
+
+
+class FcmTransport(PushTransport):
+    """
+    Firebase Cloud Messaging HTTP v1 API, authenticated with an OAuth2 token for the
+    service account in FCM_CREDENTIALS_FILE. v1 takes one device token per request.
+    """
+
+    URL = "https://fcm.googleapis.com/v1/projects/{project_id}/messages:send"
+    SCOPE = "https://www.googleapis.com/auth/firebase.messaging"
+    # Access tokens live an hour; renew a little early
+    TOKEN_LIFETIME_SECONDS = 3600
+    TOKEN_RENEW_MARGIN_SECONDS = 300
+
+    def __init__(self, credentials_file: str, timeout: float = 10.0):
+        with open(credentials_file) as f:
+            credentials = json.load(f)
+        self.project_id = credentials["project_id"]
+        self.client_email = credentials["client_email"]
+        self.private_key = credentials["private_key"]
+        self.token_uri = credentials.get("token_uri", "https://oauth2.googleapis.com/token")
+        self.timeout = timeout
+        self._access_token: Optional[str] = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def _get_access_token(self, refresh: bool = False) -> str:
+        """Exchange a signed service-account assertion for an access token, cached until near expiry"""
+        with self._lock:
+            if not refresh and self._access_token and time.time() < self._expires_at:
+                return self._access_token
+
+            now = int(time.time())
+            assertion = jwt.encode({
+                "iss": self.client_email,
+                "scope": self.SCOPE,
+                "aud": self.token_uri,
+                "iat": now,
+                "exp": now + self.TOKEN_LIFETIME_SECONDS,
+            }, self.private_key, algorithm="RS256")
+            data = urllib.parse.urlencode({
+                "grant_type": "urn:ietf:params:oauth:grant-type:jwt-bearer",
+                "assertion": assertion,
+            }).encode("ascii")
+            request = urllib.request.Request(self.token_uri, data=data, method="POST", headers={
+                "Content-Type": "application/x-www-form-urlencoded",
+            })
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                body = json.loads(response.read())
+
+            self._access_token = body["access_token"]
+            self._expires_at = now + int(body.get("expires_in", self.TOKEN_LIFETIME_SECONDS)) \
+                - self.TOKEN_RENEW_MARGIN_SECONDS
+            return self._access_token
+
+    def _send_to_token(self, message: PushMessage, token: str, refresh: bool = False) -> PushResult:
+        payload = json.dumps({"message": {
+            "token": token,
+            "notification": {"title": message.title, "body": message.body},
+            "data": message.data,
+        }}).encode("utf-8")
+        request = urllib.request.Request(self.URL.format(project_id=self.project_id), data=payload,
+                                         method="POST", headers={
+            "Authorization": f"Bearer {self._get_access_token(refresh)}",
+            "Content-Type": "application/json",
+        })
+
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout):
+                return PushResult(delivered=True)
+        except urllib.error.HTTPError as e:
+            if e.code == 401 and not refresh:
+                return self._send_to_token(message, token, refresh=True)
+            if e.code == 404:
+                # UNREGISTERED: the app was uninstalled or the token expired
+                return PushResult(delivered=False, retryable=False, invalid_tokens=[token], error="HTTP 404")
+            # 4xx other than throttling will not succeed on retry
+            return PushResult(delivered=False, retryable=e.code == 429 or e.code >= 500, error=f"HTTP {e.code}")
+        except (urllib.error.URLError, TimeoutError) as e:
+            return PushResult(delivered=False, error=str(e))
+
+    def send(self, message: PushMessage) -> PushResult:
+        results = [self._send_to_token(message, token) for token in message.tokens]
+        invalid = [token for result in results for token in result.invalid_tokens]
+        if any(result.delivered for result in results):
+            return PushResult(delivered=True, invalid_tokens=invalid)
+
+        errors = [result.error for result in results if result.error]
+        return PushResult(
+            delivered=False,
+            retryable=any(result.retryable for result in results),
+            invalid_tokens=invalid,
+            error=errors[0] if errors else "No device accepted the message"
+        )
+
+
+class FakeTransport(PushTransport):
+    """
+    Local stand-in that records messages instead of sending them, with optional
+    latency and failure rate for exercising retries and measuring throughput
+    """
+
+    def __init__(self, latency_seconds: float = 0.0, failure_rate: float = 0.0):
+        self.latency_seconds = latency_seconds
+        self.failure_rate = failure_rate
+        self.sent: List[PushMessage] = []
+        self._lock = threading.Lock()
+
+    def send(self, message: PushMessage) -> PushResult:
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        if self.failure_rate and random.random() < self.failure_rate:
+            return PushResult(delivered=False, error="Simulated failure")
+        with self._lock:
+            self.sent.append(message)
+        return PushResult(delivered=True)
+
+
+_transport: Optional[PushTransport] = None
+
+
+def get_transport() -> PushTransport:
+    """Transport selected by PUSH_TRANSPORT ('fcm' or 'fake')"""
+    global _transport
+    if _transport is None:
+        if settings.PUSH_TRANSPORT == "fake":
+            _transport = FakeTransport()
+        else:
+            _transport = FcmTransport(settings.FCM_CREDENTIALS_FILE)
+    return _transport
+
+
+def set_transport(transport: PushTransport):
+    """Override the transport (tests, benchmarks)"""
+    global _transport
+    _transport = transport
+
+
+def _claim_batch(batch_size: int) -> List[dict]:
+    postgres_db = get_postgres_db()
+    query = """
+    WITH claimed AS (
+        SELECT notification_id FROM notifications
+        WHERE delivery_status = 'pending' AND next_delivery_at <= CURRENT_TIMESTAMP
+        ORDER BY next_delivery_at, notification_id
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE notifications n
+    SET delivery_attempts = n.delivery_attempts + 1,
+        next_delivery_at = CURRENT_TIMESTAMP + make_interval(secs => %s)
+    FROM claimed
+    WHERE n.notification_id = claimed.notification_id
+    RETURNING n.notification_id, n.employee_id, n.notification_type, n.title, n.message,
+              n.course_id, n.delivery_attempts, n.created_at
+    """
+    return postgres_db.execute_query(query, (batch_size, CLAIM_LEASE_SECONDS), fetch=True)
+
+
+def _expire_stale() -> int:
+    """Stop pushing notifications older than PUSH_MAX_AGE_HOURS (e.g. after delivery was disabled)"""
+    postgres_db = get_postgres_db()
+    return postgres_db.execute_query("""
+        UPDATE notifications
+        SET delivery_status = 'skipped'
+        WHERE delivery_status = 'pending'
+          AND created_at < CURRENT_TIMESTAMP - make_interval(hours => %s)
+    """, (settings.PUSH_MAX_AGE_HOURS,))
+
+
+def _build_digest(employee_id: str, tokens: List[str], notifications: List[dict]) -> PushMessage:
+    """One message per recipient: the notification itself, or a summary of several"""
+    notifications = sorted(notifications, key=lambda n: n["created_at"], reverse=True)
+    if len(notifications) == 1:
+        only = notifications[0]
+        return PushMessage(employee_id, tokens, only["title"], only["message"], {
+            "notification_id": str(only["notification_id"]),
+            "course_id": only["course_id"] or "",
+        })
+
+    titles = [n["title"] for n in notifications[:DIGEST_PREVIEW_TITLES]]
+    more = len(notifications) - len(titles)
+    return PushMessage(
+        employee_id, tokens,
+        f"You have {len(notifications)} new notifications",
+        "; ".join(titles) + (f" and {more} more" if more else ""),
+        {"notification_ids": ",".join(str(n["notification_id"]) for n in notifications)}
+    )
+
+
+def _record_outcomes(sent: List[int], retry: List[int], failed: List[int], skipped: List[int],
+                     invalid_tokens: List[str]):
+    """Apply delivery outcomes with one set-based statement per outcome"""
+    postgres_db = get_postgres_db()
+    with postgres_db.get_cursor() as cursor:
+        if sent:
+            cursor.execute("""
+                UPDATE notifications
+                SET delivery_status = 'sent', delivered_at = CURRENT_TIMESTAMP, delivery_error = NULL
+                WHERE notification_id = ANY(%s)
+            """, (sent,))
+        if skipped:
+            cursor.execute("""
+                UPDATE notifications SET delivery_status = 'skipped' WHERE notification_id = ANY(%s)
+            """, (skipped,))
+        if failed:
+            cursor.execute("""
+                UPDATE notifications SET delivery_status = 'failed' WHERE notification_id = ANY(%s)
+            """, (failed,))
+        if retry:
+            # Exponential backoff from the attempt count; give up after PUSH_MAX_ATTEMPTS
+            cursor.execute("""
+                UPDATE notifications
+                SET delivery_status = CASE WHEN delivery_attempts >= %(max_attempts)s THEN 'failed' ELSE 'pending' END,
+                    next_delivery_at = CURRENT_TIMESTAMP
+                        + make_interval(secs => LEAST(%(base)s * POWER(2, delivery_attempts - 1), 3600))
+                WHERE notification_id = ANY(%(ids)s)
+            """, {"max_attempts": settings.PUSH_MAX_ATTEMPTS, "base": settings.PUSH_RETRY_BASE_SECONDS, "ids": retry})
+        if invalid_tokens:
+            cursor.execute("DELETE FROM device_tokens WHERE token = ANY(%s)", (invalid_tokens,))
+
+
+def _record_errors(errors: Dict[int, str]):
+    if not errors:
+        return
+    postgres_db = get_postgres_db()
+    postgres_db.execute_query("""
+        UPDATE notifications n
+        SET delivery_error = e.error
+        FROM unnest(%s::int[], %s::text[]) AS e(notification_id, error)
+        WHERE n.notification_id = e.notification_id
+    """, (list(errors), list(errors.values())))
+
+
+def _send(transport: PushTransport, message: PushMessage) -> PushResult:
+    """Send one digest; an unexpected error fails only this digest, to be retried"""
+    try:
+        return transport.send(message)
+    except Exception as e:
+        logger.error(f"Push to {message.employee_id} failed: {e}")
+        return PushResult(delivered=False, error=str(e) or type(e).__name__)
+
+
+def deliver_batch(batch_size: Optional[int] = None, executor: Optional[ThreadPoolExecutor] = None) -> dict:
+    """Claim, digest, send and record one batch; returns counts for the batch"""
+    claimed = _claim_batch(batch_size or settings.PUSH_BATCH_SIZE)
+    if not claimed:
+        return {"notifications": 0, "digests": 0, "sent": 0, "retried": 0, "failed": 0, "skipped": 0}
+
+    by_employee: Dict[str, List[dict]] = {}
+    for row in claimed:
+        by_employee.setdefault(row["employee_id"], []).append(row)
+
+    token_rows = get_postgres_db().execute_query(
+        "SELECT employee_id, token FROM device_tokens WHERE employee_id = ANY(%s)",
+        (list(by_employee),), fetch=True
+    )
+    tokens: Dict[str, List[str]] = {}
+    for row in token_rows:
+        tokens.setdefault(row["employee_id"], []).append(row["token"])
+
+    sent: List[int] = []
+    retry: List[int] = []
+    failed: List[int] = []
+    skipped: List[int] = []
+    invalid_tokens: List[str] = []
+    errors: Dict[int, str] = {}
+
+    digests = []
+    for employee_id, notifications in by_employee.items():
+        ids = [n["notification_id"] for n in notifications]
+        if employee_id not in tokens:
+            skipped.extend(ids)
+        else:
+            digests.append((ids, _build_digest(employee_id, tokens[employee_id], notifications)))
+
+    transport = get_transport()
+
+    def send(digest):
+        return _send(transport, digest[1])
+
+    results = executor.map(send, digests) if executor else map(send, digests)
+
+    for (ids, _), result in zip(digests, results):
+        invalid_tokens.extend(result.invalid_tokens)
+        if result.delivered:
+            sent.extend(ids)
+            continue
+        (retry if result.retryable else failed).extend(ids)
+        for notification_id in ids:
+            errors[notification_id] = result.error or "Delivery failed"
+
+    _record_outcomes(sent, retry, failed, skipped, invalid_tokens)
+    _record_errors(errors)
+    return {
+        "notifications": len(claimed),
+        "digests": len(digests),
+        "sent": len(sent),
+        "retried": len(retry),
+        "failed": len(failed),
+        "skipped": len(skipped),
+    }
+
+
+def drain(max_seconds: Optional[float] = None, on_batch=None) -> dict:
+    """
+    Deliver batches until nothing is due (or `max_seconds` elapse), sending up to
+    PUSH_CONCURRENCY digests at once
+    """
+    totals = {"batches": 0, "notifications": 0, "digests": 0, "sent": 0, "retried": 0, "failed": 0, "skipped": 0}
+    started = time.monotonic()
+    totals["expired"] = _expire_stale()
+
+    with ThreadPoolExecutor(max_workers=settings.PUSH_CONCURRENCY, thread_name_prefix="push") as executor:
+        while max_seconds is None or time.monotonic() - started < max_seconds:
+            counts = deliver_batch(executor=executor)
+            if not counts["notifications"]:
+                break
+            totals["batches"] += 1
+            for key, value in counts.items():
+                totals[key] += value
+            if on_batch:
+                on_batch(dict(totals))
+
+    elapsed = time.monotonic() - started
+    totals["elapsed_seconds"] = round(elapsed, 3)
+    totals["notifications_per_second"] = round(totals["notifications"] / elapsed, 1) if elapsed > 0 else None
+    if totals["notifications"]:
+        logger.info(
+            f"Push delivery: {totals['sent']} sent, {totals['retried']} retried, {totals['skipped']} skipped "
+            f"in {totals['digests']} digests ({totals['notifications_per_second']} notifications/s)"
+        )
+    return totals
+
+
+@job_handler("push_delivery")
+def _run_push_delivery_job(context: JobContext) -> dict:
+    # Bounded so the scheduler's next run picks up whatever arrives later
+    return drain(
+        max_seconds=max(settings.PUSH_POLL_SECONDS * 10, 60),
+        on_batch=lambda totals: context.checkpoint(progress=totals)
+    )
@@ -0,0 +1,115 @@
+"""
+Quiz Attempt History
+Keyset pages of past attempts and a per-attempt drill-down, shared by the employee and admin routers
+"""
+from datetime import datetime
+from typing import Optional
+
+from backend.database import get_postgres_db
+from backend.utils.pagination import encode_cursor, decode_timestamp_cursor
+
+ATTEMPT_COLUMNS = """
+    a.attempt_id, a.employee_id, a.course_id, a.attempt_number, a.score, a.total_questions,
+    a.correct_answers, a.passed, a.passing_score, a.attempted_at
+"""
+
+
+def list_attempts(
+    employee_id: str,
+    course_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50
+) -> dict:
+    """
+    One employee's attempts, newest first. Served by the (employee_id[, course_id],
+    attempted_at DESC) indexes; the cursor bound on attempted_at prunes newer partitions.
+    """
+    conditions = ["a.employee_id = %s"]
+    params: list = [employee_id]
+
+    if course_id:
+        conditions.append("a.course_id = %s")
+        params.append(course_id)
+    if cursor:
+        last_attempted_at, last_attempt_id = decode_timestamp_cursor(cursor)
+        conditions.append("(a.attempted_at, a.attempt_id) < (%s::timestamp, %s)")
+        params.extend([last_attempted_at, last_attempt_id])
+
+    # Fetch one extra row to detect a next page
+    query = f"""
+    SELECT {ATTEMPT_COLUMNS}
+    FROM quiz_attempts a
+    WHERE {' AND '.join(conditions)}
+    ORDER BY a.attempted_at DESC, a.attempt_id DESC
+    LIMIT %s
+    """
+    params.append(limit + 1)
+
+    postgres_db = get_postgres_db()
+    result = postgres_db.execute_query(query, tuple(params), fetch=True)
+
+    rows = result[:limit]
+    next_cursor = None
+    if len(result) > limit:
+        last = rows[-1]
+        next_cursor = encode_cursor(last["attempted_at"].isoformat(), last["attempt_id"])
+
+    return {"items": [dict(row) for row in rows], "next_cursor": next_cursor}
+
+
+def get_attempt_detail(
+    attempt_id: int,
+    employee_id: Optional[str] = None,
+    attempted_at: Optional[datetime] = None
+) -> Optional[dict]:
+    """
+    An attempt with every response and its question, in one join. Restricted to
+    `employee_id` when given. Passing the attempt's `attempted_at` confines the lookup
+    to its partition; the responses are pruned to it either way.
+    """
+    conditions = ["a.attempt_id = %(attempt_id)s"]
+    params = {"attempt_id": attempt_id}
+    if employee_id:
+        conditions.append("a.employee_id = %(employee_id)s")
+        params["employee_id"] = employee_id
+    if attempted_at:
+        conditions.append("a.attempted_at = %(attempted_at)s")
+        params["attempted_at"] = attempted_at
+
+    query = f"""
+    SELECT {ATTEMPT_COLUMNS},
+           r.question_id, r.selected_answer, r.is_correct,
+           q.question_text, q.correct_answer, q.option_a, q.option_b, q.option_c, q.option_d
+    FROM quiz_attempts a
+    LEFT JOIN v_quiz_responses r ON r.attempt_id = a.attempt_id AND r.answered_at = a.attempted_at
+    LEFT JOIN question_master q ON q.question_id = r.question_id
+    WHERE {' AND '.join(conditions)}
+    ORDER BY r.question_id
+    """
+
+    postgres_db = get_postgres_db()
+    rows = postgres_db.execute_query(query, params, fetch=True)
+    if not rows:
+        return None
+
+    attempt = {key: rows[0][key] for key in (
+        "attempt_id", "employee_id", "course_id", "attempt_number", "score", "total_questions",
+        "correct_answers", "passed", "passing_score", "attempted_at"
+    )}
+    attempt["responses"] = [
+        {
+            "question_id": row["question_id"],
+            "question_text": row["question_text"],
+            "selected_answer": row["selected_answer"],
+            "correct_answer": row["correct_answer"],
+            "is_correct": row["is_correct"],
+            "options": {
+                "A": row["option_a"],
+                "B": row["option_b"],
+                "C": row["option_c"],
+                "D": row["option_d"]
+            } if row["question_text"] is not None else None
+        }
+        for row in rows if row["question_id"] is not None
+    ]
+    return attempt
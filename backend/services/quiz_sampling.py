@@ -0,0 +1,133 @@
+"""
+Quiz Sampling
+Draws each attempt's questions from the course's question bank with a recorded seed
+"""
+from typing import List, Optional
+import logging
+import random
+import secrets
+
+from backend.database import get_postgres_db, get_falkor_db
+
+logger = logging.getLogger(__name__)
+
+
+def sample_question_nos(pool: List[int], quiz_size: int, seed: int) -> List[int]:
+    """
+    The first `quiz_size` entries of a seeded partial Fisher-Yates shuffle of `pool`.
+    Only Random.random() is used, whose sequence per seed is stable across Python
+    versions, so a sample can be redrawn from its seed at submission.
+    """
+    rng = random.Random(seed)
+    pool = list(pool)
+    for i in range(min(quiz_size, len(pool))):
+        j = i + int(rng.random() * (len(pool) - i))
+        pool[i], pool[j] = pool[j], pool[i]
+    return pool[:quiz_size]
+
+
+def add_to_question_bank(course_id: str, question_id: str):
+    """
+    Append a newly linked question to its course's bank. A course without a bank
+    gets one built from FalkorDB, which already holds the new link.
+    """
+    postgres_db = get_postgres_db()
+    result = postgres_db.execute_query(
+        "SELECT 1 FROM course_question_bank WHERE course_id = %s", (course_id,), fetch=True
+    )
+    if result:
+        _merge_into_bank(course_id, [question_id])
+    else:
+        _build_question_bank(course_id)
+
+
+def _merge_into_bank(course_id: str, question_ids: List[str]):
+    """
+    Create the bank or append the questions it lacks. Banks are append-only, so open
+    sessions' pools stay valid; a concurrent build or link is merged, never dropped.
+    """
+    postgres_db = get_postgres_db()
+    postgres_db.execute_query("""
+        INSERT INTO course_question_bank AS b (course_id, question_nos)
+        SELECT %s, COALESCE(array_agg(question_no ORDER BY question_no), '{}')
+        FROM question_master
+        WHERE question_id = ANY(%s)
+        ON CONFLICT (course_id) DO UPDATE
+        SET question_nos = b.question_nos || ARRAY(
+                SELECT e.question_no
+                FROM unnest(EXCLUDED.question_nos) WITH ORDINALITY AS e(question_no, position)
+                WHERE NOT e.question_no = ANY(b.question_nos)
+                ORDER BY e.position
+            ),
+            updated_at = CURRENT_TIMESTAMP
+        WHERE NOT b.question_nos @> EXCLUDED.question_nos
+    """, (course_id, question_ids))
+
+
+def _build_question_bank(course_id: str):
+    """Create a missing bank from the course's has_question links in FalkorDB"""
+    falkor_db = get_falkor_db()
+    rows = falkor_db.execute_query(
+        "MATCH (c:Course {course_id: $course_id})-[:has_question]->(q:Question) RETURN q.question_id",
+        {"course_id": course_id}
+    )
+    question_ids = [row[0] for row in rows]
+
+    _merge_into_bank(course_id, question_ids)
+    logger.info(f"Built question bank for {course_id}: {len(question_ids)} questions")
+
+
+def open_quiz_session(employee_id: str, course_id: str) -> Optional[dict]:
+    """
+    The employee's open quiz for a course, drawing a new seeded sample of
+    course_catalog.quiz_size questions (the whole bank if unset) when none is open.
+    Reloading the quiz serves the same questions until it is submitted.
+    Returns the session with its `question_nos` in serving order, or None if the
+    course has no questions.
+    """
+    postgres_db = get_postgres_db()
+    query = """
+    SELECT b.question_nos, c.quiz_size
+    FROM course_question_bank b
+    LEFT JOIN course_catalog c ON c.course_id = b.course_id
+    WHERE b.course_id = %s
+    """
+    result = postgres_db.execute_query(query, (course_id,), fetch=True)
+    if not result:
+        _build_question_bank(course_id)
+        result = postgres_db.execute_query(query, (course_id,), fetch=True)
+
+    pool = result[0]["question_nos"] if result else []
+    if not pool:
+        return None
+
+    # Only the pool size is recorded: the bank's first pool_size entries never change
+    postgres_db.execute_query("""
+        INSERT INTO quiz_sessions (employee_id, course_id, seed, pool_size, quiz_size)
+        VALUES (%s, %s, %s, %s, %s)
+        ON CONFLICT (employee_id, course_id) DO NOTHING
+    """, (
+        employee_id,
+        course_id,
+        secrets.randbits(63),
+        len(pool),
+        min(result[0]["quiz_size"] or len(pool), len(pool))
+    ))
+    return get_quiz_session(employee_id, course_id)
+
+
+def get_quiz_session(employee_id: str, course_id: str) -> Optional[dict]:
+    """The open quiz session with its served `question_nos`, or None"""
+    postgres_db = get_postgres_db()
+    result = postgres_db.execute_query("""
+        SELECT s.seed, s.pool_size, s.quiz_size, s.served_at, b.question_nos[1:s.pool_size] AS pool
+        FROM quiz_sessions s
+        JOIN course_question_bank b ON b.course_id = s.course_id
+        WHERE s.employee_id = %s AND s.course_id = %s
+    """, (employee_id, course_id), fetch=True)
+    if not result:
+        return None
+
+    session = dict(result[0])
+    session["question_nos"] = sample_question_nos(session.pop("pool"), session["quiz_size"], session["seed"])
+    return session
@@ -0,0 +1,209 @@
+"""
+Course Reminders
+Finds overdue progress rows in keyset batches and sends deduplicated reminder notifications
+"""
+from typing import Optional
+import logging
+
+from backend.config import settings
+from backend.database import get_postgres_db
+from backend.services.jobs import JobContext, job_handler
+
+logger = logging.getLogger(__name__)
+
+REMINDER_BATCH_SIZE = 5000
+
+# kind -> (progress status, timestamp column, days setting, title, message template)
+REMINDER_KINDS = {
+    "not_started": (
+        "assigned", "created_at", "REMINDER_DAYS_NOT_STARTED",
+        "Course Not Started", "You have not started {course_name} yet."
+    ),
+    "incomplete": (
+        "in_progress", "started_at", "REMINDER_DAYS_INCOMPLETE",
+        "Course Incomplete", "Don't forget to finish {course_name}."
+    ),
+}
+
+# Rows that became overdue since the kind's watermark, i.e. with <timestamp> in
+# [watermark, cutoff), read in keyset pages from the (status, <timestamp>, progress_id)
+# index. Each statement records the first reminders and turns them into notifications.
+_FIRST_BATCH_QUERY = """
+WITH batch AS (
+    SELECT p.progress_id, p.employee_id, p.course_id, p.{column} AS due_from
+    FROM employee_course_progress p
+    WHERE p.status = %(status)s
+      AND p.{column} < %(cutoff)s::timestamp
+      AND (p.{column}, p.progress_id) > (%(after_ts)s::timestamp, %(after_id)s)
+    ORDER BY p.{column}, p.progress_id
+    LIMIT %(batch_size)s
+),
+sent AS (
+    INSERT INTO progress_reminders (employee_id, course_id, kind, last_sent_at, times_sent)
+    SELECT employee_id, course_id, %(kind)s, CURRENT_TIMESTAMP, 1
+    FROM batch
+    ON CONFLICT (employee_id, course_id, kind) DO NOTHING
+    RETURNING employee_id, course_id
+),
+{notified}
+SELECT (SELECT COUNT(*) FROM batch) AS scanned,
+       (SELECT COUNT(*) FROM notified) AS sent,
+       last.due_from AS last_ts,
+       last.progress_id AS last_id,
+       NULL AS last_employee_id,
+       NULL AS last_course_id
+FROM (SELECT 1) one
+LEFT JOIN (
+    SELECT due_from, progress_id FROM batch ORDER BY due_from DESC, progress_id DESC LIMIT 1
+) last ON TRUE
+"""
+
+# Reminders of this kind last sent before the repeat window, in keyset pages from the
+# (kind, last_sent_at, employee_id, course_id) index. Courses still overdue are reminded
+# again; reminders whose course moved on are deleted, so they are not scanned again.
+_REPEAT_BATCH_QUERY = """
+WITH batch AS (
+    SELECT r.employee_id, r.course_id, r.last_sent_at
+    FROM progress_reminders r
+    WHERE r.kind = %(kind)s
+      AND r.last_sent_at < CURRENT_TIMESTAMP - make_interval(days => %(repeat_days)s)
+      AND (r.last_sent_at, r.employee_id, r.course_id) > (%(after_ts)s::timestamp, %(after_employee_id)s, %(after_course_id)s)
+    ORDER BY r.last_sent_at, r.employee_id, r.course_id
+    LIMIT %(batch_size)s
+),
+due AS (
+    SELECT b.employee_id, b.course_id
+    FROM batch b
+    JOIN employee_course_progress p ON p.employee_id = b.employee_id AND p.course_id = b.course_id
+    WHERE p.status = %(status)s
+      AND p.{column} < %(cutoff)s::timestamp
+),
+resolved AS (
+    DELETE FROM progress_reminders r
+    USING batch b
+    WHERE r.employee_id = b.employee_id AND r.course_id = b.course_id AND r.kind = %(kind)s
+      AND NOT EXISTS (SELECT 1 FROM due d WHERE d.employee_id = b.employee_id AND d.course_id = b.course_id)
+),
+sent AS (
+    UPDATE progress_reminders r
+    SET last_sent_at = CURRENT_TIMESTAMP,
+        times_sent = r.times_sent + 1
+    FROM due d
+    WHERE r.employee_id = d.employee_id AND r.course_id = d.course_id AND r.kind = %(kind)s
+    RETURNING r.employee_id, r.course_id
+),
+{notified}
+SELECT (SELECT COUNT(*) FROM batch) AS scanned,
+       (SELECT COUNT(*) FROM notified) AS sent,
+       last.last_sent_at AS last_ts,
+       NULL AS last_id,
+       last.employee_id AS last_employee_id,
+       last.course_id AS last_course_id
+FROM (SELECT 1) one
+LEFT JOIN (
+    SELECT last_sent_at, employee_id, course_id FROM batch
+    ORDER BY last_sent_at DESC, employee_id DESC, course_id DESC LIMIT 1
+) last ON TRUE
+"""
+
+_NOTIFIED_CTE = """notified AS (
+    INSERT INTO notifications (employee_id, notification_type, title, message, course_id)
+    SELECT s.employee_id, 'reminder', %(title)s,
+           REPLACE(%(message)s, '{course_name}', COALESCE(c.course_name, s.course_id)),
+           s.course_id
+    FROM sent s
+    LEFT JOIN course_catalog c ON c.course_id = s.course_id
+    RETURNING 1
+)"""
+
+PHASES = ("first", "repeat")
+
+
+def _watermark_name(kind: str) -> str:
+    return f"reminders_{kind}"
+
+
+def _start_phase(kind: str, phase: str) -> dict:
+    """Keyset start and fixed overdue cutoff for one pass"""
+    status, column, days_setting, _, _ = REMINDER_KINDS[kind]
+    postgres_db = get_postgres_db()
+    result = postgres_db.execute_query("""
+        SELECT LOCALTIMESTAMP - make_interval(days => %s) AS cutoff,
+               (SELECT watermark FROM report_refresh_state WHERE report_name = %s) AS watermark
+    """, (getattr(settings, days_setting), _watermark_name(kind)), fetch=True)[0]
+
+    state = {"cutoff": result["cutoff"].isoformat(), "after_id": 0,
+             "after_employee_id": "", "after_course_id": ""}
+    if phase == "first":
+        # Earlier rows were reminded by the runs that moved the watermark past them
+        state["after_ts"] = result["watermark"].isoformat() if result["watermark"] else "-infinity"
+    else:
+        state["after_ts"] = "-infinity"
+    return state
+
+
+def send_reminders(context: Optional[JobContext] = None) -> dict:
+    """
+    Send reminders for courses not started after REMINDER_DAYS_NOT_STARTED days and
+    not finished REMINDER_DAYS_INCOMPLETE days after starting. An employee is reminded
+    about a course at most once per REMINDER_REPEAT_DAYS.
+
+    First reminders only scan rows that became overdue since the kind's watermark in
+    report_refresh_state; repeats are found through progress_reminders.last_sent_at.
+    """
+    postgres_db = get_postgres_db()
+    state = {"kind": "not_started", "phase": "first", "scanned": 0, "sent": 0}
+    if context:
+        state.update(context.state)
+
+    steps = [(kind, phase) for kind in REMINDER_KINDS for phase in PHASES]
+    for kind, phase in steps[steps.index((state["kind"], state["phase"])):]:
+        if (kind, phase) != (state["kind"], state["phase"]) or "cutoff" not in state:
+            state.update(kind=kind, phase=phase, **_start_phase(kind, phase))
+        status, column, days_setting, title, message = REMINDER_KINDS[kind]
+        query = _FIRST_BATCH_QUERY if phase == "first" else _REPEAT_BATCH_QUERY
+
+        while True:
+            result = postgres_db.execute_query(query.format(column=column, notified=_NOTIFIED_CTE), {
+                "status": status,
+                "cutoff": state["cutoff"],
+                "repeat_days": settings.REMINDER_REPEAT_DAYS,
+                "after_ts": state["after_ts"],
+                "after_id": state["after_id"],
+                "after_employee_id": state["after_employee_id"],
+                "after_course_id": state["after_course_id"],
+                "batch_size": REMINDER_BATCH_SIZE,
+                "kind": kind,
+                "title": title,
+                "message": message,
+            }, fetch=True)[0]
+
+            state["scanned"] += result["scanned"]
+            state["sent"] += result["sent"]
+            if result["last_ts"] is None:
+                break
+            state["after_ts"] = result["last_ts"].isoformat()
+            state["after_id"] = result["last_id"] or 0
+            state["after_employee_id"] = result["last_employee_id"] or ""
+            state["after_course_id"] = result["last_course_id"] or ""
+            if context:
+                context.checkpoint(state, progress={"kind": kind, "scanned": state["scanned"], "sent": state["sent"]})
+            if result["scanned"] < REMINDER_BATCH_SIZE:
+                break
+
+        if phase == "first":
+            postgres_db.execute_query("""
+                INSERT INTO report_refresh_state (report_name, watermark, refreshed_at)
+                VALUES (%s, %s, CURRENT_TIMESTAMP)
+                ON CONFLICT (report_name) DO UPDATE
+                SET watermark = EXCLUDED.watermark,
+                    refreshed_at = EXCLUDED.refreshed_at
+            """, (_watermark_name(kind), state["cutoff"]))
+
+    logger.info(f"Reminders: {state['sent']} sent after scanning {state['scanned']} rows")
+    return {"scanned": state["scanned"], "sent": state["sent"]}
+
+
+@job_handler("course_reminders")
+def _run_course_reminders_job(context: JobContext) -> dict:
+    return send_reminders(context)
@@ -0,0 +1,264 @@
+"""
+Report Cache
+Stale-while-revalidate cache for admin reports, shared across workers through Redis when configured
+"""
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+import hashlib
+import json
+import threading
+import time
+import logging
+
+import redis
+from fastapi.encoders import jsonable_encoder
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "lms:report"
+METRICS = ("hits", "stale_hits", "misses", "refreshes", "refresh_errors")
+# How often a cold miss waiting on another caller's computation checks for its entry
+MISS_POLL_SECONDS = 0.05
+
+
+class _MemoryBackend:
+    """
+    Per-process cache storage used when no Redis URL is configured. Keys include
+    arbitrary report parameters, so it keeps at most REPORT_CACHE_MAX_ENTRIES,
+    evicting the least recently used.
+    """
+
+    def __init__(self):
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._locks: Dict[str, float] = {}
+        self._metrics: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            entry, expires_at = item
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: dict, expire_seconds: int):
+        with self._lock:
+            self._entries[key] = (entry, time.time() + expire_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > settings.REPORT_CACHE_MAX_ENTRIES:
+                self._entries.popitem(last=False)
+
+    def try_lock(self, key: str, expire_seconds: int) -> bool:
+        now = time.time()
+        with self._lock:
+            if self._locks.get(key, 0) > now:
+                return False
+            self._locks[key] = now + expire_seconds
+            return True
+
+    def unlock(self, key: str):
+        with self._lock:
+            self._locks.pop(key, None)
+
+    def incr(self, report_type: str, metric: str):
+        with self._lock:
+            counters = self._metrics.setdefault(report_type, dict.fromkeys(METRICS, 0))
+            counters[metric] += 1
+
+    def metrics(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {report_type: dict(counters) for report_type, counters in self._metrics.items()}
+
+
+class _RedisBackend:
+    """Cache storage in Redis, shared by all workers"""
+
+    def __init__(self, client: redis.Redis):
+        self.client = client
+
+    def get(self, key: str) -> Optional[dict]:
+        raw = self.client.get(key)
+        return json.loads(raw) if raw else None
+
+    def set(self, key: str, entry: dict, expire_seconds: int):
+        self.client.set(key, json.dumps(entry), ex=expire_seconds)
+
+    def try_lock(self, key: str, expire_seconds: int) -> bool:
+        return bool(self.client.set(f"{key}:refresh", 1, nx=True, ex=expire_seconds))
+
+    def unlock(self, key: str):
+        self.client.delete(f"{key}:refresh")
+
+    def incr(self, report_type: str, metric: str):
+        self.client.hincrby(f"{KEY_PREFIX}:metrics:{report_type}", metric, 1)
+
+    def metrics(self) -> Dict[str, Dict[str, int]]:
+        result = {}
+        for key in self.client.scan_iter(f"{KEY_PREFIX}:metrics:*"):
+            report_type = key.decode().rsplit(":", 1)[-1]
+            counters = dict.fromkeys(METRICS, 0)
+            counters.update({field.decode(): int(value) for field, value in self.client.hgetall(key).items()})
+            result[report_type] = counters
+        return result
+
+
+class ReportCache:
+    """
+    Serves fresh entries for REPORT_CACHE_TTL_SECONDS, then stale entries for up to
+    REPORT_CACHE_STALE_SECONDS more while one background refresh recomputes them
+    """
+
+    def __init__(self):
+        self.backend = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _build_backend(self):
+        """Connect on first use so Redis is only contacted when configured"""
+        if settings.REPORT_CACHE_REDIS_URL:
+            try:
+                client = redis.Redis.from_url(settings.REPORT_CACHE_REDIS_URL)
+                client.ping()
+                self.backend = _RedisBackend(client)
+                return
+            except Exception as e:
+                logger.error(f"Report cache Redis unavailable, using in-process cache: {e}")
+        self.backend = _MemoryBackend()
+
+    def _get_backend(self):
+        if self.backend is None:
+            with self._lock:
+                if self.backend is None:
+                    self._build_backend()
+                    self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="report-cache")
+        return self.backend
+
+    @staticmethod
+    def make_key(report_type: str, params: Dict[str, Any]) -> str:
+        digest = hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+        return f"{KEY_PREFIX}:{report_type}:{digest}"
+
+    def get_or_compute(self, report_type: str, params: Dict[str, Any], loader: Callable[[], Any]) -> Any:
+        """
+        Return the cached report for `params`, calling `loader` on a miss.
+        A None result is returned but not cached.
+        """
+        if settings.REPORT_CACHE_TTL_SECONDS <= 0:
+            return loader()
+
+        backend = self._get_backend()
+        key = self.make_key(report_type, params)
+
+        try:
+            entry = backend.get(key)
+        except redis.RedisError as e:
+            # Fail open: the cache is an optimization, not a dependency
+            logger.error(f"Report cache read failed: {e}")
+            return loader()
+
+        if entry is not None:
+            age = time.time() - entry["computed_at"]
+            if age < settings.REPORT_CACHE_TTL_SECONDS:
+                self._count(report_type, "hits")
+            else:
+                self._count(report_type, "stale_hits")
+                self._schedule_refresh(report_type, key, loader)
+            return entry["value"]
+
+        self._count(report_type, "misses")
+        return self._compute_once(report_type, key, loader)
+
+    def _compute_once(self, report_type: str, key: str, loader: Callable[[], Any]) -> Any:
+        """
+        Compute a missing entry under the same per-key guard as the background refresh,
+        so concurrent misses run the loader once; the others wait for its entry.
+        """
+        lock_seconds = max(settings.REPORT_CACHE_TTL_SECONDS, 30)
+        try:
+            while True:
+                if self.backend.try_lock(key, lock_seconds):
+                    try:
+                        # Another caller may have stored the entry while we waited
+                        entry = self.backend.get(key)
+                        if entry is not None:
+                            return entry["value"]
+                        return self._compute(report_type, key, loader)
+                    finally:
+                        self._unlock(key)
+                time.sleep(MISS_POLL_SECONDS)
+                entry = self.backend.get(key)
+                if entry is not None:
+                    return entry["value"]
+        except redis.RedisError as e:
+            logger.error(f"Report cache lock failed: {e}")
+            return loader()
+
+    def _compute(self, report_type: str, key: str, loader: Callable[[], Any]) -> Any:
+        value = jsonable_encoder(loader())
+        if value is not None:
+            try:
+                self.backend.set(
+                    key,
+                    {"value": value, "computed_at": time.time()},
+                    settings.REPORT_CACHE_TTL_SECONDS + settings.REPORT_CACHE_STALE_SECONDS
+                )
+            except redis.RedisError as e:
+                logger.error(f"Report cache write failed: {e}")
+        return value
+
+    def _schedule_refresh(self, report_type: str, key: str, loader: Callable[[], Any]):
+        """Start a background refresh unless one is already running for this key"""
+        try:
+            if not self.backend.try_lock(key, max(settings.REPORT_CACHE_TTL_SECONDS, 30)):
+                return
+        except redis.RedisError as e:
+            logger.error(f"Report cache lock failed: {e}")
+            return
+        self._executor.submit(self._refresh, report_type, key, loader)
+
+    def _refresh(self, report_type: str, key: str, loader: Callable[[], Any]):
+        try:
+            self._compute(report_type, key, loader)
+            self._count(report_type, "refreshes")
+        except Exception as e:
+            logger.error(f"Report cache refresh failed for {report_type}: {e}")
+            self._count(report_type, "refresh_errors")
+        finally:
+            self._unlock(key)
+
+    def _unlock(self, key: str):
+        try:
+            self.backend.unlock(key)
+        except redis.RedisError:
+            pass
+
+    def _count(self, report_type: str, metric: str):
+        try:
+            self.backend.incr(report_type, metric)
+        except redis.RedisError as e:
+            logger.error(f"Report cache metrics update failed: {e}")
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Counters per report type, with hit ratio (stale hits count as hits)"""
+        metrics = self._get_backend().metrics()
+        for counters in metrics.values():
+            served = counters["hits"] + counters["stale_hits"]
+            total = served + counters["misses"]
+            counters["hit_ratio"] = round(served / total, 4) if total else None
+        return metrics
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Global report cache instance
+report_cache = ReportCache()
@@ -0,0 +1,173 @@
+"""
+Report Rollups
+Department x course aggregates refreshed incrementally, grouped by track, subtrack or course on read
+"""
+from typing import List, Optional
+import logging
+
+from backend.database import get_postgres_db
+from backend.services.jobs import JobContext, job_handler
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_NAME = "department_course"
+
+# Rows committed slightly before the previous watermark may become visible after it,
+# so each refresh re-reads a small overlap window (recomputing a course is idempotent)
+WATERMARK_OVERLAP = "5 minutes"
+
+_RECOMPUTE_QUERY = """
+INSERT INTO report_rollup_department_course
+    (department, course_id, total_assigned, completed, in_progress, failed,
+     total_time_minutes, timed_count, passed_score_sum, passed_attempts)
+SELECT COALESCE(e.department, ''),
+       p.course_id,
+       COUNT(*),
+       COUNT(*) FILTER (WHERE p.status = 'completed'),
+       COUNT(*) FILTER (WHERE p.status = 'in_progress'),
+       COUNT(*) FILTER (WHERE p.status = 'failed'),
+       COALESCE(SUM(p.time_taken_minutes), 0),
+       COUNT(p.time_taken_minutes),
+       COALESCE(SUM(q.passed_score_sum), 0),
+       COALESCE(SUM(q.passed_attempts), 0)
+FROM employee_course_progress p
+JOIN employees e ON e.employee_id = p.employee_id
+LEFT JOIN quiz_attempt_summary q ON q.employee_id = p.employee_id AND q.course_id = p.course_id
+{where}
+GROUP BY 1, 2
+"""
+
+_GROUP_COLUMNS = {
+    "course": ("r.course_id", "c.course_name"),
+    "subtrack": ("c.subtrack_id", "st.subtrack_name"),
+    "track": ("c.track_id", "t.track_name"),
+}
+
+
+def refresh_rollups(full: bool = False) -> dict:
+    """
+    Recompute rollup rows for courses whose progress, quiz attempts or employees
+    changed since the last refresh (or everything when `full` or on first run).
+    Deletes are picked up from report_rollup_dirty_courses, filled by a trigger.
+    """
+    postgres_db = get_postgres_db()
+
+    with postgres_db.get_cursor() as cursor:
+        # Row lock serializes concurrent refreshes
+        cursor.execute(
+            "SELECT watermark FROM report_refresh_state WHERE report_name = %s FOR UPDATE",
+            (ROLLUP_NAME,)
+        )
+        state = cursor.fetchone()
+        cursor.execute("SELECT CURRENT_TIMESTAMP AS now")
+        new_watermark = cursor.fetchone()["now"]
+
+        if full or state is None:
+            cursor.execute("TRUNCATE report_rollup_department_course")
+            cursor.execute("DELETE FROM report_rollup_dirty_courses")
+            cursor.execute(_RECOMPUTE_QUERY.format(where=""))
+            courses_refreshed = None
+        else:
+            cursor.execute(f"""
+                WITH deleted AS (
+                    DELETE FROM report_rollup_dirty_courses RETURNING course_id
+                )
+                SELECT ARRAY(
+                    SELECT course_id FROM deleted
+                    UNION
+                    SELECT course_id FROM employee_course_progress
+                    WHERE updated_at > %(since)s - INTERVAL '{WATERMARK_OVERLAP}'
+                    UNION
+                    SELECT course_id FROM quiz_attempts
+                    WHERE attempted_at > %(since)s - INTERVAL '{WATERMARK_OVERLAP}'
+                    UNION
+                    SELECT p.course_id FROM employees e
+                    JOIN employee_course_progress p ON p.employee_id = e.employee_id
+                    WHERE e.updated_at > %(since)s - INTERVAL '{WATERMARK_OVERLAP}'
+                ) AS courses
+            """, {"since": state["watermark"]})
+            dirty = cursor.fetchone()["courses"]
+            courses_refreshed = len(dirty)
+
+            if dirty:
+                cursor.execute(
+                    "DELETE FROM report_rollup_department_course WHERE course_id = ANY(%(courses)s)",
+                    {"courses": dirty}
+                )
+                cursor.execute(
+                    _RECOMPUTE_QUERY.format(where="WHERE p.course_id = ANY(%(courses)s)"),
+                    {"courses": dirty}
+                )
+
+        cursor.execute("""
+            INSERT INTO report_refresh_state (report_name, watermark, refreshed_at)
+            VALUES (%s, %s, CURRENT_TIMESTAMP)
+            ON CONFLICT (report_name) DO UPDATE
+            SET watermark = EXCLUDED.watermark,
+                refreshed_at = EXCLUDED.refreshed_at
+        """, (ROLLUP_NAME, new_watermark))
+
+    logger.info(
+        "Report rollups refreshed "
+        + ("(full)" if courses_refreshed is None else f"({courses_refreshed} courses)")
+    )
+    return {"full": courses_refreshed is None, "courses_refreshed": courses_refreshed}
+
+
+@job_handler("report_rollup_refresh")
+def _run_rollup_refresh_job(context: JobContext) -> dict:
+    return refresh_rollups(full=bool(context.params.get("full")))
+
+
+def get_rollup(
+    group_by: str,
+    department: Optional[str] = None,
+    track_id: Optional[str] = None,
+    subtrack_id: Optional[str] = None
+) -> dict:
+    """Aggregate the rollup table by department and track, subtrack or course"""
+    group_column, name_column = _GROUP_COLUMNS[group_by]
+
+    conditions = [f"{group_column} IS NOT NULL"]
+    params: List = []
+    if department is not None:
+        conditions.append("r.department = %s")
+        params.append(department)
+    if track_id:
+        conditions.append("c.track_id = %s")
+        params.append(track_id)
+    if subtrack_id:
+        conditions.append("c.subtrack_id = %s")
+        params.append(subtrack_id)
+
+    query = f"""
+    SELECT r.department,
+           {group_column} AS group_id,
+           MAX({name_column}) AS group_name,
+           SUM(r.total_assigned) AS total_assigned,
+           SUM(r.completed) AS completed,
+           SUM(r.in_progress) AS in_progress,
+           SUM(r.failed) AS failed,
+           ROUND(CAST(SUM(r.completed) AS DECIMAL) / NULLIF(SUM(r.total_assigned), 0) * 100, 2) AS completion_rate,
+           ROUND(SUM(r.passed_score_sum) / NULLIF(SUM(r.passed_attempts), 0), 2) AS avg_quiz_score,
+           ROUND(CAST(SUM(r.total_time_minutes) AS DECIMAL) / NULLIF(SUM(r.timed_count), 0), 2) AS avg_time_minutes
+    FROM report_rollup_department_course r
+    LEFT JOIN course_catalog c ON c.course_id = r.course_id
+    LEFT JOIN subtrack_catalog st ON st.subtrack_id = c.subtrack_id
+    LEFT JOIN track_catalog t ON t.track_id = c.track_id
+    WHERE {' AND '.join(conditions)}
+    GROUP BY r.department, {group_column}
+    ORDER BY r.department, {group_column}
+    """
+
+    postgres_db = get_postgres_db()
+    rows = postgres_db.execute_query(query, tuple(params), fetch=True)
+    state = postgres_db.execute_query(
+        "SELECT refreshed_at FROM report_refresh_state WHERE report_name = %s", (ROLLUP_NAME,), fetch=True
+    )
+
+    return {
+        "group_by": group_by,
+        "refreshed_at": state[0]["refreshed_at"] if state else None,
+        "rows": [dict(row) for row in rows],
+    }
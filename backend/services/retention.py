@@ -0,0 +1,190 @@
+"""
+Notification Retention
+Purges old notifications in small keyset batches, and drops whole monthly
+partitions when the notifications table is partitioned
+"""
+from datetime import datetime, timedelta
+from typing import Optional
+import logging
+
+from backend.config import settings
+from backend.database import get_postgres_db
+from backend.services.jobs import JobContext, job_handler
+from backend.services.partitions import detach_partition, ensure_partitions, is_partitioned, partitions_before
+
+logger = logging.getLogger(__name__)
+
+# Employees whose notifications are capped per statement
+CAP_EMPLOYEE_BATCH = 500
+
+# Policies run in this order; "partitions" counts monthly partitions dropped, the rest rows
+# policy -> (days setting, extra condition); a setting of 0 disables the policy
+AGE_POLICIES = {
+    "read_age": ("NOTIFICATION_READ_RETENTION_DAYS", "is_read"),
+    "max_age": ("NOTIFICATION_RETENTION_DAYS", "TRUE"),
+}
+
+# Each batch is its own short transaction: the next keyset page of expired rows
+# (served by the (created_at, notification_id) index) is deleted and its last key returned.
+_AGE_BATCH_QUERY = """
+WITH batch AS (
+    SELECT notification_id, created_at
+    FROM notifications
+    WHERE created_at < CURRENT_TIMESTAMP - make_interval(days => %(days)s)
+      AND (created_at, notification_id) > (%(after_ts)s::timestamp, %(after_id)s)
+      AND {condition}
+    ORDER BY created_at, notification_id
+    LIMIT %(batch_size)s
+),
+deleted AS (
+    DELETE FROM notifications n
+    USING batch b
+    WHERE n.notification_id = b.notification_id AND n.created_at = b.created_at
+    RETURNING 1
+)
+SELECT (SELECT COUNT(*) FROM deleted) AS deleted,
+       last.created_at AS last_ts,
+       last.notification_id AS last_id
+FROM (SELECT 1) one
+LEFT JOIN (
+    SELECT created_at, notification_id FROM batch ORDER BY created_at DESC, notification_id DESC LIMIT 1
+) last ON TRUE
+"""
+
+# Rows past each employee's newest `cap`, read from the (employee_id, created_at DESC) index
+_CAP_BATCH_QUERY = """
+WITH employee_batch AS (
+    SELECT employee_id FROM employees
+    WHERE employee_id > %(after_id)s
+    ORDER BY employee_id
+    LIMIT %(employees)s
+),
+excess AS (
+    SELECT x.notification_id, x.created_at
+    FROM employee_batch e
+    CROSS JOIN LATERAL (
+        SELECT n.notification_id, n.created_at
+        FROM notifications n
+        WHERE n.employee_id = e.employee_id
+        ORDER BY n.created_at DESC, n.notification_id DESC
+        OFFSET %(cap)s
+    ) x
+    LIMIT %(batch_size)s
+),
+deleted AS (
+    DELETE FROM notifications n
+    USING excess x
+    WHERE n.notification_id = x.notification_id AND n.created_at = x.created_at
+    RETURNING 1
+)
+SELECT (SELECT COUNT(*) FROM deleted) AS deleted,
+       (SELECT MAX(employee_id) FROM employee_batch) AS last_id
+"""
+
+
+def _uncount_unread(cursor, partition: str):
+    """
+    Take a detached partition's unread rows out of the counters before it is dropped.
+    Once detached, no update through the parent can mark its rows read (and fire the
+    counter trigger) between this count and the drop.
+    """
+    cursor.execute(f"""
+        UPDATE notification_counters c
+        SET unread_count = c.unread_count - d.unread,
+            updated_at = CURRENT_TIMESTAMP
+        FROM (
+            SELECT employee_id, COUNT(*) AS unread
+            FROM "{partition}"
+            WHERE NOT is_read
+            GROUP BY employee_id
+        ) d
+        WHERE c.employee_id = d.employee_id
+    """)
+
+
+def _drop_expired_partitions() -> int:
+    """Drop monthly partitions entirely older than NOTIFICATION_RETENTION_DAYS"""
+    ensure_partitions("notifications")
+    if not settings.NOTIFICATION_RETENTION_DAYS:
+        return 0
+
+    cutoff = datetime.now() - timedelta(days=settings.NOTIFICATION_RETENTION_DAYS)
+    partitions = partitions_before("notifications", cutoff)
+    for partition in partitions:
+        detach_partition("notifications", partition, after_detach=_uncount_unread)
+    return len(partitions)
+
+
+def purge_notifications(context: Optional[JobContext] = None) -> dict:
+    """
+    Apply the retention policies: delete read notifications older than
+    NOTIFICATION_READ_RETENTION_DAYS, any notification older than
+    NOTIFICATION_RETENTION_DAYS, and all but each employee's newest
+    NOTIFICATION_MAX_PER_EMPLOYEE. Deletes run NOTIFICATION_PURGE_BATCH_SIZE rows
+    at a time so locks stay short.
+    """
+    postgres_db = get_postgres_db()
+    batch_size = settings.NOTIFICATION_PURGE_BATCH_SIZE
+    state = {"policy": "partitions", "after_ts": "-infinity", "after_id": 0, "deleted": {}}
+    if context:
+        state.update(context.state)
+
+    policies = ["partitions", *AGE_POLICIES, "per_employee_cap"]
+    for policy in policies[policies.index(state["policy"]):]:
+        if policy != state["policy"]:
+            state.update(policy=policy, after_ts="-infinity", after_id=0)
+        deleted = state["deleted"].get(policy, 0)
+
+        if policy == "partitions":
+            if is_partitioned("notifications"):
+                deleted += _drop_expired_partitions()
+
+        elif policy in AGE_POLICIES:
+            days_setting, condition = AGE_POLICIES[policy]
+            days = getattr(settings, days_setting)
+            while days:
+                result = postgres_db.execute_query(_AGE_BATCH_QUERY.format(condition=condition), {
+                    "days": days,
+                    "after_ts": state["after_ts"],
+                    "after_id": state["after_id"],
+                    "batch_size": batch_size,
+                }, fetch=True)[0]
+                deleted += result["deleted"]
+                if result["last_id"] is None:
+                    break
+                state["after_ts"] = result["last_ts"].isoformat()
+                state["after_id"] = result["last_id"]
+                state["deleted"][policy] = deleted
+                if context:
+                    context.checkpoint(state, progress={"policy": policy, "deleted": state["deleted"]})
+                if result["deleted"] < batch_size:
+                    break
+
+        elif settings.NOTIFICATION_MAX_PER_EMPLOYEE:
+            state["after_id"] = state["after_id"] or ""
+            while True:
+                result = postgres_db.execute_query(_CAP_BATCH_QUERY, {
+                    "after_id": state["after_id"],
+                    "employees": CAP_EMPLOYEE_BATCH,
+                    "cap": settings.NOTIFICATION_MAX_PER_EMPLOYEE,
+                    "batch_size": batch_size,
+                }, fetch=True)[0]
+                deleted += result["deleted"]
+                if result["last_id"] is None:
+                    break
+                # A full batch may have left excess rows in this employee range; repeat it
+                if result["deleted"] < batch_size:
+                    state["after_id"] = result["last_id"]
+                state["deleted"][policy] = deleted
+                if context:
+                    context.checkpoint(state, progress={"policy": policy, "deleted": state["deleted"]})
+
+        state["deleted"][policy] = deleted
+
+    logger.info(f"Notification retention: {state['deleted']}")
+    return {"deleted": state["deleted"]}
+
+
+@job_handler("notification_retention")
+def _run_notification_retention_job(context: JobContext) -> dict:
+    return purge_notifications(context)
@@ -4,6 +4,8 @@ JWT token generation, password hashing, and user verification
 """
 from datetime import datetime, timedelta
 from typing import Optional
+import hashlib
+import secrets
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
@@ -46,6 +48,91 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+def _hash_refresh_token(token: str) -> str:
+    """Hash an opaque refresh token for storage and lookup"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _insert_refresh_token(cursor, employee_id: str, family_id: str) -> str:
+    """Insert a new refresh token row using an open cursor and return the raw token"""
+    token = secrets.token_urlsafe(48)
+    expires_at = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    cursor.execute(
+        """
+        INSERT INTO refresh_tokens (token_hash, employee_id, family_id, expires_at)
+        VALUES (%s, %s, %s, %s)
+        """,
+        (_hash_refresh_token(token), employee_id, family_id, expires_at)
+    )
+    return token
+
+
+def create_refresh_token(employee_id: str) -> str:
+    """Create a long-lived refresh token starting a new rotation chain"""
+    db = get_postgres_db()
+    with db.get_cursor() as cursor:
+        return _insert_refresh_token(cursor, employee_id, secrets.token_hex(16))
+
+
+def rotate_refresh_token(token: str) -> Optional[dict]:
+    """
+    Exchange a refresh token for a new one (single use).
+    Returns employee_id, role and the replacement refresh token, or None if the
+    token is unknown, expired or already used. Presenting an already-used token
+    revokes its whole chain, since it means the token was copied.
+    """
+    db = get_postgres_db()
+    token_hash = _hash_refresh_token(token)
+
+    with db.get_cursor() as cursor:
+        cursor.execute(
+            """
+            UPDATE refresh_tokens rt
+            SET revoked_at = CURRENT_TIMESTAMP
+            FROM employees e
+            WHERE rt.token_hash = %s
+              AND rt.revoked_at IS NULL
+              AND rt.expires_at > CURRENT_TIMESTAMP
+              AND e.employee_id = rt.employee_id
+            RETURNING rt.employee_id, rt.family_id, e.role
+            """,
+            (token_hash,)
+        )
+        row = cursor.fetchone()
+
+        if not row:
+            cursor.execute(
+                """
+                UPDATE refresh_tokens
+                SET revoked_at = CURRENT_TIMESTAMP
+                WHERE revoked_at IS NULL
+                  AND family_id = (
+                      SELECT family_id FROM refresh_tokens
+                      WHERE token_hash = %s AND revoked_at IS NOT NULL
+                  )
+                """,
+                (token_hash,)
+            )
+            if cursor.rowcount:
+                logger.warning("Refresh token reuse detected, token family revoked")
+            return None
+
+        new_token = _insert_refresh_token(cursor, row["employee_id"], row["family_id"])
+
+    return {"employee_id": row["employee_id"], "role": row["role"], "refresh_token": new_token}
+
+
+def revoke_refresh_tokens(employee_id: str) -> int:
+    """Revoke every active refresh token of an employee"""
+    db = get_postgres_db()
+    query = """
+        UPDATE refresh_tokens
+        SET revoked_at = CURRENT_TIMESTAMP
+        WHERE employee_id = %s AND revoked_at IS NULL
+    """
+    return db.execute_query(query, (employee_id,))
+
+
 def verify_token(token: str, credentials_exception: HTTPException) -> TokenData:
     """Verify JWT token and extract payload"""
     try:
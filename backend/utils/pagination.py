@@ -0,0 +1,46 @@
+"""
+Keyset Pagination Utilities
+Opaque cursors encoding the sort key of the last row of a page
+"""
+from datetime import datetime
+from typing import Any, List, Tuple
+import base64
+import json
+
+from fastapi import HTTPException, status
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode sort key values into an opaque URL-safe cursor"""
+    payload = json.dumps(list(values), default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """Decode a cursor produced by encode_cursor, expecting `size` values"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        values = None
+
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return values
+
+
+def decode_timestamp_cursor(cursor: str) -> Tuple[datetime, Any]:
+    """Decode a (timestamp, id) cursor, rejecting a malformed timestamp with 400"""
+    timestamp, row_id = decode_cursor(cursor, 2)
+    try:
+        return datetime.fromisoformat(timestamp), row_id
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards so user input matches literally"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
@@ -0,0 +1,84 @@
+"""
+HTTP Range Responses
+Serve files with single-range `Range: bytes=...` support so large downloads can resume
+"""
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+import re
+
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+
+CHUNK_SIZE = 64 * 1024
+
+_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range(header: str, size: int) -> Tuple[int, int]:
+    """
+    Parse a single byte range into inclusive (start, end) offsets.
+    Raises HTTPException 416 when the range cannot be satisfied.
+    """
+    match = _RANGE_PATTERN.match(header.strip())
+    start, end = (match.groups() if match else ("", ""))
+    if not start and not end:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Invalid range",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+
+    if not start:
+        # Suffix range: the last N bytes
+        first, last = max(size - int(end), 0), size - 1
+    else:
+        first = int(start)
+        last = min(int(end), size - 1) if end else size - 1
+
+    if first >= size or first > last:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    return first, last
+
+
+def _iter_file(path: Path, start: int, length: int) -> Iterator[bytes]:
+    with open(path, "rb") as file:
+        file.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = file.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def range_file_response(
+    path: Path,
+    range_header: Optional[str],
+    media_type: str,
+    filename: str
+) -> StreamingResponse:
+    """Stream a whole file (200) or the requested byte range (206)"""
+    size = path.stat().st_size
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f'attachment; filename="{filename}"',
+    }
+
+    if range_header:
+        start, end = parse_range(range_header, size)
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+    else:
+        start, end = 0, size - 1
+        status_code = status.HTTP_200_OK
+
+    length = end - start + 1
+    headers["Content-Length"] = str(length)
+    return StreamingResponse(
+        _iter_file(path, start, length), status_code=status_code, media_type=media_type, headers=headers
+    )
@@ -0,0 +1,242 @@
+"""
+Login Rate Limiting and Password Hash Admission Control
+Token buckets per email / client IP and a global cap on concurrent bcrypt operations
+"""
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+import ipaddress
+import math
+import threading
+import time
+import logging
+
+import redis
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request must be rejected without doing the expensive work"""
+
+    def __init__(self, retry_after: int = 1):
+        super().__init__(f"Rate limit exceeded, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class TokenBucketLimiter:
+    """In-process token bucket limiter keyed by arbitrary strings"""
+
+    def __init__(self, capacity: int, refill_per_minute: float, max_keys: int = 100_000):
+        self.capacity = capacity
+        self.rate = refill_per_minute / 60.0
+        self.max_keys = max_keys
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str) -> Tuple[bool, int]:
+        """Take one token for key. Returns (allowed, retry_after_seconds)"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                return False, math.ceil((1 - tokens) / self.rate)
+
+            self._buckets[key] = (tokens - 1, now)
+            if len(self._buckets) > self.max_keys:
+                self._prune(now)
+            return True, 0
+
+    def _prune(self, now: float):
+        """Drop buckets that have refilled completely (equivalent to absent)"""
+        full = [
+            key for key, (tokens, updated) in self._buckets.items()
+            if tokens + (now - updated) * self.rate >= self.capacity
+        ]
+        for key in full:
+            del self._buckets[key]
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class RedisTokenBucketLimiter:
+    """Token bucket limiter with state in Redis, shared by all workers"""
+
+    # Refill and take one token atomically; returns {allowed, retry_after}
+    _SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local tokens = tonumber(state[1]) or capacity
+    local updated = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+    local allowed = 0
+    local retry_after = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    else
+        retry_after = math.ceil((1 - tokens) / rate)
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+    return {allowed, retry_after}
+    """
+
+    def __init__(self, client: redis.Redis, prefix: str, capacity: int, refill_per_minute: float):
+        self.client = client
+        self.prefix = prefix
+        self.capacity = capacity
+        self.rate = refill_per_minute / 60.0
+        self._script = client.register_script(self._SCRIPT)
+
+    def acquire(self, key: str) -> Tuple[bool, int]:
+        """Take one token for key. Returns (allowed, retry_after_seconds)"""
+        allowed, retry_after = self._script(
+            keys=[f"{self.prefix}:{key}"],
+            args=[self.capacity, self.rate, time.time()]
+        )
+        return bool(allowed), int(retry_after)
+
+    def clear(self):
+        for key in self.client.scan_iter(f"{self.prefix}:*"):
+            self.client.delete(key)
+
+
+class HashAdmission:
+    """Global cap on concurrent password hash operations in this process"""
+
+    def __init__(self, max_concurrent: int):
+        self._semaphore = threading.BoundedSemaphore(max_concurrent)
+
+    @contextmanager
+    def slot(self):
+        """Hold a hashing slot, or raise RateLimitExceeded if none is free"""
+        if not self._semaphore.acquire(blocking=False):
+            raise RateLimitExceeded(retry_after=1)
+        try:
+            yield
+        finally:
+            self._semaphore.release()
+
+
+class LoginThrottle:
+    """Per-email and per-IP login throttling in front of password verification"""
+
+    def __init__(self):
+        self.email_limiter = None
+        self.ip_limiter = None
+        self.admission = HashAdmission(settings.LOGIN_MAX_CONCURRENT_HASHES)
+        self._lock = threading.Lock()
+
+    def _build_limiters(self):
+        """Create limiters on first use so Redis is only contacted when configured"""
+        client: Optional[redis.Redis] = None
+        if settings.RATE_LIMIT_REDIS_URL:
+            try:
+                client = redis.Redis.from_url(settings.RATE_LIMIT_REDIS_URL)
+                client.ping()
+            except Exception as e:
+                logger.error(f"Rate limit Redis unavailable, using in-process counters: {e}")
+                client = None
+
+        if client is not None:
+            self.email_limiter = RedisTokenBucketLimiter(
+                client, "login:email", settings.LOGIN_RATE_PER_EMAIL, settings.LOGIN_RATE_PER_EMAIL
+            )
+            self.ip_limiter = RedisTokenBucketLimiter(
+                client, "login:ip", settings.LOGIN_RATE_PER_IP, settings.LOGIN_RATE_PER_IP
+            )
+        else:
+            self.email_limiter = TokenBucketLimiter(settings.LOGIN_RATE_PER_EMAIL, settings.LOGIN_RATE_PER_EMAIL)
+            self.ip_limiter = TokenBucketLimiter(settings.LOGIN_RATE_PER_IP, settings.LOGIN_RATE_PER_IP)
+
+    def check(self, email: str, client_ip: Optional[str]):
+        """Consume one attempt for email and IP, raising RateLimitExceeded when exhausted"""
+        if self.email_limiter is None:
+            with self._lock:
+                if self.email_limiter is None:
+                    self._build_limiters()
+
+        checks = [(self.email_limiter, email.strip().lower())]
+        if client_ip:
+            checks.append((self.ip_limiter, client_ip))
+
+        for limiter, key in checks:
+            try:
+                allowed, retry_after = limiter.acquire(key)
+            except redis.RedisError as e:
+                # Fail open on the shared counters; the hash admission cap still applies
+                logger.error(f"Rate limit check failed: {e}")
+                continue
+            if not allowed:
+                raise RateLimitExceeded(retry_after=max(retry_after, 1))
+
+    def reset(self):
+        """Clear all counters and rebuild from the current settings (used by tests)"""
+        with self._lock:
+            for limiter in (self.email_limiter, self.ip_limiter):
+                if limiter is not None:
+                    try:
+                        limiter.clear()
+                    except redis.RedisError as e:
+                        logger.error(f"Failed to clear rate limit counters: {e}")
+            self.email_limiter = None
+            self.ip_limiter = None
+            self.admission = HashAdmission(settings.LOGIN_MAX_CONCURRENT_HASHES)
+
+
+def _parse_networks(proxies: List[str]) -> List[ipaddress._BaseNetwork]:
+    networks = []
+    for proxy in proxies:
+        try:
+            networks.append(ipaddress.ip_network(proxy, strict=False))
+        except ValueError:
+            logger.error(f"Ignoring invalid TRUSTED_PROXIES entry: {proxy}")
+    return networks
+
+
+def _is_trusted(address: str, networks: List[ipaddress._BaseNetwork]) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in networks)
+
+
+def resolve_client_ip(
+    peer: Optional[str],
+    forwarded_for: Optional[str] = None,
+    real_ip: Optional[str] = None,
+    trusted_proxies: Optional[List[str]] = None
+) -> Optional[str]:
+    """
+    The client address for rate limiting. Forwarding headers are only believed when
+    the connection comes from a trusted proxy: X-Forwarded-For is read right to left,
+    skipping trusted hops, so a client cannot spoof its address by sending the header.
+    """
+    networks = _parse_networks(settings.trusted_proxies if trusted_proxies is None else trusted_proxies)
+    if not peer or not _is_trusted(peer, networks):
+        return peer
+
+    if forwarded_for:
+        hops = [hop.strip() for hop in forwarded_for.split(",") if hop.strip()]
+        for hop in reversed(hops):
+            if not _is_trusted(hop, networks):
+                return hop
+        if hops:
+            return hops[0]
+    if real_ip and real_ip.strip():
+        return real_ip.strip()
+    return peer
+
+
+# Global login throttle instance
+login_throttle = LoginThrottle()
@@ -51,6 +51,7 @@ export const AuthProvider: React.FC<AuthProviderProps> = ({ children }) => {
   const login = async (username: string, password: string) => {
     const response = await authService.login({ username, password });
     authService.setToken(response.access_token);
+    authService.setRefreshToken(response.refresh_token);
 
     const currentUser = await authService.getCurrentUser();
     setUser(currentUser);
@@ -58,10 +59,13 @@ export const AuthProvider: React.FC<AuthProviderProps> = ({ children }) => {
   };
 
   const logout = () => {
-    authService.logout().catch(() => {
-      // Ignore errors on logout
-    });
-    authService.removeToken();
+    // Clear tokens once the server has revoked the refresh tokens
+    authService
+      .logout()
+      .catch(() => {
+        // Ignore errors on logout
+      })
+      .finally(() => authService.removeToken());
     setUser(null);
   };
 
@@ -11,8 +11,16 @@ import {
 import { Card } from '@/components/ui/Card';
 import { adminService } from '@/services/admin.service';
 
+// The dashboard shows "100+" instead of paging through the whole directory
+const EMPLOYEE_COUNT_LIMIT = 100;
+
 export const AdminDashboard: React.FC = () => {
-  const [stats, setStats] = useState({
+  const [stats, setStats] = useState<{
+    tracks: number;
+    subtracks: number;
+    courses: number;
+    employees: number | string;
+  }>({
     tracks: 0,
     subtracks: 0,
     courses: 0,
@@ -30,14 +38,14 @@ export const AdminDashboard: React.FC = () => {
         adminService.getTracks(),
         adminService.getSubTracks(),
         adminService.getCourses(),
-        adminService.getEmployees(),
+        adminService.getEmployeesPage({ limit: EMPLOYEE_COUNT_LIMIT }),
       ]);
 
       setStats({
         tracks: tracks.length,
         subtracks: subtracks.length,
         courses: courses.length,
-        employees: Array.isArray(employees) ? employees.length : 0,
+        employees: employees.next_cursor ? `${employees.items.length}+` : employees.items.length,
       });
     } catch (error) {
       console.error('Failed to load stats:', error);
@@ -1,5 +1,5 @@
 import React, { useEffect, useState } from 'react';
-import { Plus, Users, UserPlus } from 'lucide-react';
+import { Plus, Users, UserPlus, Search } from 'lucide-react';
 import { Card } from '@/components/ui/Card';
 import { Button } from '@/components/ui/Button';
 import { Input } from '@/components/ui/Input';
@@ -7,8 +7,13 @@ import { Modal } from '@/components/ui/Modal';
 import { adminService } from '@/services/admin.service';
 import { User, Track, Course } from '@/types';
 
+const PAGE_SIZE = 50;
+
 export const EmployeesPage: React.FC = () => {
   const [employees, setEmployees] = useState<User[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [search, setSearch] = useState('');
   const [tracks, setTracks] = useState<Track[]>([]);
   const [courses, setCourses] = useState<Course[]>([]);
   const [loading, setLoading] = useState(true);
@@ -30,12 +35,14 @@ export const EmployeesPage: React.FC = () => {
 
   const loadData = async () => {
     try {
-      const [employeesData, tracksData, coursesData] = await Promise.all([
-        adminService.getEmployees(),
+      const [employeesPage, tracksData, coursesData] = await Promise.all([
+        adminService.getEmployeesPage({ limit: PAGE_SIZE }),
         adminService.getTracks(),
         adminService.getCourses(),
       ]);
-      setEmployees(Array.isArray(employeesData) ? employeesData : []);
+      setEmployees(employeesPage.items);
+      setNextCursor(employeesPage.next_cursor);
+      setSearch('');
       setTracks(tracksData);
       setCourses(coursesData);
     } catch (error) {
@@ -45,6 +52,41 @@ export const EmployeesPage: React.FC = () => {
     }
   };
 
+  // Fetch one page; without a cursor the list restarts for the current search
+  const loadEmployees = async (cursor?: string) => {
+    const page = await adminService.getEmployeesPage({
+      q: search.trim() || undefined,
+      cursor,
+      limit: PAGE_SIZE,
+    });
+    setEmployees(cursor ? [...employees, ...page.items] : page.items);
+    setNextCursor(page.next_cursor);
+  };
+
+  const handleSearch = async (e: React.FormEvent) => {
+    e.preventDefault();
+    setLoading(true);
+    try {
+      await loadEmployees();
+    } catch (error) {
+      console.error('Failed to search employees:', error);
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  const handleLoadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      await loadEmployees(nextCursor);
+    } catch (error) {
+      console.error('Failed to load more employees:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleSubmit = async (e: React.FormEvent) => {
     e.preventDefault();
     setSaving(true);
@@ -102,6 +144,21 @@ export const EmployeesPage: React.FC = () => {
         </Button>
       </div>
 
+      <form onSubmit={handleSearch} className="flex items-end space-x-3 mb-6">
+        <div className="flex-1">
+          <Input
+            label="Search"
+            value={search}
+            onChange={(e) => setSearch(e.target.value)}
+            placeholder="Name or email prefix"
+          />
+        </div>
+        <Button type="submit" variant="secondary">
+          <Search size={16} className="mr-2" />
+          Search
+        </Button>
+      </form>
+
       {loading ? (
         <div className="text-center py-12">
           <div className="inline-block animate-spin rounded-full h-8 w-8 border-b-2 border-primary-600"></div>
@@ -158,6 +215,14 @@ export const EmployeesPage: React.FC = () => {
         </div>
       )}
 
+      {!loading && nextCursor && (
+        <div className="mt-6 text-center">
+          <Button variant="secondary" onClick={handleLoadMore} loading={loadingMore}>
+            Load more
+          </Button>
+        </div>
+      )}
+
       {/* Create Employee Modal */}
       <Modal
         isOpen={isModalOpen}
@@ -13,8 +13,16 @@ import {
   CreateEmployeeRequest,
   AssignTrackRequest,
   AssignCourseRequest,
+  User,
+  CursorPage,
 } from '@/types';
 
+export interface EmployeeFilters {
+  role?: string;
+  department?: string;
+  q?: string;
+}
+
 export const adminService = {
   // Track Management
   async createTrack(data: CreateTrackRequest) {
@@ -72,8 +80,8 @@ export const adminService = {
     return response.data;
   },
 
-  async getEmployees() {
-    const response = await apiClient.get('/api/admin/employees');
+  async getEmployeesPage(params?: EmployeeFilters & { cursor?: string; limit?: number }): Promise<CursorPage<User>> {
+    const response = await apiClient.get<CursorPage<User>>('/api/admin/employees', { params });
     return response.data;
   },
 
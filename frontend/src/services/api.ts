@@ -1,9 +1,18 @@
-import axios, { AxiosInstance, AxiosError } from 'axios';
+import axios, { AxiosInstance, AxiosError, InternalAxiosRequestConfig } from 'axios';
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 
+// A 401 from login means bad credentials, not an expired access token
+const LOGIN_PATH = '/api/auth/login';
+
+interface RetriableRequestConfig extends InternalAxiosRequestConfig {
+  _retried?: boolean;
+}
+
 class ApiClient {
   private client: AxiosInstance;
+  // Shared by every request that fails while a refresh is in flight
+  private refreshPromise: Promise<string> | null = null;
 
   constructor() {
     this.client = axios.create({
@@ -27,21 +36,54 @@ class ApiClient {
       }
     );
 
-    // Response interceptor to handle errors
+    // Response interceptor: on 401 refresh the access token once and retry
     this.client.interceptors.response.use(
       (response) => response,
-      (error: AxiosError) => {
-        if (error.response?.status === 401) {
-          // Unauthorized - clear token and redirect to login
-          localStorage.removeItem('access_token');
-          localStorage.removeItem('user');
-          window.location.href = '/login';
+      async (error: AxiosError) => {
+        const request = error.config as RetriableRequestConfig | undefined;
+        if (error.response?.status !== 401 || !request) {
+          return Promise.reject(error);
+        }
+
+        if (request.url !== LOGIN_PATH && !request._retried && localStorage.getItem('refresh_token')) {
+          request._retried = true;
+          try {
+            const token = await this.refreshAccessToken();
+            request.headers.Authorization = `Bearer ${token}`;
+            return this.client(request);
+          } catch {
+            // Refresh token expired or revoked - fall through to login
+          }
         }
+
+        // Unauthorized - clear tokens and redirect to login
+        localStorage.removeItem('access_token');
+        localStorage.removeItem('refresh_token');
+        localStorage.removeItem('user');
+        window.location.href = '/login';
         return Promise.reject(error);
       }
     );
   }
 
+  private refreshAccessToken(): Promise<string> {
+    if (!this.refreshPromise) {
+      this.refreshPromise = axios
+        .post(`${API_BASE_URL}/api/auth/refresh`, {
+          refresh_token: localStorage.getItem('refresh_token'),
+        })
+        .then((response) => {
+          localStorage.setItem('access_token', response.data.access_token);
+          localStorage.setItem('refresh_token', response.data.refresh_token);
+          return response.data.access_token as string;
+        })
+        .finally(() => {
+          this.refreshPromise = null;
+        });
+    }
+    return this.refreshPromise;
+  }
+
   getClient(): AxiosInstance {
     return this.client;
   }
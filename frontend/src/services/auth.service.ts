@@ -33,8 +33,13 @@ export const authService = {
     return localStorage.getItem('access_token');
   },
 
+  setRefreshToken(token: string): void {
+    localStorage.setItem('refresh_token', token);
+  },
+
   removeToken(): void {
     localStorage.removeItem('access_token');
+    localStorage.removeItem('refresh_token');
     localStorage.removeItem('user');
   },
 
@@ -7,6 +7,7 @@ import {
   Notification,
   EmployeeProfile,
   CourseProgress,
+  CursorPage,
 } from '@/types';
 
 export const employeeService = {
@@ -52,8 +53,21 @@ export const employeeService = {
   },
 
   // Notifications
-  async getNotifications(): Promise<Notification[]> {
-    const response = await apiClient.get<Notification[]>('/api/employee/notifications');
+  // One page, newest first; pass next_cursor back as cursor for the following page
+  async getNotifications(
+    params?: { cursor?: string; limit?: number; unread_only?: boolean }
+  ): Promise<CursorPage<Notification>> {
+    const response = await apiClient.get<CursorPage<Notification>>('/api/employee/notifications', { params });
+    return response.data;
+  },
+
+  async getUnreadNotificationCount(): Promise<number> {
+    const response = await apiClient.get('/api/employee/notifications/unread-count');
+    return response.data.unread_count;
+  },
+
+  async markNotificationsAsRead(request: { notification_ids?: number[]; up_to_cursor?: string; all?: boolean }) {
+    const response = await apiClient.post('/api/employee/notifications/read', request);
     return response.data;
   },
 
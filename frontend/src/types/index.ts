@@ -16,6 +16,7 @@ export interface LoginRequest {
 export interface LoginResponse {
   access_token: string;
   token_type: string;
+  refresh_token: string;
 }
 
 // Track Types
@@ -179,3 +180,8 @@ export interface PaginatedResponse<T> {
   page: number;
   page_size: number;
 }
+
+export interface CursorPage<T> {
+  items: T[];
+  next_cursor: string | null;
+}
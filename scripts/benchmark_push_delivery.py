@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Measure push delivery throughput against the local fake transport.
+Simulates a bulk assignment fan-out: queues notifications for existing employees,
+drains them and reports notifications/s, then removes the rows it created.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import logging
+
+from backend.config import settings
+from backend.database import get_postgres_db
+from backend.services.push import FakeTransport, drain, set_transport
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+BENCH_TITLE = "Push delivery benchmark"
+BENCH_TOKEN_PREFIX = "bench-"
+
+
+def seed(db, employees: int, per_employee: int) -> int:
+    """Give up to `employees` employees a fake device and `per_employee` pending notifications each"""
+    with db.get_cursor() as cursor:
+        cursor.execute("""
+            CREATE TEMP TABLE bench_employees ON COMMIT DROP AS
+            SELECT employee_id FROM employees ORDER BY employee_id LIMIT %s
+        """, (employees,))
+        cursor.execute("""
+            INSERT INTO device_tokens (token, employee_id, platform)
+            SELECT %s || employee_id, employee_id, 'android' FROM bench_employees
+            ON CONFLICT (token) DO NOTHING
+        """, (BENCH_TOKEN_PREFIX,))
+        cursor.execute("""
+            INSERT INTO notifications (employee_id, notification_type, title, message)
+            SELECT e.employee_id, 'course_assigned', %s, 'Benchmark message ' || n
+            FROM bench_employees e
+            CROSS JOIN generate_series(1, %s) AS n
+        """, (BENCH_TITLE, per_employee))
+        return cursor.rowcount
+
+
+def cleanup(db):
+    with db.get_cursor() as cursor:
+        cursor.execute("DELETE FROM notifications WHERE title = %s", (BENCH_TITLE,))
+        cursor.execute("DELETE FROM device_tokens WHERE token LIKE %s", (BENCH_TOKEN_PREFIX + "%",))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--employees", type=int, default=1000)
+    parser.add_argument("--per-employee", type=int, default=3, help="notifications per employee (digest size)")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="simulated transport latency per send")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=settings.PUSH_CONCURRENCY)
+    parser.add_argument("--batch-size", type=int, default=settings.PUSH_BATCH_SIZE)
+    args = parser.parse_args()
+
+    settings.PUSH_CONCURRENCY = args.concurrency
+    settings.PUSH_BATCH_SIZE = args.batch_size
+
+    db = get_postgres_db()
+    db.initialize_pool(minconn=1, maxconn=4)
+    pending = db.execute_query(
+        "SELECT COUNT(*) AS n FROM notifications WHERE delivery_status = 'pending'", fetch=True
+    )[0]["n"]
+    if pending:
+        # The fake transport would mark them as sent
+        logger.error(f"{pending} notifications are already pending; run against a database with none")
+        sys.exit(1)
+
+    try:
+        queued = seed(db, args.employees, args.per_employee)
+        logger.info(f"Queued {queued} notifications")
+
+        transport = FakeTransport(latency_seconds=args.latency_ms / 1000, failure_rate=args.failure_rate)
+        set_transport(transport)
+        totals = drain()
+
+        for key, value in totals.items():
+            print(f"{key:>26}: {value}")
+        print(f"{'messages_recorded':>26}: {len(transport.sent)}")
+    finally:
+        cleanup(db)
+        db.close_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Convert tables to monthly range partitions
+Usage: python scripts/partition_tables.py notifications [more tables...]
+"""
+import sys
+import os
+import logging
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.database.migrations import partition_table
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    tables = sys.argv[1:]
+    if not tables:
+        print(__doc__)
+        return 1
+
+    for table in tables:
+        try:
+            partition_table(table)
+        except Exception as e:
+            logger.error(f"Failed to partition {table}: {e}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -25,6 +25,31 @@ def event_loop():
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+def reset_login_throttle():
+    """Start every test with empty login rate limit counters."""
+    from backend.utils.rate_limit import login_throttle
+    login_throttle.reset()
+    yield
+
+
+@pytest.fixture
+def run_jobs():
+    """
+    Run queued jobs in a worker thread and return the job's status.
+    ASGITransport starts no job workers, so tests drain the queue themselves.
+    """
+    from backend.services.jobs import job_runner
+
+    async def run(client: AsyncClient, headers: Dict[str, str], job_id: int) -> Dict[str, Any]:
+        await asyncio.to_thread(job_runner.run_pending)
+        response = await client.get(f"/api/admin/jobs/{job_id}", headers=headers)
+        assert response.status_code == 200
+        return response.json()
+
+    return run
+
+
 @pytest.fixture(scope="function")
 async def test_db():
     """Create a test database connection and clean up after tests."""
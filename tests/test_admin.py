@@ -1,6 +1,7 @@
 """
 End-to-End Tests for Admin Workflows
 """
+import os
 import pytest
 from httpx import AsyncClient
 from typing import Dict, Any
@@ -397,6 +398,495 @@ class TestAdminEmployeeManagement:
         assert data["message"] == "Employee assigned to course successfully"
 
 
+@pytest.mark.admin
+@pytest.mark.e2e
+class TestAdminEmployeeDirectory:
+    """Test the paginated employee directory."""
+
+    async def _create_employees(self, client: AsyncClient, auth_headers: dict, count: int):
+        for i in range(count):
+            response = await client.post(
+                "/api/admin/employees",
+                headers=auth_headers,
+                json={
+                    "employee_id": f"DIR{i:03d}",
+                    "employee_name": f"Directory User {i}",
+                    "email": f"directory{i}@example.com",
+                    "department": "Sales" if i % 2 else "Finance",
+                    "role": "employee",
+                    "password": "SecurePass123!"
+                }
+            )
+            assert response.status_code == 200
+
+    async def test_employees_keyset_pagination(
+        self, client: AsyncClient, auth_headers: dict, test_db
+    ):
+        """Test walking the directory page by page without duplicates."""
+        await self._create_employees(client, auth_headers, 5)
+
+        seen = []
+        cursor = None
+        while True:
+            params = {"limit": 2, "q": "directory"}
+            if cursor:
+                params["cursor"] = cursor
+            response = await client.get("/api/admin/employees", headers=auth_headers, params=params)
+            assert response.status_code == 200
+            page = response.json()
+            assert len(page["items"]) <= 2
+            seen.extend(item["id"] for item in page["items"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+
+        assert sorted(seen) == [f"DIR{i:03d}" for i in range(5)]
+
+    async def test_employees_filter_by_department(
+        self, client: AsyncClient, auth_headers: dict, test_db
+    ):
+        """Test filtering the directory by department."""
+        await self._create_employees(client, auth_headers, 4)
+
+        response = await client.get(
+            "/api/admin/employees",
+            headers=auth_headers,
+            params={"department": "Sales", "q": "directory"}
+        )
+
+        assert response.status_code == 200
+        ids = {item["id"] for item in response.json()["items"]}
+        assert ids == {"DIR001", "DIR003"}
+
+    async def test_employees_invalid_cursor(self, client: AsyncClient, auth_headers: dict):
+        """Test that a malformed cursor is rejected."""
+        response = await client.get(
+            "/api/admin/employees",
+            headers=auth_headers,
+            params={"cursor": "not-a-cursor"}
+        )
+
+        assert response.status_code == 400
+
+    async def test_employees_cursor_with_bad_timestamp(self, client: AsyncClient, auth_headers: dict):
+        """Test that a well-formed cursor holding a bad timestamp is rejected, not a 500."""
+        from backend.utils.pagination import encode_cursor
+
+        response = await client.get(
+            "/api/admin/employees",
+            headers=auth_headers,
+            params={"cursor": encode_cursor("yesterday", "EMP001")}
+        )
+
+        assert response.status_code == 400
+
+
+@pytest.mark.admin
+@pytest.mark.e2e
+class TestAdminBulkAssignment:
+    """Test assigning a cohort of employees at once."""
+
+    async def test_bulk_assign_by_department(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        sample_course: dict,
+        test_db,
+        test_graph_db
+    ):
+        """Test assigning a department and re-running the same assignment."""
+        for i in range(3):
+            response = await client.post(
+                "/api/admin/employees",
+                headers=auth_headers,
+                json={
+                    "employee_id": f"BULK{i:03d}",
+                    "employee_name": f"Bulk User {i}",
+                    "email": f"bulk{i}@example.com",
+                    "department": "Cohort",
+                    "role": "employee",
+                    "password": "SecurePass123!"
+                }
+            )
+            assert response.status_code == 200
+
+        payload = {
+            "department": "Cohort",
+            "assignment_type": "course",
+            "assignment_id": sample_course["course_id"]
+        }
+        response = await client.post("/api/admin/assignments/bulk", headers=auth_headers, json=payload)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["employees_matched"] == 3
+        assert data["progress_records_created"] == 3 * data["courses"]
+        assert data["notifications_created"] == 3
+
+        # Re-running is idempotent
+        response = await client.post("/api/admin/assignments/bulk", headers=auth_headers, json=payload)
+        assert response.status_code == 200
+        assert response.json()["progress_records_created"] == 0
+        assert response.json()["notifications_created"] == 0
+
+    async def test_bulk_assign_track_expands_courses(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        sample_track: dict,
+        sample_subtrack: dict,
+        test_db,
+        test_graph_db
+    ):
+        """Test that a track assignment creates a progress row for every course under it."""
+        for i in range(3):
+            response = await client.post(
+                "/api/admin/courses",
+                headers=auth_headers,
+                json={
+                    "title": f"Track Course {i}",
+                    "description": "Course under the sample subtrack",
+                    "subtrack_id": sample_subtrack["subtrack_id"]
+                }
+            )
+            assert response.status_code == 200
+
+        for i in range(2):
+            response = await client.post(
+                "/api/admin/employees",
+                headers=auth_headers,
+                json={
+                    "employee_id": f"TRACK{i:03d}",
+                    "employee_name": f"Track User {i}",
+                    "email": f"track{i}@example.com",
+                    "department": "TrackCohort",
+                    "role": "employee",
+                    "password": "SecurePass123!"
+                }
+            )
+            assert response.status_code == 200
+
+        response = await client.post(
+            "/api/admin/assignments/bulk",
+            headers=auth_headers,
+            json={
+                "department": "TrackCohort",
+                "assignment_type": "track",
+                "assignment_id": sample_track["track_id"]
+            }
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["employees_matched"] == 2
+        assert data["courses"] == 3
+        assert data["progress_records_created"] == 6
+        assert data["notifications_created"] == 2
+
+    async def test_bulk_assign_requires_one_selector(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        """Test that employee_ids and department are mutually exclusive."""
+        response = await client.post(
+            "/api/admin/assignments/bulk",
+            headers=auth_headers,
+            json={
+                "employee_ids": ["EMP001"],
+                "department": "Cohort",
+                "assignment_type": "course",
+                "assignment_id": "C001"
+            }
+        )
+
+        assert response.status_code == 422
+
+
+@pytest.mark.admin
+@pytest.mark.e2e
+class TestAdminBackgroundJobs:
+    """Test queuing admin operations as background jobs."""
+
+    async def test_bulk_assignment_job(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        sample_course: dict,
+        test_db,
+        test_graph_db,
+        run_jobs
+    ):
+        """Test queuing a bulk assignment and running it to completion."""
+        response = await client.post(
+            "/api/admin/assignments/bulk/jobs",
+            headers=auth_headers,
+            json={
+                "employee_ids": ["EMP001"],
+                "assignment_type": "course",
+                "assignment_id": sample_course["course_id"]
+            }
+        )
+        assert response.status_code == 202
+        job = response.json()
+        assert job["status"] in ["queued", "running"]
+
+        job = await run_jobs(client, auth_headers, job["job_id"])
+
+        assert job["status"] == "succeeded"
+        assert job["result"]["employees_matched"] == 1
+
+    async def test_get_missing_job(self, client: AsyncClient, auth_headers: dict):
+        """Test polling a job that does not exist."""
+        response = await client.get("/api/admin/jobs/999999", headers=auth_headers)
+
+        assert response.status_code == 404
+
+
+@pytest.mark.admin
+@pytest.mark.e2e
+class TestAdminEmployeeImport:
+    """Test bulk employee import from CSV."""
+
+    async def test_import_reports_invalid_rows(
+        self, client: AsyncClient, auth_headers: dict, test_db
+    ):
+        """Test that valid rows are imported and invalid rows reported."""
+        csv_content = (
+            "employee_id,employee_name,email,department,role,password\n"
+            "IMP001,Import One,import1@example.com,Sales,employee,SecurePass123!\n"
+            "IMP002,Import Two,not-an-email,Sales,employee,SecurePass123!\n"
+            "IMP003,Import Three,import3@example.com,,employee,SecurePass123!\n"
+            "IMP001,Import Again,import1b@example.com,Sales,employee,SecurePass123!\n"
+        )
+
+        response = await client.post(
+            "/api/admin/employees/import",
+            headers=auth_headers,
+            files={"file": ("employees.csv", csv_content, "text/csv")}
+        )
+
+        assert response.status_code == 200
+        report = response.json()
+        assert report["total_rows"] == 4
+        assert report["imported"] == 2
+        assert report["failed"] == 2
+        assert {error["row"] for error in report["errors"]} == {3, 5}
+
+    async def test_reimport_keeps_password_and_role(
+        self, client: AsyncClient, auth_headers: dict, test_db
+    ):
+        """Test that re-importing an employee updates the profile only."""
+        header = "employee_id,employee_name,email,department,role,password\n"
+        response = await client.post(
+            "/api/admin/employees/import",
+            headers=auth_headers,
+            files={"file": ("employees.csv", header + "IMP010,Import Ten,import10@example.com,Sales,employee,FirstPass123!\n", "text/csv")}
+        )
+        assert response.json()["imported"] == 1
+
+        response = await client.post(
+            "/api/admin/employees/import",
+            headers=auth_headers,
+            files={"file": ("employees.csv", header + "IMP010,Import Renamed,import10@example.com,Finance,admin,OtherPass123!\n", "text/csv")}
+        )
+        assert response.json()["imported"] == 1
+
+        response = await client.post(
+            "/api/auth/login",
+            data={"username": "import10@example.com", "password": "FirstPass123!"}
+        )
+        assert response.status_code == 200
+
+        response = await client.get(
+            "/api/admin/employees",
+            headers=auth_headers,
+            params={"q": "import10"}
+        )
+        employee = response.json()["items"][0]
+        assert employee["full_name"] == "Import Renamed"
+        assert employee["role"] == "employee"
+
+    async def test_import_invalid_encoding_writes_nothing(
+        self, client: AsyncClient, auth_headers: dict, test_db
+    ):
+        """Test that a file with invalid UTF-8 is rejected before any row is loaded."""
+        csv_content = (
+            b"employee_id,employee_name,email,department,role,password\n"
+            b"IMP020,Import Twenty,import20@example.com,Sales,employee,SecurePass123!\n"
+            b"IMP021,Import \xff,import21@example.com,Sales,employee,SecurePass123!\n"
+        )
+        response = await client.post(
+            "/api/admin/employees/import",
+            headers=auth_headers,
+            files={"file": ("employees.csv", csv_content, "text/csv")}
+        )
+        assert response.status_code == 400
+
+        response = await client.get(
+            "/api/admin/employees",
+            headers=auth_headers,
+            params={"q": "import20"}
+        )
+        assert response.json()["items"] == []
+
+    async def test_import_missing_columns(self, client: AsyncClient, auth_headers: dict):
+        """Test that a CSV without required columns is rejected."""
+        response = await client.post(
+            "/api/admin/employees/import",
+            headers=auth_headers,
+            files={"file": ("employees.csv", "employee_id,email\nX1,x@example.com\n", "text/csv")}
+        )
+
+        assert response.status_code == 400
+
+
+@pytest.mark.admin
+@pytest.mark.e2e
+class TestAdminSearch:
+    """Test admin search across employees, courses and questions."""
+
+    async def test_search_finds_employee_by_partial_name(
+        self, client: AsyncClient, auth_headers: dict, test_db
+    ):
+        """Test fuzzy search returns a matching employee."""
+        response = await client.post(
+            "/api/admin/employees",
+            headers=auth_headers,
+            json={
+                "employee_id": "SRCH001",
+                "employee_name": "Margaret Hamilton",
+                "email": "mhamilton@example.com",
+                "role": "employee",
+                "password": "SecurePass123!"
+            }
+        )
+        assert response.status_code == 200
+
+        response = await client.get(
+            "/api/admin/search",
+            headers=auth_headers,
+            params={"q": "hamilt", "types": "employee"}
+        )
+
+        assert response.status_code == 200
+        items = response.json()["items"]
+        assert items[0]["id"] == "SRCH001"
+        assert items[0]["result_type"] == "employee"
+
+    async def test_search_requires_query(self, client: AsyncClient, auth_headers: dict):
+        """Test that an empty query is rejected."""
+        response = await client.get("/api/admin/search", headers=auth_headers, params={"q": ""})
+
+        assert response.status_code == 422
+
+
+@pytest.mark.admin
+@pytest.mark.e2e
+class TestAdminCourseReminders:
+    """Test on-demand course reminder runs."""
+
+    async def test_run_course_reminders(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        run_jobs
+    ):
+        """Test a queued reminder run completes and reports counts."""
+        response = await client.post(
+            "/api/admin/reminders/run",
+            headers=auth_headers
+        )
+        assert response.status_code == 202
+        job = response.json()
+
+        job = await run_jobs(client, auth_headers, job["job_id"])
+
+        assert job["status"] == "succeeded"
+        assert job["result"]["sent"] <= job["result"]["scanned"]
+
+
+@pytest.mark.admin
+@pytest.mark.e2e
+class TestAdminNotifications:
+    """Test push notification delivery and retention."""
+
+    async def test_push_delivery_digests(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        run_jobs
+    ):
+        """Test a delivery run drains the queue and reports throughput."""
+        from backend.services.push import FakeTransport, set_transport
+
+        transport = FakeTransport()
+        set_transport(transport)
+
+        response = await client.post(
+            "/api/admin/notifications/deliver",
+            headers=auth_headers
+        )
+        assert response.status_code == 202
+        job = response.json()
+
+        job = await run_jobs(client, auth_headers, job["job_id"])
+
+        assert job["status"] == "succeeded"
+        result = job["result"]
+        assert result["digests"] == len(transport.sent)
+        assert result["sent"] + result["retried"] + result["failed"] + result["skipped"] == result["notifications"]
+
+        response = await client.get(
+            "/api/admin/notifications/delivery/stats",
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert response.json()["due"] == 0
+
+    async def test_push_batch_one_digest_per_recipient(
+        self,
+        client: AsyncClient,
+        auth_headers: dict
+    ):
+        """Test a single batch sends at most one digest per recipient, even if a send raises."""
+        from backend.services.push import FakeTransport, deliver_batch, set_transport
+
+        class FlakyTransport(FakeTransport):
+            def send(self, message):
+                if not self.sent:
+                    self.sent.append(message)
+                    raise RuntimeError("connection reset")
+                return super().send(message)
+
+        transport = FlakyTransport()
+        set_transport(transport)
+
+        counts = deliver_batch()
+
+        assert counts["digests"] == len(transport.sent)
+        assert len({message.employee_id for message in transport.sent}) == len(transport.sent)
+        if counts["digests"]:
+            assert counts["retried"] >= 1
+
+    async def test_notification_retention(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        run_jobs
+    ):
+        """Test a retention run reports deletions per policy."""
+        response = await client.post(
+            "/api/admin/notifications/retention/run",
+            headers=auth_headers
+        )
+        assert response.status_code == 202
+        job = response.json()
+
+        job = await run_jobs(client, auth_headers, job["job_id"])
+
+        assert job["status"] == "succeeded"
+        assert set(job["result"]["deleted"]) == {"partitions", "read_age", "max_age", "per_employee_cap"}
+
+
 @pytest.mark.admin
 @pytest.mark.e2e
 class TestAdminReporting:
@@ -452,3 +942,136 @@ class TestAdminReporting:
         assert "course_id" in data
         # Statistics fields may vary based on implementation
         assert isinstance(data, dict)
+
+    async def test_report_cache_stats(
+        self,
+        client: AsyncClient,
+        auth_headers: dict
+    ):
+        """Test repeated report reads are served from the cache."""
+        for _ in range(2):
+            response = await client.get(
+                "/api/admin/reports/rollup",
+                headers=auth_headers
+            )
+            assert response.status_code == 200
+
+        response = await client.get(
+            "/api/admin/reports/cache/stats",
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["rollup"]["hits"] + data["rollup"]["stale_hits"] >= 1
+
+    async def test_report_export_download(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        run_jobs
+    ):
+        """Test queueing a CSV export and downloading it in ranges."""
+        response = await client.post(
+            "/api/admin/reports/exports",
+            headers=auth_headers,
+            json={"format": "csv"}
+        )
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+
+        job = await run_jobs(client, auth_headers, job_id)
+        assert job["status"] == "succeeded"
+
+        response = await client.get(
+            f"/api/admin/reports/exports/{job_id}/download",
+            headers={**auth_headers, "Range": "bytes=0-10"}
+        )
+
+        assert response.status_code == 206
+        assert response.content == b"employee_id"
+
+    async def test_expired_export_download(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        run_jobs
+    ):
+        """Test that a purged export file returns 410."""
+        from backend.config import settings
+        from backend.services.exports import export_path, purge_expired_exports
+
+        response = await client.post(
+            "/api/admin/reports/exports",
+            headers=auth_headers,
+            json={"format": "csv"}
+        )
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+
+        job = await run_jobs(client, auth_headers, job_id)
+        assert job["status"] == "succeeded"
+        assert job["result"]["host"]
+
+        path = export_path(job_id, "csv")
+        old = path.stat().st_mtime - settings.EXPORT_RETENTION_HOURS * 3600 - 60
+        os.utime(path, (old, old))
+        assert purge_expired_exports() >= 1
+
+        response = await client.get(
+            f"/api/admin/reports/exports/{job_id}/download",
+            headers=auth_headers
+        )
+
+        assert response.status_code == 410
+
+    async def test_progress_analytics(
+        self,
+        client: AsyncClient,
+        auth_headers: dict
+    ):
+        """Test department x course progress breakdown."""
+        response = await client.get(
+            "/api/admin/analytics/progress",
+            headers=auth_headers,
+            params={"rows": "department", "columns": "course"}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["rows"] == "department"
+        for cell in data["cells"]:
+            assert cell["assigned"] >= cell["completed"]
+
+    async def test_score_percentiles(
+        self,
+        client: AsyncClient,
+        auth_headers: dict
+    ):
+        """Test score percentiles by track."""
+        response = await client.get(
+            "/api/admin/analytics/scores/percentiles",
+            headers=auth_headers,
+            params={"group_by": "track", "p": [50, 90]}
+        )
+
+        assert response.status_code == 200
+        for group in response.json()["groups"]:
+            assert group["percentiles"]["p50"] <= group["percentiles"]["p90"]
+
+    async def test_question_quality(
+        self,
+        client: AsyncClient,
+        auth_headers: dict
+    ):
+        """Test question item analysis listing."""
+        response = await client.get(
+            "/api/admin/questions/quality",
+            headers=auth_headers,
+            params={"min_responses": 1}
+        )
+
+        assert response.status_code == 200
+        for item in response.json()["items"]:
+            assert 0 <= item["difficulty"] <= 1
+            assert set(item["option_rates"]) == {"A", "B", "C", "D"}
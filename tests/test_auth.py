@@ -185,3 +185,119 @@ class TestAuthorizationRoles:
         )
 
         assert response.status_code in [401, 403]
+
+
+@pytest.mark.auth
+@pytest.mark.e2e
+class TestTokenRefresh:
+    """Test refresh token rotation."""
+
+    async def _login(self, client: AsyncClient, test_db) -> dict:
+        from utils.auth import hash_password
+
+        cursor = test_db.cursor()
+        hashed_pw = hash_password("refresh123")
+        cursor.execute(
+            """
+            INSERT INTO users (username, email, hashed_password, full_name, role)
+            VALUES (%s, %s, %s, %s, %s)
+            """,
+            ("refreshuser", "refresh@example.com", hashed_pw, "Refresh User", "employee")
+        )
+        test_db.commit()
+        cursor.close()
+
+        response = await client.post(
+            "/api/auth/login",
+            data={"username": "refresh@example.com", "password": "refresh123"}
+        )
+        assert response.status_code == 200
+        return response.json()
+
+    async def test_refresh_returns_new_tokens(self, client: AsyncClient, test_db):
+        """Test exchanging a refresh token for a new access token."""
+        tokens = await self._login(client, test_db)
+        assert tokens["refresh_token"]
+
+        response = await client.post(
+            "/api/auth/refresh",
+            json={"refresh_token": tokens["refresh_token"]}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["token_type"] == "bearer"
+        assert data["access_token"]
+        assert data["refresh_token"] != tokens["refresh_token"]
+
+    async def test_refresh_token_is_single_use(self, client: AsyncClient, test_db):
+        """Test that a used refresh token is rejected and revokes its chain."""
+        tokens = await self._login(client, test_db)
+
+        first = await client.post(
+            "/api/auth/refresh",
+            json={"refresh_token": tokens["refresh_token"]}
+        )
+        assert first.status_code == 200
+
+        reused = await client.post(
+            "/api/auth/refresh",
+            json={"refresh_token": tokens["refresh_token"]}
+        )
+        assert reused.status_code == 401
+
+        # The replacement issued before the reuse is revoked as well
+        response = await client.post(
+            "/api/auth/refresh",
+            json={"refresh_token": first.json()["refresh_token"]}
+        )
+        assert response.status_code == 401
+
+    async def test_refresh_invalid_token(self, client: AsyncClient):
+        """Test refreshing with an unknown token."""
+        response = await client.post(
+            "/api/auth/refresh",
+            json={"refresh_token": "not-a-real-token"}
+        )
+
+        assert response.status_code == 401
+
+
+@pytest.mark.auth
+@pytest.mark.e2e
+class TestLoginThrottling:
+    """Test login rate limiting."""
+
+    async def test_repeated_failed_logins_are_throttled(self, client: AsyncClient):
+        """Test that bursts of attempts for one account get a fast 429."""
+        from config import settings
+
+        statuses = []
+        for _ in range(settings.LOGIN_RATE_PER_EMAIL + 1):
+            response = await client.post(
+                "/api/auth/login",
+                data={"username": "throttled@example.com", "password": "wrongpass"}
+            )
+            statuses.append(response.status_code)
+
+        assert statuses[:-1] == [401] * settings.LOGIN_RATE_PER_EMAIL
+        assert statuses[-1] == 429
+        assert "retry-after" in response.headers
+
+    async def test_ip_limit_uses_forwarded_client_behind_trusted_proxy(
+        self, client: AsyncClient, monkeypatch
+    ):
+        """Test that clients behind a trusted proxy get separate per-IP buckets."""
+        from config import settings
+
+        # The test client connects from 127.0.0.1, which stands in for the proxy
+        monkeypatch.setattr(settings, "TRUSTED_PROXIES", "127.0.0.1")
+
+        # Each attempt uses a new email so only the per-IP bucket can run out
+        for i in range(settings.LOGIN_RATE_PER_IP + 1):
+            response = await client.post(
+                "/api/auth/login",
+                data={"username": f"proxied{i}@example.com", "password": "wrongpass"},
+                headers={"X-Forwarded-For": f"203.0.113.{i % 2 + 1}"}
+            )
+            assert response.status_code == 401
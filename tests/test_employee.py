@@ -468,6 +468,269 @@ class TestEmployeeQuizWorkflow:
         assert result["passed"] is True
         assert "attempt_number" in result or "attempts" in result
 
+        # The course list reports the attempt summary
+        response = await client.get(
+            "/api/employee/courses",
+            headers=employee_headers
+        )
+        course = next(
+            c for c in response.json() if c["course_id"] == sample_course["course_id"]
+        )
+        assert course["attempt_count"] == 2
+        assert float(course["best_score"]) == float(result["score"])
+        assert course["first_passed_at"] is not None
+
+    async def test_quiz_attempt_history_empty(
+        self, client: AsyncClient, employee_headers: dict
+    ):
+        """Test the attempt history of an employee without attempts."""
+        response = await client.get(
+            "/api/employee/quiz-attempts",
+            headers=employee_headers
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"items": [], "next_cursor": None}
+
+        response = await client.get(
+            "/api/employee/quiz-attempts/999999999",
+            headers=employee_headers
+        )
+        assert response.status_code == 404
+
+    async def test_quiz_attempt_history(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        employee_headers: dict,
+        sample_course: dict,
+        test_db,
+        test_graph_db
+    ):
+        """Test slim quiz results, attempt history pages and the attempt drill-down."""
+        # Get employee user ID
+        response = await client.get(
+            "/api/auth/me",
+            headers=employee_headers
+        )
+        employee_id = response.json()["id"]
+
+        # Assign course to employee
+        response = await client.post(
+            "/api/admin/assign-course",
+            headers=auth_headers,
+            json={
+                "user_id": employee_id,
+                "course_id": sample_course["course_id"]
+            }
+        )
+        assert response.status_code == 200
+
+        # Create questions
+        questions = []
+        for i in range(2):
+            response = await client.post(
+                "/api/admin/questions",
+                headers=auth_headers,
+                json={
+                    "question_text": f"History Question {i+1}?",
+                    "option_a": "Correct",
+                    "option_b": "Wrong",
+                    "option_c": "Wrong",
+                    "option_d": "Wrong",
+                    "correct_option": "A"
+                }
+            )
+            question = response.json()
+            questions.append(question)
+
+            await client.post(
+                "/api/admin/assign-question",
+                headers=auth_headers,
+                json={
+                    "question_id": question["question_id"],
+                    "course_id": sample_course["course_id"]
+                }
+            )
+
+        # Three slim attempts, the first question always wrong
+        answers = [
+            {"question_id": questions[0]["question_id"], "selected_answer": "B"},
+            {"question_id": questions[1]["question_id"], "selected_answer": "A"}
+        ]
+        attempt_ids = []
+        for _ in range(3):
+            response = await client.get(
+                f"/api/employee/courses/{sample_course['course_id']}/quiz",
+                headers=employee_headers
+            )
+            assert response.status_code == 200
+
+            response = await client.post(
+                f"/api/employee/courses/{sample_course['course_id']}/quiz?slim=true",
+                headers=employee_headers,
+                json={"course_id": sample_course["course_id"], "answers": answers}
+            )
+            assert response.status_code == 200
+            result = response.json()
+            assert result["incorrect_question_ids"] == [questions[0]["question_id"]]
+            assert result["incorrect_questions"] == []
+            attempt_ids.append(result["attempt_id"])
+
+        # Newest first, two per page
+        response = await client.get(
+            "/api/employee/quiz-attempts",
+            headers=employee_headers,
+            params={"course_id": sample_course["course_id"], "limit": 2}
+        )
+        assert response.status_code == 200
+        page = response.json()
+        assert [a["attempt_id"] for a in page["items"]] == attempt_ids[:0:-1]
+        assert page["next_cursor"] is not None
+
+        response = await client.get(
+            "/api/employee/quiz-attempts",
+            headers=employee_headers,
+            params={"course_id": sample_course["course_id"], "limit": 2, "cursor": page["next_cursor"]}
+        )
+        page = response.json()
+        assert [a["attempt_id"] for a in page["items"]] == attempt_ids[:1]
+        assert page["next_cursor"] is None
+
+        # The drill-down has every answer with its question
+        response = await client.get(
+            f"/api/employee/quiz-attempts/{attempt_ids[0]}",
+            headers=employee_headers
+        )
+        assert response.status_code == 200
+        detail = response.json()
+        assert len(detail["responses"]) == 2
+        wrong = next(r for r in detail["responses"] if not r["is_correct"])
+        assert wrong["question_id"] == questions[0]["question_id"]
+        assert wrong["correct_answer"] == "A"
+        assert wrong["options"]["A"] == "Correct"
+
+        # Admins can read it too
+        response = await client.get(
+            f"/api/admin/quiz-attempts/{attempt_ids[0]}",
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+
+        response = await client.get(
+            "/api/employee/quiz-attempts/999999999",
+            headers=employee_headers
+        )
+        assert response.status_code == 404
+
+    async def test_quiz_sampling(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        employee_headers: dict,
+        sample_course: dict,
+        test_db,
+        test_graph_db
+    ):
+        """Test that each attempt serves a fixed sample of quiz_size questions."""
+        # Get employee user ID
+        response = await client.get(
+            "/api/auth/me",
+            headers=employee_headers
+        )
+        employee_id = response.json()["id"]
+
+        # Assign course to employee
+        response = await client.post(
+            "/api/admin/assign-course",
+            headers=auth_headers,
+            json={
+                "user_id": employee_id,
+                "course_id": sample_course["course_id"]
+            }
+        )
+        assert response.status_code == 200
+
+        # A bank of six questions, three per quiz
+        for i in range(6):
+            response = await client.post(
+                "/api/admin/questions",
+                headers=auth_headers,
+                json={
+                    "question_text": f"Bank Question {i+1}?",
+                    "option_a": "Correct",
+                    "option_b": "Wrong",
+                    "option_c": "Wrong",
+                    "option_d": "Wrong",
+                    "correct_option": "A"
+                }
+            )
+            question = response.json()
+
+            await client.post(
+                "/api/admin/assign-question",
+                headers=auth_headers,
+                json={
+                    "question_id": question["question_id"],
+                    "course_id": sample_course["course_id"]
+                }
+            )
+
+        response = await client.put(
+            f"/api/admin/courses/{sample_course['course_id']}/quiz-settings",
+            headers=auth_headers,
+            json={"quiz_size": 3}
+        )
+        assert response.status_code == 200
+        assert response.json()["quiz_size"] == 3
+
+        # Reloading serves the same sample
+        response = await client.get(
+            f"/api/employee/courses/{sample_course['course_id']}/quiz",
+            headers=employee_headers
+        )
+        assert response.status_code == 200
+        served = [q["question_id"] for q in response.json()]
+        assert len(served) == 3
+
+        response = await client.get(
+            f"/api/employee/courses/{sample_course['course_id']}/quiz",
+            headers=employee_headers
+        )
+        assert [q["question_id"] for q in response.json()] == served
+
+        # Answers to questions that were not served are rejected
+        response = await client.post(
+            f"/api/employee/courses/{sample_course['course_id']}/quiz",
+            headers=employee_headers,
+            json={
+                "course_id": sample_course["course_id"],
+                "answers": [{"question_id": "not-served", "selected_answer": "A"}]
+            }
+        )
+        assert response.status_code == 400
+
+        # Only the served questions are scored; unanswered ones count as incorrect
+        answers = [{"question_id": question_id, "selected_answer": "A"} for question_id in served[:2]]
+        response = await client.post(
+            f"/api/employee/courses/{sample_course['course_id']}/quiz?slim=true",
+            headers=employee_headers,
+            json={"course_id": sample_course["course_id"], "answers": answers}
+        )
+        assert response.status_code == 200
+        result = response.json()
+        assert result["total_questions"] == 3
+        assert result["correct_answers"] == 2
+        assert result["incorrect_question_ids"] == [served[2]]
+
+        # The quiz can only be submitted once
+        response = await client.post(
+            f"/api/employee/courses/{sample_course['course_id']}/quiz",
+            headers=employee_headers,
+            json={"course_id": sample_course["course_id"], "answers": answers}
+        )
+        assert response.status_code == 409
+
 
 @pytest.mark.employee
 @pytest.mark.e2e
@@ -488,6 +751,56 @@ class TestEmployeeProfile:
         assert "username" in profile or "user" in profile
         # Profile may contain various fields based on implementation
 
+    async def test_profile_serves_progress_summary(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        employee_headers: dict,
+        sample_subtrack: dict,
+        sample_course: dict,
+        test_db,
+        test_graph_db
+    ):
+        """Test that the profile counts reflect assigned and started courses."""
+        response = await client.get("/api/auth/me", headers=employee_headers)
+        employee_id = response.json()["id"]
+
+        response = await client.post(
+            "/api/admin/courses",
+            headers=auth_headers,
+            json={
+                "title": "FastAPI Advanced",
+                "description": "Second course",
+                "subtrack_id": sample_subtrack["subtrack_id"]
+            }
+        )
+        assert response.status_code == 200
+        course_ids = [sample_course["course_id"], response.json()["course_id"]]
+
+        for course_id in course_ids:
+            response = await client.post(
+                "/api/admin/assign-course",
+                headers=auth_headers,
+                json={"user_id": employee_id, "course_id": course_id}
+            )
+            assert response.status_code == 200
+
+        response = await client.post(
+            f"/api/employee/courses/{course_ids[0]}/start",
+            headers=employee_headers
+        )
+        assert response.status_code == 200
+
+        response = await client.get("/api/employee/profile", headers=employee_headers)
+
+        assert response.status_code == 200
+        profile = response.json()
+        assert profile["employee_id"] == employee_id
+        assert profile["total_courses_assigned"] == 2
+        assert profile["courses_in_progress"] == 1
+        assert profile["courses_not_started"] == 1
+        assert profile["courses_completed"] == 0
+
     async def test_get_progress_summary(
         self,
         client: AsyncClient,
@@ -562,11 +875,84 @@ class TestEmployeeNotifications:
         )
 
         assert response.status_code == 200
-        notifications = response.json()
+        notifications = response.json()["items"]
         assert isinstance(notifications, list)
         assert len(notifications) > 0
         assert any("Test notification" in str(n) for n in notifications)
 
+    async def test_notifications_keyset_pages(
+        self, client: AsyncClient, employee_headers: dict, test_db
+    ):
+        """Test paging through notifications with next_cursor."""
+        response = await client.get(
+            "/api/auth/me",
+            headers=employee_headers
+        )
+        employee_id = response.json()["id"]
+
+        cursor = test_db.cursor()
+        for i in range(3):
+            cursor.execute(
+                """
+                INSERT INTO notifications (user_id, message, is_read)
+                VALUES (%s, %s, %s)
+                """,
+                (employee_id, f"Paged notification {i}", False)
+            )
+        test_db.commit()
+        cursor.close()
+
+        seen = []
+        params = {"limit": 2}
+        while True:
+            response = await client.get(
+                "/api/employee/notifications",
+                headers=employee_headers,
+                params=params
+            )
+            assert response.status_code == 200
+            page = response.json()
+            seen.extend(n["notification_id"] for n in page["items"])
+            if not page["next_cursor"]:
+                break
+            params["cursor"] = page["next_cursor"]
+
+        assert len(seen) == len(set(seen)) >= 3
+
+    async def test_unread_notification_count(
+        self, client: AsyncClient, employee_headers: dict, test_db
+    ):
+        """Test the unread count follows new notifications."""
+        response = await client.get(
+            "/api/employee/notifications/unread-count",
+            headers=employee_headers
+        )
+        assert response.status_code == 200
+        before = response.json()["unread_count"]
+
+        response = await client.get(
+            "/api/auth/me",
+            headers=employee_headers
+        )
+        employee_id = response.json()["id"]
+
+        cursor = test_db.cursor()
+        cursor.execute(
+            """
+            INSERT INTO notifications (user_id, message, is_read)
+            VALUES (%s, %s, %s)
+            """,
+            (employee_id, "Unread notification", False)
+        )
+        test_db.commit()
+        cursor.close()
+
+        response = await client.get(
+            "/api/employee/notifications/unread-count",
+            headers=employee_headers
+        )
+        assert response.json()["unread_count"] == before + 1
+
     async def test_mark_notification_as_read(
         self, client: AsyncClient, employee_headers: dict, test_db
     ):
@@ -611,3 +997,48 @@ class TestEmployeeNotifications:
         is_read = cursor.fetchone()[0]
         cursor.close()
         assert is_read is True
+
+    async def test_mark_all_notifications_read(
+        self, client: AsyncClient, employee_headers: dict, test_db
+    ):
+        """Test marking every notification read in one request."""
+        response = await client.get(
+            "/api/auth/me",
+            headers=employee_headers
+        )
+        employee_id = response.json()["id"]
+
+        cursor = test_db.cursor()
+        for i in range(3):
+            cursor.execute(
+                """
+                INSERT INTO notifications (user_id, message, is_read)
+                VALUES (%s, %s, %s)
+                """,
+                (employee_id, f"Bulk read notification {i}", False)
+            )
+        test_db.commit()
+        cursor.close()
+
+        response = await client.post(
+            "/api/employee/notifications/read",
+            headers=employee_headers,
+            json={"all": True}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["updated"] >= 3
+        assert data["unread_count"] == 0
+
+    async def test_mark_notifications_read_requires_one_selector(
+        self, client: AsyncClient, employee_headers: dict
+    ):
+        """Test the bulk read request rejects ambiguous selectors."""
+        response = await client.post(
+            "/api/employee/notifications/read",
+            headers=employee_headers,
+            json={"all": True, "notification_ids": [1]}
+        )
+
+        assert response.status_code == 422